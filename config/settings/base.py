@@ -55,6 +55,7 @@ LOCAL_APPS = [
     "killay.admin.apps.AdminConfig",
     "killay.archives.apps.ArchivesConfig",
     "killay.viewer.apps.ViewerConfig",
+    "killay.api.apps.ApiConfig",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -108,6 +109,16 @@ STATICFILES_FINDERS = [
 
 MEDIA_ROOT = str(APPS_DIR / "media")
 MEDIA_URL = env("MEDIA_URL", default="/media/")
+# the files and the images of the pieces, with their thumbnails, are kept out
+# of MEDIA_ROOT and served by the viewer after checking the access to their
+# piece. The web server must never publish this directory, with nginx it is
+# only an internal location whose path is VIEWER_MEDIA_ACCEL_PREFIX:
+#     location /internal-media/ { internal; alias <PROTECTED_MEDIA_ROOT>/; }
+PROTECTED_MEDIA_ROOT = env(
+    "PROTECTED_MEDIA_ROOT", default=str(APPS_DIR / "protected_media")
+)
+# url of the same files for the administrators, answered by the workers
+PROTECTED_MEDIA_URL = env("PROTECTED_MEDIA_URL", default="/protected-media/")
 
 # Template
 
@@ -208,3 +219,22 @@ QUILL_CONFIGS = {
         },
     }
 }
+
+# Viewer page cache
+
+# seconds an anonymous viewer page is served from the cache, 0 disables it
+VIEWER_PAGE_CACHE_TIMEOUT = env.int("VIEWER_PAGE_CACHE_TIMEOUT", default=300)
+# each worker saves the views it counted after these seconds or these views,
+# 0 disables the trigger and leaves it to the flush_content_stats command
+VIEWER_STATS_FLUSH_INTERVAL = env.int("VIEWER_STATS_FLUSH_INTERVAL", default=60)
+VIEWER_STATS_FLUSH_EVENTS = env.int("VIEWER_STATS_FLUSH_EVENTS", default=100)
+# directory of the static copy of the viewer built by export_static_site
+VIEWER_EXPORT_ROOT = env("VIEWER_EXPORT_ROOT", default=str(ROOT_DIR / "export"))
+# directory of the sitemap files written by generate_sitemaps
+VIEWER_SITEMAP_ROOT = env("VIEWER_SITEMAP_ROOT", default=str(ROOT_DIR / "sitemaps"))
+# the files of the pieces are handed to the web server with this header and the
+# prefix of its internal location of PROTECTED_MEDIA_ROOT, like
+# "/internal-media/" with X-Accel-Redirect of nginx or the protected media root
+# with X-Sendfile of apache, without a prefix they are streamed by the workers
+VIEWER_MEDIA_ACCEL_HEADER = env("VIEWER_MEDIA_ACCEL_HEADER", default="X-Accel-Redirect")
+VIEWER_MEDIA_ACCEL_PREFIX = env("VIEWER_MEDIA_ACCEL_PREFIX", default="")
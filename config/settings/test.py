@@ -14,6 +14,10 @@ CACHES = {
     }
 }
 
+# the views are saved only when a test flushes them
+VIEWER_STATS_FLUSH_INTERVAL = 0
+VIEWER_STATS_FLUSH_EVENTS = 0
+
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 TEMPLATES[-1]["OPTIONS"]["loaders"] = [  # noqa F405
     (
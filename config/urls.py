@@ -4,12 +4,19 @@ from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
 from django.views import defaults as default_views
 
+from killay.viewer.views.media import protected_media_view
+
 
 urlpatterns = [
     path("", include("killay.viewer.urls", namespace="viewer")),
     path("admin/", include("killay.admin.urls", namespace="admin")),
+    path("api/", include("killay.api.urls", namespace="api")),
     path("pages/", include("killay.pages.urls", namespace="pages")),
     path("users/", include("killay.users.urls", namespace="users")),
+    path(
+        f"{settings.PROTECTED_MEDIA_URL.lstrip('/')}<path:name>",
+        protected_media_view,
+    ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 
@@ -4,6 +4,9 @@ set -e
 source env/bin/activate
 python -m pip install -r requirements/production.txt
 python manage.py migrate
+python manage.py rebuild_effective_access
+python manage.py rebuild_search_index
+python manage.py generate_thumbnails
 python manage.py collectstatic --no-input
 python manage.py compilemessages
 deactivate
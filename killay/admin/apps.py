@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AdminConfig(AppConfig):
     name = "killay.admin"
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        import killay.admin.signals  # noqa F401
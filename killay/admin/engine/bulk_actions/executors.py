@@ -9,6 +9,7 @@ from killay.archives.lib.constants import (
     PieceConstants,
     ProviderConstants,
 )
+from killay.archives.models import Piece
 from killay.archives.services import (
     bulk_add_piece_categories,
     bulk_add_piece_keyword_by_texts,
@@ -17,6 +18,7 @@ from killay.archives.services import (
     bulk_create_pieces,
     bulk_create_piece_video_provider,
 )
+from killay.archives.search import refresh_search_index_by_pieces
 
 
 class ExecutionError(Exception):
@@ -54,6 +56,7 @@ class PieceCreateExecutor(Executor):
         self._add_people(data_list=data_list, pieces_map=pieces_map)
         self._add_keyword(data_list=data_list, pieces_map=pieces_map)
         self._add_video_provider(data_list=data_list, pieces_map=pieces_map)
+        self._index_pieces(pieces_map=pieces_map)
         return [
             {
                 "code": {
@@ -189,3 +192,7 @@ class PieceCreateExecutor(Executor):
             return bulk_create_piece_video_provider(
                 piece_video_data=piece_video_data_list
             )
+
+    def _index_pieces(self, pieces_map):
+        pieces = Piece.objects.filter(id__in=[obj.id for obj in pieces_map.values()])
+        return refresh_search_index_by_pieces(pieces=pieces)
@@ -1,3 +1,5 @@
+import ipaddress
+
 from django import forms
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext
@@ -57,6 +59,7 @@ class ViewerForm(forms.ModelForm):
             "scope_collection",
             "home",
             "home_page",
+            "pagination",
         ]
 
     scope = forms.ChoiceField(
@@ -89,6 +92,12 @@ class ViewerForm(forms.ModelForm):
         help_text=ViewerConstants.HELP_TEXT_HOME_PAGE,
         required=False,
     )
+    pagination = forms.ChoiceField(
+        choices=ViewerConstants.PAGINATION_CHOICES,
+        widget=forms.Select(attrs={"class": "ui fluid dropdown"}),
+        help_text=ViewerConstants.HELP_TEXT_PAGINATION,
+        required=True,
+    )
 
     def clean(self, *args, **kwargs):
         cleaned_data = super().clean(*args, **kwargs)
@@ -708,7 +717,7 @@ IPV4_PATTERN = (
 class PlaceAddressForm(forms.ModelForm):
     class Meta:
         model = PlaceAddress
-        fields = ["place", "ipv4", "description"]
+        fields = ["place", "ipv4", "ipv4_end", "prefix_length", "description"]
         widgets = {"place": forms.HiddenInput()}
 
     ipv4 = forms.GenericIPAddressField(
@@ -724,6 +733,47 @@ class PlaceAddressForm(forms.ModelForm):
         required=True,
         help_text=PlaceAddressConstants.FIELD_IPV4_HELP_TEXT,
     )
+    ipv4_end = forms.GenericIPAddressField(
+        widget=forms.TextInput(
+            attrs={
+                "pattern": IPV4_PATTERN,
+                "minlength": 7,
+                "maxlength": 15,
+                "size": 15,
+                "placeholder": "x.x.x.x",
+            }
+        ),
+        required=False,
+        help_text=PlaceAddressConstants.FIELD_IPV4_END_HELP_TEXT,
+    )
+
+    def clean(self, *args, **kwargs):
+        cleaned_data = super().clean(*args, **kwargs)
+        ipv4 = cleaned_data.get("ipv4")
+        ipv4_end = cleaned_data.get("ipv4_end")
+        prefix_length = cleaned_data.get("prefix_length")
+        if not ipv4:
+            return cleaned_data
+        start = ipaddress.ip_address(ipv4)
+        if ipv4_end and prefix_length is not None:
+            raise ValidationError(
+                {"ipv4_end": PlaceAddressConstants.ERROR_RANGE_AND_PREFIX}
+            )
+        if ipv4_end:
+            end = ipaddress.ip_address(ipv4_end)
+            if end.version != start.version:
+                raise ValidationError(
+                    {"ipv4_end": PlaceAddressConstants.ERROR_RANGE_VERSION}
+                )
+            if end <= start:
+                raise ValidationError(
+                    {"ipv4_end": PlaceAddressConstants.ERROR_RANGE_ORDER}
+                )
+        if prefix_length is not None and prefix_length > start.max_prefixlen:
+            raise ValidationError(
+                {"prefix_length": PlaceAddressConstants.ERROR_PREFIX_LENGTH}
+            )
+        return cleaned_data
 
 
 PlaceAddressFormSet = forms.modelformset_factory(
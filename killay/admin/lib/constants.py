@@ -23,18 +23,23 @@ class SiteConfigurationConstants:
     NAME_LOGO = gettext_lazy("Logos")
     NAME_PAGES = gettext_lazy("Pages")
     NAME_USERS = gettext_lazy("Users")
+    NAME_CONTENT_STATS = gettext_lazy("Statistics")
     PATTERN_GENERAL = "admin:site_configuration"
     PATTERN_VIEWER = "admin:site_viewer"
     PATTERN_SOCIAL_MEDIA = "admin:site_social_media_list"
     PATTERN_LOGO = "admin:site_logo_list"
     PATTERN_PAGE_LIST = "admin:pages_list"
     PATTERN_USER_LIST = "admin:users_list"
+    PATTERN_CONTENT_STATS = "admin:site_content_stats"
     PATTERN_BY_NAME = {
         NAME_GENERAL: PATTERN_GENERAL,
         NAME_VIEWER: PATTERN_VIEWER,
         NAME_SOCIAL_MEDIA: PATTERN_SOCIAL_MEDIA,
         NAME_LOGO: PATTERN_LOGO,
+        NAME_CONTENT_STATS: PATTERN_CONTENT_STATS,
     }
+    GENERATION_KEY = "admin:site_configuration:generation"
+    SNAPSHOT_KEY = "admin:site_configuration:snapshot:{generation}"
     FIELD_NAME = gettext_lazy("Name of Site")
     FIELD_NAME_HELP_TEXT = gettext_lazy(
         "Site name, can be omitted with certain display options"
@@ -60,6 +65,10 @@ class SiteConfigurationConstants:
     DESCRIPTION_LOGO = gettext_lazy(
         "Allows you to manage institutional logos to be displayed on the site"
     )
+    DESCRIPTION_CONTENT_STATS = gettext_lazy(
+        "Most viewed archives and pieces, the latest views are saved every "
+        "few minutes"
+    )
 
 
 class ArchivesViewConstants:
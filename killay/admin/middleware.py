@@ -1,5 +1,5 @@
 from killay.admin.services import get_site_configuration
-from killay.archives.services import get_place_from_ip_address
+from killay.archives.services import get_access_context, get_place_from_ip_address
 
 
 class SiteConfigurationMiddleware:
@@ -13,6 +13,9 @@ class SiteConfigurationMiddleware:
         ip_address = self._get_ip_address(request=request)
         request.ip_address = ip_address
         request.place = get_place_from_ip_address(ip_address=ip_address)
+        request.access = get_access_context(
+            place=request.place, is_superuser=request.user.is_superuser
+        )
         response = self.get_response(request)
         return response
 
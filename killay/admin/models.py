@@ -10,11 +10,15 @@ from killay.admin.lib.constants import (
 )
 
 
-class SiteConfigurationManager(models.Manager):
+class SiteConfigurationQuerySet(models.QuerySet):
     def current(self):
         return self.filter(id=settings.SITE_ID).first()
 
 
+class SiteConfigurationManager(models.Manager.from_queryset(SiteConfigurationQuerySet)):
+    pass
+
+
 class SiteConfiguration(models.Model):
     name = models.CharField(
         SiteConfigurationConstants.FIELD_NAME,
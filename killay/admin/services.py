@@ -1,8 +1,12 @@
 from datetime import datetime
 
-from typing import List
+from typing import List, Optional
 
+from django.core.cache import cache
+
+from killay.admin.lib.constants import SiteConfigurationConstants
 from killay.admin.models import SiteConfiguration
+from killay.admin.utils import get_cache_generation
 
 
 def date_serializer_for_data_list(data: dict, fields: List[str]) -> dict:
@@ -33,5 +37,29 @@ def date_serializer_for_data_list(data: dict, fields: List[str]) -> dict:
     return serialized_data
 
 
-def get_site_configuration():
-    return SiteConfiguration.objects.current()
+def _get_site_configuration_snapshot() -> Optional[SiteConfiguration]:
+    return (
+        SiteConfiguration.objects.select_related(
+            "site",
+            "viewer__scope_archive",
+            "viewer__scope_collection__archive",
+            "viewer__home_page",
+        )
+        .prefetch_related("logos", "social_medias")
+        .current()
+    )
+
+
+def get_site_configuration() -> Optional[SiteConfiguration]:
+    """
+    Returns the site configuration with its viewer, logos and social medias,
+    from a snapshot in the shared cache. Every call returns its own copy.
+    """
+    generation = get_cache_generation(key=SiteConfigurationConstants.GENERATION_KEY)
+    key = SiteConfigurationConstants.SNAPSHOT_KEY.format(generation=generation)
+    site_configuration = cache.get(key)
+    if site_configuration is None:
+        site_configuration = _get_site_configuration_snapshot()
+        if site_configuration is not None:
+            cache.set(key, site_configuration, timeout=None)
+    return site_configuration
@@ -0,0 +1,24 @@
+from django.contrib.sites.models import Site
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from killay.admin.lib.constants import SiteConfigurationConstants
+from killay.admin.models import Logo, SiteConfiguration, SocialMedia
+from killay.admin.utils import bump_cache_generation
+from killay.archives.models import Archive, Collection
+from killay.pages.models import Page
+from killay.viewer.models import Viewer
+
+SNAPSHOT_SIGNALS = [post_save, post_delete]
+
+
+@receiver(SNAPSHOT_SIGNALS, sender=SiteConfiguration)
+@receiver(SNAPSHOT_SIGNALS, sender=Site)
+@receiver(SNAPSHOT_SIGNALS, sender=Viewer)
+@receiver(SNAPSHOT_SIGNALS, sender=Logo)
+@receiver(SNAPSHOT_SIGNALS, sender=SocialMedia)
+@receiver(SNAPSHOT_SIGNALS, sender=Archive)
+@receiver(SNAPSHOT_SIGNALS, sender=Collection)
+@receiver(SNAPSHOT_SIGNALS, sender=Page)
+def invalidate_site_configuration(sender, **kwargs):
+    bump_cache_generation(key=SiteConfigurationConstants.GENERATION_KEY)
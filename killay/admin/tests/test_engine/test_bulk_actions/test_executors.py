@@ -87,3 +87,5 @@ class TestPieceCreateExecutor:
                 assert getattr(created_piece, field) == value
             else:
                 assert getattr(created_piece.meta, field) == value
+        assert created_piece.search_terms.filter(term="fake").exists()
+        assert created_piece.search_terms.filter(term="kw1").exists()
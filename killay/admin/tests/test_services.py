@@ -3,6 +3,10 @@ import pytest
 from datetime import datetime
 
 from killay.admin import services as admin_services
+from killay.admin.models import SiteConfiguration
+from killay.admin.tests import recipes as admin_recipes
+from killay.archives.tests.recipes import archive_recipe
+from killay.viewer.lib.constants import ViewerConstants
 
 
 pytestmark = pytest.mark.django_db
@@ -19,3 +23,42 @@ def test_date_serializer_for_data_list():
             if field in fields
         ]
     )
+
+
+class TestGetSiteConfiguration:
+    def test_cached_snapshot(self, django_assert_num_queries):
+        admin_recipes.logo_recipe.make(
+            configuration=SiteConfiguration.objects.current()
+        )
+        admin_services.get_site_configuration()
+        with django_assert_num_queries(0):
+            site_configuration = admin_services.get_site_configuration()
+            assert site_configuration.viewer.scope_archive is None
+            assert site_configuration.viewer.home_page is None
+            assert len(site_configuration.logos.all()) == 1
+            assert len(site_configuration.social_medias.all()) == 0
+
+    def test_copy_by_call(self):
+        site_configuration = admin_services.get_site_configuration()
+        site_configuration.name = "Changed without saving"
+        assert admin_services.get_site_configuration().name != site_configuration.name
+
+    def test_invalidated_on_viewer_change(self):
+        archive = archive_recipe.make()
+        site_configuration = admin_services.get_site_configuration()
+        site_configuration.viewer.scope = ViewerConstants.SCOPE_ONE_ARCHIVE
+        site_configuration.viewer.scope_archive = archive
+        site_configuration.viewer.save()
+        viewer = admin_services.get_site_configuration().viewer
+        assert viewer.scope == ViewerConstants.SCOPE_ONE_ARCHIVE
+        assert viewer.scope_archive.name == archive.name
+
+    def test_invalidated_on_scope_archive_change(self):
+        archive = archive_recipe.make()
+        site_configuration = admin_services.get_site_configuration()
+        site_configuration.viewer.scope_archive = archive
+        site_configuration.viewer.save()
+        archive.name = "New name"
+        archive.save()
+        viewer = admin_services.get_site_configuration().viewer
+        assert viewer.scope_archive.name == "New name"
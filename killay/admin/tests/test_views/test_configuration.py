@@ -9,6 +9,7 @@ from killay.admin.models import SiteConfiguration
 from killay.admin.tests import recipes as admin_recipes
 from killay.archives.tests.recipes import archive_recipe
 from killay.users.models import User
+from killay.viewer.engine.stats import flush_views
 from killay.viewer.lib.constants import ViewerConstants
 
 
@@ -67,6 +68,7 @@ class TestViewerUpdateView:
             "home": ViewerConstants.HOME_DEFAULT,
             "scope": ViewerConstants.SCOPE_ONE_ARCHIVE,
             "scope_archive": archive.id,
+            "pagination": ViewerConstants.PAGINATION_CURSOR,
         }
         assert viewer.scope == ViewerConstants.SCOPE_ALL
         client.force_login(admin_user)
@@ -75,6 +77,7 @@ class TestViewerUpdateView:
         viewer.refresh_from_db()
         assert viewer.scope == ViewerConstants.SCOPE_ONE_ARCHIVE
         assert viewer.scope_archive_id == archive.id
+        assert viewer.pagination == ViewerConstants.PAGINATION_CURSOR
 
     def test_fail(self, admin_user: User, client: Client):
         client.force_login(admin_user)
@@ -248,3 +251,26 @@ class TestSiteLogoCreateView:
         response = client.post("/admin/conf/logos/~create/", data)
         assert response.status_code == 200
         assert response.context_data["form"].errors
+
+
+@pytest.mark.django_db
+class TestContentStatsView:
+    def test_get(self, admin_user: User, client: Client):
+        archive = archive_recipe.make()
+        client.get(f"/archives/{archive.slug}/")
+        flush_views()
+        client.force_login(admin_user)
+        response = client.get("/admin/conf/stats/")
+        assert response.status_code == 200
+        assert response.context_data["extra_data"] == {
+            f"{archive} (archive {archive.id})": 1
+        }
+
+    def test_same_names(self, admin_user: User, client: Client):
+        archives = archive_recipe.make(name="Archivo", _quantity=2)
+        for archive in archives:
+            client.get(f"/archives/{archive.slug}/")
+        flush_views()
+        client.force_login(admin_user)
+        response = client.get("/admin/conf/stats/")
+        assert len(response.context_data["extra_data"]) == 2
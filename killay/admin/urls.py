@@ -58,6 +58,11 @@ urlpatterns = [
         view=conf_views.admin_site_logo_create_view,
         name="site_logo_create",
     ),
+    path(
+        "conf/stats/",
+        view=conf_views.admin_site_content_stats_view,
+        name="site_content_stats",
+    ),
 ]
 
 # Content Manager
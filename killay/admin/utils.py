@@ -1,4 +1,8 @@
+import time
+
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Manager
 from django.forms import ClearableFileInput
 
@@ -10,3 +14,23 @@ class ImageFileInput(ClearableFileInput):
 class InSiteManager(Manager):
     def get_queryset(self):
         return super().get_queryset().filter(site_id=settings.SITE_ID)
+
+
+def get_cache_generation(key: str) -> int:
+    # a missing key starts from the current time, so an evicted generation
+    # never goes back to a value some worker has already seen
+    return cache.get_or_set(key, time.time_ns, timeout=None)
+
+
+def _incr_cache_generation(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_cache_generation(key: str) -> None:
+    # bumped right away for the current process and again on commit, so other
+    # workers never rebuild from data that is not committed yet
+    _incr_cache_generation(key)
+    transaction.on_commit(lambda: _incr_cache_generation(key))
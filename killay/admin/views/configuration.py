@@ -11,7 +11,16 @@ from killay.admin.forms import (
     SocialMediaFormSet,
     ViewerForm,
 )
-from killay.admin.views.mixins import CreateAdminView, FormSetAdminView, UpdateAdminView
+from killay.admin.models import SiteConfiguration
+from killay.admin.views.mixins import (
+    AdminView,
+    CreateAdminView,
+    FormSetAdminView,
+    UpdateAdminView,
+)
+from killay.viewer.lib.constants import ContentStatsConstants
+from killay.viewer.models import Viewer
+from killay.viewer.services import get_most_viewed
 
 
 def _get_extra_links(current_name: Optional[str] = None) -> list:
@@ -31,7 +40,8 @@ class ConfigurationUpdateView(UpdateAdminView):
     reverse_url = "admin:site_configuration"
 
     def get_object(self):
-        return self.request.site_configuration
+        # the request one is a cached snapshot, forms edit a fresh instance
+        return SiteConfiguration.objects.current()
 
     def get_extra_data(self) -> str:
         return {}
@@ -57,7 +67,7 @@ class ViewerUpdateView(UpdateAdminView):
     name_field = "id"
 
     def get_object(self):
-        return self.request.site_configuration.viewer
+        return Viewer.objects.get(configuration_id=self.request.site_configuration.id)
 
     def get_extra_data(self) -> str:
         return {}
@@ -151,3 +161,29 @@ class SiteLogoCreateView(CreateAdminView):
 
 
 admin_site_logo_create_view = SiteLogoCreateView.as_view()
+
+
+class ContentStatsView(AdminView):
+    main_title = SiteConfigurationConstants.MAIN_TITLE
+    second_title = SiteConfigurationConstants.NAME_CONTENT_STATS
+    description = SiteConfigurationConstants.DESCRIPTION_CONTENT_STATS
+
+    def get_extra_data(self) -> dict:
+        # two instances can share a name, the label tells them apart
+        return {
+            ContentStatsConstants.ADMIN_LABEL.format(
+                name=stats.content_object,
+                model=stats.content_object._meta.verbose_name,
+                id=stats.object_id,
+            ): stats.views
+            for stats in get_most_viewed(viewer_id=self.request.viewer.id)
+            if stats.content_object
+        }
+
+    def get_extra_links(self):
+        return _get_extra_links(
+            current_name=SiteConfigurationConstants.NAME_CONTENT_STATS
+        )
+
+
+admin_site_content_stats_view = ContentStatsView.as_view()
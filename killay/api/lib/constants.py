@@ -0,0 +1,25 @@
+from django.utils.translation import gettext_lazy
+
+
+class ApiConstants:
+    VERSION = "v1"
+    KEY_FIELDS = "fields"
+    KEY_CURSOR = "cursor"
+    FIELDS_SEPARATOR = ","
+    PAGE_SIZE = 50
+    SEQUENCE_FIELDS = ["title", "content", "ini", "end"]
+    CATEGORIZATION_FIELDS = ["slug", "name"]
+
+
+class ApiPatternConstants:
+    APP_NAME = "api"
+    ARCHIVE_LIST = "archive_list"
+    COLLECTION_LIST = "collection_list"
+    PIECE_LIST = "piece_list"
+    PIECE_DETAIL = "piece_detail"
+
+
+class ApiMessageConstants:
+    NOT_PUBLISHED = gettext_lazy("The site is not published")
+    UNKNOWN_FIELDS = gettext_lazy("Unknown fields: {fields}")
+    PIECE_NOT_FOUND = gettext_lazy("Piece not found")
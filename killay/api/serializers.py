@@ -0,0 +1,222 @@
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet
+from django.urls import reverse
+
+from killay.api.lib.constants import ApiConstants, ApiMessageConstants
+from killay.archives.lib.constants import PieceConstants, ProviderConstants
+from killay.archives.models import (
+    Category,
+    Keyword,
+    Person,
+    PieceMeta,
+    Provider,
+    Sequence,
+)
+from killay.archives.thumbnails import get_srcsets
+from killay.viewer.engine.media import get_media_url
+from killay.viewer.lib.constants import (
+    ContentConstants,
+    MediaConstants,
+    ViewerPatternConstants,
+)
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class Field(NamedTuple):
+    lookup: str
+    to_representation: Optional[Callable] = None
+
+
+def _get_file_url(name: Optional[str]) -> Optional[str]:
+    return default_storage.url(name) if name else None
+
+
+def _get_piece_url(code: str) -> str:
+    pattern = ViewerPatternConstants.pattern_by_name(
+        name=ViewerPatternConstants.PIECE_DETAIL
+    )
+    return reverse(pattern, kwargs={"slug": code})
+
+
+def _time_to_seconds(time) -> int:
+    return (time.hour * 60 + time.minute) * 60 + time.second
+
+
+class ValuesSerializer:
+    """
+    Serializes the rows of ``values()`` querysets, the queries only read the
+    columns of the requested fields.
+    """
+
+    fields: Dict[str, Field] = {}
+    # columns read even when their fields are not requested
+    required_lookups: List[str] = []
+
+    def __init__(self, field_names: Optional[List[str]] = None):
+        available = self.get_field_names()
+        unknown = [name for name in field_names or [] if name not in available]
+        if unknown:
+            raise ApiError(
+                ApiMessageConstants.UNKNOWN_FIELDS.format(fields=", ".join(unknown))
+            )
+        self.field_names = field_names or available
+
+    @classmethod
+    def get_field_names(cls) -> List[str]:
+        return list(cls.fields)
+
+    def get_lookups(self) -> List[str]:
+        lookups = [
+            self.fields[name].lookup for name in self.field_names if name in self.fields
+        ]
+        return list(dict.fromkeys([*self.required_lookups, *lookups]))
+
+    def get_rows(self, queryset: QuerySet) -> QuerySet:
+        return queryset.values(*self.get_lookups())
+
+    def serialize(self, row: Dict) -> Dict:
+        data = {}
+        for name in self.field_names:
+            if name not in self.fields:
+                continue
+            field = self.fields[name]
+            value = row[field.lookup]
+            data[name] = (
+                field.to_representation(value) if field.to_representation else value
+            )
+        return data
+
+    def serialize_many(self, rows: Iterable[Dict]) -> List[Dict]:
+        return [self.serialize(row) for row in rows]
+
+
+class ArchiveSerializer(ValuesSerializer):
+    fields = {
+        "slug": Field("slug"),
+        "name": Field("name"),
+        "description": Field("description"),
+        "image": Field("image", _get_file_url),
+        "image_srcsets": Field("image", get_srcsets),
+    }
+
+
+class CollectionSerializer(ValuesSerializer):
+    fields = {
+        "slug": Field("slug"),
+        "name": Field("name"),
+        "description": Field("description"),
+        "image": Field("image", _get_file_url),
+        "image_srcsets": Field("image", get_srcsets),
+        "archive": Field("archive__slug"),
+    }
+
+
+class PieceSerializer(ValuesSerializer):
+    fields = {
+        "code": Field("code"),
+        "title": Field("title"),
+        "kind": Field("kind"),
+        "thumb": Field("thumb", _get_file_url),
+        "thumb_srcsets": Field("thumb", get_srcsets),
+        "thumb_url": Field("resolved_thumb_url"),
+        "duration": Field("duration"),
+        "collection": Field("collection__slug"),
+        "archive": Field("collection__archive__slug"),
+        "url": Field("code", _get_piece_url),
+    }
+    # the keyset pagination seeks on these columns
+    required_lookups = ["title", "code", "id"]
+
+
+class PieceDetailSerializer(PieceSerializer):
+    """
+    Adds the related content of the piece, each requested relation costs one
+    query over its own values.
+    """
+
+    related_fields = [
+        "meta",
+        "sequences",
+        "categories",
+        "people",
+        "keywords",
+        "provider",
+    ]
+    required_lookups = ["id", "kind", "code"]
+
+    @classmethod
+    def get_field_names(cls) -> List[str]:
+        return [*cls.fields, *cls.related_fields]
+
+    def serialize(self, row: Dict) -> Dict:
+        data = super().serialize(row)
+        for name in self.field_names:
+            if name in self.related_fields:
+                data[name] = getattr(self, f"_get_{name}")(row=row)
+        return data
+
+    def _get_meta(self, row: Dict) -> Optional[Dict]:
+        return (
+            PieceMeta.objects.filter(piece_id=row["id"])
+            .values(*ContentConstants.PIECE_META_FIELDS)
+            .first()
+        )
+
+    def _get_sequences(self, row: Dict) -> List[Dict]:
+        sequences = Sequence.objects.filter(piece_id=row["id"]).values(
+            *ApiConstants.SEQUENCE_FIELDS
+        )
+        return [
+            {
+                "title": sequence["title"],
+                "content": sequence["content"],
+                "ini_sec": _time_to_seconds(sequence["ini"]),
+                "end_sec": _time_to_seconds(sequence["end"]),
+            }
+            for sequence in sequences
+        ]
+
+    def _get_categorization(self, model, row: Dict) -> List[Dict]:
+        return list(
+            model.objects.filter(pieces=row["id"]).values(
+                *ApiConstants.CATEGORIZATION_FIELDS
+            )
+        )
+
+    def _get_categories(self, row: Dict) -> List[Dict]:
+        return self._get_categorization(model=Category, row=row)
+
+    def _get_people(self, row: Dict) -> List[Dict]:
+        return self._get_categorization(model=Person, row=row)
+
+    def _get_keywords(self, row: Dict) -> List[Dict]:
+        return self._get_categorization(model=Keyword, row=row)
+
+    def _get_provider(self, row: Dict) -> Optional[Dict]:
+        # the same readiness rules of the provider model, over its values
+        provider = (
+            Provider.objects.filter(piece_id=row["id"], active=True)
+            .values("plyr_provider", "ply_embed_id", "image", "file")
+            .first()
+        )
+        if not provider:
+            return None
+        kind = row["kind"]
+        if kind == PieceConstants.KIND_VIDEO:
+            if not (provider["plyr_provider"] and provider["ply_embed_id"]):
+                return None
+            template = ProviderConstants.URL_TEMPLATE[provider["plyr_provider"]]
+            return {"video_url": template.format(**provider)}
+        # the files are served after checking the access to the piece
+        field = MediaConstants.FIELD_BY_KIND[kind]
+        if not provider[field]:
+            return None
+        return {field: get_media_url(piece_code=row["code"], field=field)}
@@ -0,0 +1,183 @@
+import gzip
+
+import pytest
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from killay.admin.services import get_site_configuration
+from killay.archives.lib.constants import PieceConstants, ProviderConstants
+from killay.archives.tests import recipes as archives_recipes
+
+pytestmark = pytest.mark.django_db
+
+
+class TestArchiveListView:
+    path = "/api/v1/archives/"
+
+    def test_list(self, client):
+        archive = archives_recipes.archive_recipe.make(is_visible=True)
+        archives_recipes.archive_recipe.make(is_visible=False)
+        response = client.get(self.path)
+        assert response.status_code == 200
+        assert response.json()["results"] == [
+            {
+                "slug": archive.slug,
+                "name": archive.name,
+                "description": archive.description,
+                "image": None,
+                "image_srcsets": None,
+            }
+        ]
+
+    def test_sparse_fields(self, client):
+        archive = archives_recipes.archive_recipe.make(is_visible=True)
+        response = client.get(self.path, {"fields": "slug,name"})
+        assert response.json()["results"] == [
+            {"slug": archive.slug, "name": archive.name}
+        ]
+
+    def test_unknown_fields(self, client):
+        response = client.get(self.path, {"fields": "slug,password"})
+        assert response.status_code == 400
+        assert "password" in response.json()["detail"]
+
+    def test_not_published(self, client):
+        configuration = get_site_configuration()
+        configuration.is_published = False
+        configuration.save()
+        response = client.get(self.path)
+        assert response.status_code == 403
+
+    def test_gzip(self, client):
+        archives_recipes.archive_recipe.make(
+            is_visible=True, description="Descripción " * 100
+        )
+        response = client.get(self.path, HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        assert b"results" in gzip.decompress(response.content)
+
+
+class TestCollectionListView:
+    path = "/api/v1/collections/"
+
+    def test_by_archive(self, client):
+        collection = archives_recipes.collection_recipe.make(archive__is_visible=True)
+        archives_recipes.collection_recipe.make(archive__is_visible=True)
+        response = client.get(
+            self.path, {"archive": collection.archive.slug, "fields": "slug,archive"}
+        )
+        assert response.json()["results"] == [
+            {"slug": collection.slug, "archive": collection.archive.slug}
+        ]
+        response = client.get(self.path, {"archive": "wrong-archive"})
+        assert response.json()["results"] == []
+
+
+class TestPieceListView:
+    path = "/api/v1/pieces/"
+
+    def test_keyset_pages(self, client, monkeypatch):
+        monkeypatch.setattr("killay.api.lib.constants.ApiConstants.PAGE_SIZE", 2)
+        collection = archives_recipes.collection_recipe.make(archive__is_visible=True)
+        pieces = archives_recipes.piece_recipe.make(
+            collection=collection, title="Pieza", _quantity=5
+        )
+        codes = sorted(piece.code for piece in pieces)
+        data = client.get(self.path, {"fields": "code"}).json()
+        found = [piece["code"] for piece in data["results"]]
+        assert data["previous"] is None
+        while data["next"]:
+            data = client.get(data["next"]).json()
+            found += [piece["code"] for piece in data["results"]]
+        assert found == codes
+
+    def test_filters(self, client):
+        piece = archives_recipes.piece_recipe.make(
+            collection__archive__is_visible=True, kind=PieceConstants.KIND_IMAGE
+        )
+        archives_recipes.piece_recipe.make(collection__archive__is_visible=True)
+        keyword = piece.keywords.first()
+        for params in [
+            {"kind": PieceConstants.KIND_IMAGE},
+            {"keyword": keyword.slug},
+            {"collection": piece.collection.slug},
+        ]:
+            response = client.get(self.path, {**params, "fields": "code,url"})
+            assert response.json()["results"] == [
+                {"code": piece.code, "url": f"/pieces/{piece.code}/"}
+            ]
+
+    def test_visibility(self, client):
+        archives_recipes.piece_recipe.make(
+            collection__archive__is_visible=True, is_restricted=True
+        )
+        assert client.get(self.path).json()["results"] == []
+
+
+class TestPieceDetailView:
+    def test_detail(self, client):
+        piece = archives_recipes.piece_recipe.make(collection__archive__is_visible=True)
+        piece.meta.event = "Evento"
+        piece.meta.save()
+        archives_recipes.sequence_recipe.make(
+            piece=piece, title="Inicio", ini="00:01:00", end="00:02:00"
+        )
+        archives_recipes.provider_recipe.make(
+            piece=piece,
+            active=True,
+            plyr_provider=ProviderConstants.YOUTUBE,
+            ply_embed_id="abc",
+        )
+        response = client.get(f"/api/v1/pieces/{piece.code}/")
+        data = response.json()
+        assert data["code"] == piece.code
+        assert data["collection"] == piece.collection.slug
+        assert data["meta"]["event"] == "Evento"
+        assert data["sequences"] == [
+            {"title": "Inicio", "content": None, "ini_sec": 60, "end_sec": 120}
+        ]
+        assert data["keywords"] == [
+            {"slug": keyword.slug, "name": keyword.name}
+            for keyword in piece.keywords.all()
+        ]
+        assert data["provider"] == {"video_url": "https://youtube.com/embed/abc"}
+
+    def test_restricted_provider_file(self, client):
+        piece = archives_recipes.piece_recipe.make(
+            collection__archive__is_visible=True,
+            is_restricted=True,
+            kind=PieceConstants.KIND_SOUND,
+        )
+        provider = archives_recipes.provider_recipe.make(
+            piece=piece,
+            active=True,
+            file=SimpleUploadedFile("sound.mp3", b"sound", content_type="audio/mpeg"),
+        )
+        place = archives_recipes.place_recipe.make()
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        place.allowed_pieces.add(piece)
+        path = f"/api/v1/pieces/{piece.code}/"
+        assert client.get(path).status_code == 404
+        response = client.get(path, REMOTE_ADDR="10.0.0.1")
+        media_path = f"/pieces/{piece.code}/media/file/"
+        assert response.json()["provider"] == {"file": media_path}
+        assert provider.file.url not in response.content.decode()
+        assert client.get(media_path).status_code == 404
+        assert client.get(media_path, REMOTE_ADDR="10.0.0.1").status_code == 200
+
+    def test_sparse_fields(self, client, django_assert_num_queries):
+        piece = archives_recipes.piece_recipe.make(collection__archive__is_visible=True)
+        client.get(f"/api/v1/pieces/{piece.code}/")
+        # the piece and the people, inside the savepoint of the atomic request
+        with django_assert_num_queries(4):
+            response = client.get(
+                f"/api/v1/pieces/{piece.code}/", {"fields": "title,people"}
+            )
+        assert set(response.json()) == {"title", "people"}
+
+    def test_not_found(self, client):
+        piece = archives_recipes.piece_recipe.make(
+            collection__archive__is_visible=True, is_published=False
+        )
+        response = client.get(f"/api/v1/pieces/{piece.code}/")
+        assert response.status_code == 404
@@ -0,0 +1,36 @@
+from django.urls import path
+
+from killay.api.lib.constants import ApiConstants, ApiPatternConstants
+from killay.api.views import (
+    archive_list_view,
+    collection_list_view,
+    piece_detail_view,
+    piece_list_view,
+)
+
+
+app_name = ApiPatternConstants.APP_NAME
+
+
+urlpatterns = [
+    path(
+        f"{ApiConstants.VERSION}/archives/",
+        view=archive_list_view,
+        name=ApiPatternConstants.ARCHIVE_LIST,
+    ),
+    path(
+        f"{ApiConstants.VERSION}/collections/",
+        view=collection_list_view,
+        name=ApiPatternConstants.COLLECTION_LIST,
+    ),
+    path(
+        f"{ApiConstants.VERSION}/pieces/",
+        view=piece_list_view,
+        name=ApiPatternConstants.PIECE_LIST,
+    ),
+    path(
+        f"{ApiConstants.VERSION}/pieces/<str:slug>/",
+        view=piece_detail_view,
+        name=ApiPatternConstants.PIECE_DETAIL,
+    ),
+]
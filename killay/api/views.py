@@ -0,0 +1,145 @@
+from typing import List, Optional
+
+from django.http import JsonResponse
+from django.views.decorators.gzip import gzip_page
+from django.views.generic import View
+
+from killay.api.lib.constants import ApiConstants, ApiMessageConstants
+from killay.api.serializers import (
+    ApiError,
+    ArchiveSerializer,
+    CollectionSerializer,
+    PieceDetailSerializer,
+    PieceSerializer,
+)
+from killay.archives.services import (
+    get_public_archive_by_slug,
+    get_public_archives,
+    get_public_collections,
+    get_public_pieces,
+)
+from killay.viewer.engine.pagination import get_keyset_page
+from killay.viewer.engine.pipelines import ContentPipeline
+
+
+class ApiViewBase(View):
+    serializer_class = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            not request.user.is_superuser
+            and not request.site_configuration.is_published
+        ):
+            return self._get_error_response(
+                message=ApiMessageConstants.NOT_PUBLISHED, status=403
+            )
+        try:
+            self.serializer = self.serializer_class(
+                field_names=self._get_requested_fields()
+            )
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return self._get_error_response(message=error.message, status=error.status)
+
+    @staticmethod
+    def _get_error_response(message: str, status: int) -> JsonResponse:
+        return JsonResponse({"detail": str(message)}, status=status)
+
+    def _get_requested_fields(self) -> List[str]:
+        value = self.request.GET.get(ApiConstants.KEY_FIELDS, "")
+        return [
+            name.strip()
+            for name in value.split(ApiConstants.FIELDS_SEPARATOR)
+            if name.strip()
+        ]
+
+    def _get_page_url(self, cursor: Optional[str]) -> Optional[str]:
+        if not cursor:
+            return None
+        params = self.request.GET.copy()
+        params[ApiConstants.KEY_CURSOR] = cursor
+        return f"{self.request.path}?{params.urlencode()}"
+
+
+class ArchiveListView(ApiViewBase):
+    serializer_class = ArchiveSerializer
+
+    def get(self, request, *args, **kwargs):
+        rows = self.serializer.get_rows(get_public_archives(access=request.access))
+        return JsonResponse({"results": self.serializer.serialize_many(rows)})
+
+
+archive_list_view = gzip_page(ArchiveListView.as_view())
+
+
+class CollectionListView(ApiViewBase):
+    serializer_class = CollectionSerializer
+
+    def get(self, request, *args, **kwargs):
+        collections = get_public_collections(access=request.access)
+        archive_slug = request.GET.get("archive", "").strip()
+        if archive_slug:
+            archive = get_public_archive_by_slug(
+                slug=archive_slug, access=request.access
+            )
+            collections = (
+                collections.filter(archive_id=archive.id)
+                if archive
+                else collections.none()
+            )
+        rows = self.serializer.get_rows(collections)
+        return JsonResponse({"results": self.serializer.serialize_many(rows)})
+
+
+collection_list_view = gzip_page(CollectionListView.as_view())
+
+
+class PieceListView(ApiViewBase):
+    """
+    The pieces with the filters of the viewer list, paginated with the keyset
+    cursor of the viewer, so the results of a search are ordered by title.
+    """
+
+    serializer_class = PieceSerializer
+
+    def get(self, request, *args, **kwargs):
+        pipeline = ContentPipeline(request=request)
+        collection = pipeline.get_collection()
+        category = (
+            pipeline.get_category(collection_id=collection.id) if collection else None
+        )
+        archive = pipeline.get_archive(collection=collection, category=category)
+        pieces = pipeline.get_pieces(
+            archive=archive, collection=collection, category=category
+        )
+        page = get_keyset_page(
+            queryset=self.serializer.get_rows(pieces),
+            cursor=request.GET.get(ApiConstants.KEY_CURSOR),
+            per_page=ApiConstants.PAGE_SIZE,
+        )
+        return JsonResponse(
+            {
+                "results": self.serializer.serialize_many(page),
+                "next": self._get_page_url(cursor=page.next_cursor),
+                "previous": self._get_page_url(cursor=page.previous_cursor),
+            }
+        )
+
+
+piece_list_view = gzip_page(PieceListView.as_view())
+
+
+class PieceDetailView(ApiViewBase):
+    serializer_class = PieceDetailSerializer
+
+    def get(self, request, *args, **kwargs):
+        pieces = get_public_pieces(access=request.access).filter(
+            code=self.kwargs.get("slug")
+        )
+        row = self.serializer.get_rows(pieces).first()
+        if not row:
+            raise ApiError(message=ApiMessageConstants.PIECE_NOT_FOUND, status=404)
+        return JsonResponse(self.serializer.serialize(row))
+
+
+piece_detail_view = gzip_page(PieceDetailView.as_view())
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+
+@dataclass(frozen=True)
+class AccessContext:
+    place_id: Optional[int] = None
+    is_superuser: bool = False
+    allowed_archive_ids: FrozenSet[int] = frozenset()
+    allowed_collection_ids: FrozenSet[int] = frozenset()
+    allowed_piece_ids: FrozenSet[int] = frozenset()
+
+
+ANONYMOUS_ACCESS = AccessContext()
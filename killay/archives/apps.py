@@ -6,3 +6,6 @@ class ArchivesConfig(AppConfig):
     name = "killay.archives"
     verbose_name = _("Archives")
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        import killay.archives.signals  # noqa F401
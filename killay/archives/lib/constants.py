@@ -167,6 +167,15 @@ class PieceConstants:
     FIELD_IS_RESTRICTED_HELP_TEXT = gettext_lazy(
         "Indicates if the piece will be restricted to some public"
     )
+    LIST_FIELDS_BATCH_SIZE = 500
+    FIELD_RESOLVED_THUMB_URL = gettext_lazy("Resolved thumb URL")
+    FIELD_RESOLVED_THUMB_URL_HELP_TEXT = gettext_lazy(
+        "Thumb or provider image shown in the lists, updated automatically"
+    )
+    FIELD_DURATION = gettext_lazy("Duration")
+    FIELD_DURATION_HELP_TEXT = gettext_lazy(
+        "Duration of the metadata shown in the lists, updated automatically"
+    )
     FIELD_PLACES = gettext_lazy("Restricted to this places")
     FIELD_PLACES_HELP_TEXT = gettext_lazy(
         "If the piece is restricted it will be visible only in these places"
@@ -292,6 +301,168 @@ class PlaceAddressConstants:
     VERBOSE_NAME = gettext_lazy("place address")
     VERBOSE_NAME_PLURAL = gettext_lazy("place addresses")
     FIELD_IPV4 = gettext_lazy("IP Address")
-    FIELD_IPV4_HELP_TEXT = gettext_lazy("IP Address of the place")
+    FIELD_IPV4_HELP_TEXT = gettext_lazy(
+        "IP Address of the place, or first address of a range or CIDR block"
+    )
+    FIELD_IPV4_END = gettext_lazy("Last IP Address")
+    FIELD_IPV4_END_HELP_TEXT = gettext_lazy(
+        "Last IP Address of the range, leave it empty for a single address"
+    )
+    FIELD_PREFIX_LENGTH = gettext_lazy("Prefix length")
+    FIELD_PREFIX_LENGTH_HELP_TEXT = gettext_lazy(
+        "Prefix length of the CIDR block (e.g. 24 for x.x.x.0/24), "
+        "leave it empty for a single address"
+    )
     FIELD_DESCRIPTION = gettext_lazy("Description")
     FIELD_DESCRIPTION_HELP_TEXT = gettext_lazy("Description of the place address")
+    ERROR_RANGE_AND_PREFIX = gettext_lazy(
+        "A place address can be a range or a CIDR block, not both"
+    )
+    ERROR_RANGE_VERSION = gettext_lazy(
+        "Both addresses of the range must have the same IP version"
+    )
+    ERROR_RANGE_ORDER = gettext_lazy(
+        "Last IP Address must be greater than the first IP Address"
+    )
+    ERROR_PREFIX_LENGTH = gettext_lazy("Prefix length is too long for the address")
+    GENERATION_KEY = "archives:place_addresses:generation"
+    MAX_CACHED_LOOKUPS = 10000
+
+
+class EffectiveAccessConstants:
+    VERBOSE_NAME = gettext_lazy("effective access")
+    VERBOSE_NAME_PLURAL = gettext_lazy("effective accesses")
+    FIELD_PLACE = gettext_lazy("Place")
+    FIELD_PLACE_HELP_TEXT = gettext_lazy(
+        "Place from which the piece can be seen, empty for anonymous access"
+    )
+    FIELD_PIECE = gettext_lazy("Piece")
+    FIELD_PIECE_HELP_TEXT = gettext_lazy("Piece that can be seen")
+    BATCH_SIZE = 1000
+
+
+class PieceSearchTermConstants:
+    VERBOSE_NAME = gettext_lazy("piece search term")
+    VERBOSE_NAME_PLURAL = gettext_lazy("piece search terms")
+    FIELD_PIECE = gettext_lazy("Piece")
+    FIELD_PIECE_HELP_TEXT = gettext_lazy("Piece where the term was found")
+    FIELD_TERM = gettext_lazy("Term")
+    FIELD_TERM_HELP_TEXT = gettext_lazy("Normalized word of the piece content")
+    FIELD_WEIGHT = gettext_lazy("Weight")
+    FIELD_WEIGHT_HELP_TEXT = gettext_lazy("Relevance of the term for the piece")
+    TERM_MIN_LENGTH = 2
+    TERM_MAX_LENGTH = 100
+    WEIGHT_CODE = 8
+    WEIGHT_TITLE = 5
+    WEIGHT_PERSON = 3
+    WEIGHT_KEYWORD = 3
+    WEIGHT_META = 1
+    EXACT_MATCH_FACTOR = 2
+    BATCH_SIZE = 1000
+
+
+class SearchTextConstants:
+    FIELD_SEARCH_TEXT = gettext_lazy("Search text")
+    FIELD_SEARCH_TEXT_HELP_TEXT = gettext_lazy(
+        "Text without accents, case or punctuation used by the search"
+    )
+    PIECE_FIELDS = ["title"]
+    PIECE_META_FIELDS = [
+        "event",
+        "description",
+        "location",
+        "register_author",
+        "productor",
+        "notes",
+        "documentary_unit",
+    ]
+    CATEGORIZATION_FIELDS = ["name"]
+    BATCH_SIZE = 1000
+
+
+class SequenceSearchTermConstants:
+    VERBOSE_NAME = gettext_lazy("sequence search term")
+    VERBOSE_NAME_PLURAL = gettext_lazy("sequence search terms")
+    FIELD_SEQUENCE = gettext_lazy("Sequence")
+    FIELD_SEQUENCE_HELP_TEXT = gettext_lazy("Sequence where the term was found")
+    FIELD_PIECE = gettext_lazy("Piece")
+    FIELD_PIECE_HELP_TEXT = gettext_lazy("Piece of the sequence")
+    FIELD_ORDER = gettext_lazy("Order")
+    FIELD_ORDER_HELP_TEXT = gettext_lazy("Position of the sequence in the piece")
+    FIELD_INI_SEC = gettext_lazy("Init second")
+    FIELD_INI_SEC_HELP_TEXT = gettext_lazy("Second where the sequence starts")
+    FIELD_END_SEC = gettext_lazy("End second")
+    FIELD_END_SEC_HELP_TEXT = gettext_lazy("Second where the sequence ends")
+    FIELD_TERM = gettext_lazy("Term")
+    FIELD_TERM_HELP_TEXT = gettext_lazy("Normalized word of the sequence content")
+    FIELD_WEIGHT = gettext_lazy("Weight")
+    FIELD_WEIGHT_HELP_TEXT = gettext_lazy("Relevance of the term for the sequence")
+    WEIGHT_TITLE = 3
+    WEIGHT_CONTENT = 1
+    MAX_HITS_BY_PIECE = 3
+
+
+class ContentGenerationConstants:
+    SUGGEST_GENERATION_KEY = "archives:suggest:generation"
+    ACCESS_GENERATION_KEY = "archives:access:generation"
+
+
+class SuggestConstants:
+    KIND_PIECE = "pieces"
+    KIND_PERSON = "people"
+    KIND_KEYWORD = "keywords"
+    KIND_CATEGORY = "categories"
+    KINDS = [KIND_PIECE, KIND_PERSON, KIND_KEYWORD, KIND_CATEGORY]
+    QUERY_MIN_LENGTH = 2
+    KEY_MAX_LENGTH = 64
+    MAX_RESULTS_BY_KIND = 5
+    MAX_SCANNED_KEYS = 2000
+
+
+class ThumbnailConstants:
+    DIRECTORY = "thumbnails"
+    NAME_TEMPLATE = "{directory}/{stem}-{width}w.{extension}"
+    WIDTHS = [320, 640, 1280]
+    DEFAULT_WIDTH = 640
+    FORMAT_WEBP = "webp"
+    FORMAT_JPEG = "jpeg"
+    FORMATS = [FORMAT_WEBP, FORMAT_JPEG]
+    EXTENSIONS = {FORMAT_WEBP: "webp", FORMAT_JPEG: "jpg"}
+    QUALITY = 80
+    READY_KEY = "archives:thumbnails:ready:{digest}"
+    # the workers do not share the cache with the generate_thumbnails command,
+    # so the missing thumbnails are looked up again after this many seconds
+    MISSING_TIMEOUT = 300
+    # image fields of the content that get thumbnails
+    IMAGE_FIELDS = [
+        ("archives.Archive", "image"),
+        ("archives.Collection", "image"),
+        ("archives.Piece", "thumb"),
+        ("archives.Provider", "image"),
+    ]
+
+
+class LinkCheckConstants:
+    # the embed pages answer 200 for removed videos, their oembed does not
+    URL_TEMPLATE = {
+        ProviderConstants.YOUTUBE: (
+            "https://www.youtube.com/oembed?format=json&"
+            "url=https%3A//www.youtube.com/watch%3Fv%3D{ply_embed_id}"
+        ),
+        ProviderConstants.VIMEO: (
+            "https://vimeo.com/api/oembed.json?url=https%3A//vimeo.com/{ply_embed_id}"
+        ),
+    }
+    STALE_HOURS = 24 * 7
+    CONCURRENCY = 20
+    # requests started by second to the same host
+    HOST_RATE = 5
+    RETRIES = 2
+    RETRY_DELAY = 1
+    TIMEOUT = 10
+    MAX_REDIRECTS = 3
+    # answers that tell the link is gone, the others are retried
+    OFFLINE_STATUSES = [400, 401, 403, 404, 410]
+    RETRY_STATUSES = [408, 429]
+    BATCH_SIZE = 500
+    USER_AGENT = "killay-link-checker"
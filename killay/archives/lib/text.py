@@ -0,0 +1,18 @@
+import re
+import unicodedata
+
+from typing import Optional
+
+WORD_REGEX = re.compile(r"[^\W_]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Folds accents and case and drops punctuation, so "¡Canción!" and
+    "cancion" normalize to the same text.
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(WORD_REGEX.findall(folded.casefold()))
@@ -0,0 +1,224 @@
+import asyncio
+import ssl
+
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from django.db.models import F
+from django.utils import timezone
+
+from killay.archives.lib.constants import LinkCheckConstants, PieceConstants
+from killay.archives.models import Provider
+
+
+class HostRateLimiter:
+    """
+    Spaces the requests to the same host, each one waits its turn so no more
+    than rate requests start by second. The event loop runs in one thread, so
+    the turns need no lock.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0
+        self.next_times = {}
+
+    async def wait(self, host: str) -> None:
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next_times.get(host, now))
+        self.next_times[host] = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def get_check_url(provider: Provider) -> Optional[str]:
+    template = LinkCheckConstants.URL_TEMPLATE.get(provider.plyr_provider)
+    if not template or not provider.ply_embed_id:
+        return None
+    return template.format(ply_embed_id=provider.ply_embed_id)
+
+
+async def fetch_status(url: str) -> Tuple[int, Optional[str]]:
+    """
+    Returns the status and the location of the answer to a GET of the url,
+    only the head of the answer is read before closing the connection.
+    """
+    parts = urlsplit(url)
+    is_https = parts.scheme == "https"
+    default_port = 443 if is_https else 80
+    port = parts.port or default_port
+    # the netloc can carry credentials, never sent in the header
+    host = f"[{parts.hostname}]" if ":" in parts.hostname else parts.hostname
+    if port != default_port:
+        host = f"{host}:{port}"
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    reader, writer = await asyncio.open_connection(
+        parts.hostname,
+        port,
+        ssl=ssl.create_default_context() if is_https else None,
+    )
+    try:
+        writer.write(
+            (
+                f"GET {path} HTTP/1.1\r\n"
+                f"Host: {host}\r\n"
+                f"User-Agent: {LinkCheckConstants.USER_AGENT}\r\n"
+                "Accept: */*\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode()
+        )
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        location = None
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.lower() == "location":
+                location = urljoin(url, value.strip())
+        return status, location
+    finally:
+        writer.close()
+
+
+async def check_url(
+    url: Optional[str],
+    semaphore: asyncio.Semaphore,
+    limiter: HostRateLimiter,
+    retries: int = LinkCheckConstants.RETRIES,
+    retry_delay: float = LinkCheckConstants.RETRY_DELAY,
+) -> Optional[bool]:
+    """
+    Tells if the url answers, following its redirects. The network errors,
+    the server errors and the throttled answers are retried with a growing
+    delay, and None is returned when they last, so the link is checked again
+    in the next run instead of being marked offline.
+    """
+    if not url:
+        return False
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(retry_delay * 2 ** (attempt - 1))
+        current_url = url
+        try:
+            for _ in range(LinkCheckConstants.MAX_REDIRECTS + 1):
+                # the turn of the host is waited without holding a slot, so the
+                # other hosts go on meanwhile
+                await limiter.wait(host=urlsplit(current_url).hostname)
+                async with semaphore:
+                    status, location = await asyncio.wait_for(
+                        fetch_status(url=current_url),
+                        timeout=LinkCheckConstants.TIMEOUT,
+                    )
+                if not (300 <= status < 400 and location):
+                    break
+                current_url = location
+        except (OSError, ValueError, IndexError, asyncio.TimeoutError):
+            continue
+        if status < 300:
+            return True
+        if status in LinkCheckConstants.OFFLINE_STATUSES:
+            return False
+        if status >= 500 or status in LinkCheckConstants.RETRY_STATUSES:
+            continue
+        return False
+    return None
+
+
+async def check_urls(
+    urls: Iterable[Optional[str]],
+    concurrency: int = LinkCheckConstants.CONCURRENCY,
+    rate: float = LinkCheckConstants.HOST_RATE,
+    retries: int = LinkCheckConstants.RETRIES,
+    retry_delay: float = LinkCheckConstants.RETRY_DELAY,
+) -> List[Optional[bool]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = HostRateLimiter(rate=rate)
+    return await asyncio.gather(
+        *(
+            check_url(
+                url=url,
+                semaphore=semaphore,
+                limiter=limiter,
+                retries=retries,
+                retry_delay=retry_delay,
+            )
+            for url in urls
+        )
+    )
+
+
+def _is_file_online(provider: Provider) -> bool:
+    if provider.piece.kind == PieceConstants.KIND_IMAGE:
+        field_file = provider.image
+    else:
+        field_file = provider.file
+    return bool(field_file) and field_file.storage.exists(field_file.name)
+
+
+def check_providers(
+    stale_after: timedelta = timedelta(hours=LinkCheckConstants.STALE_HOURS),
+    concurrency: int = LinkCheckConstants.CONCURRENCY,
+    rate: float = LinkCheckConstants.HOST_RATE,
+    retries: int = LinkCheckConstants.RETRIES,
+    retry_delay: float = LinkCheckConstants.RETRY_DELAY,
+) -> Dict[str, int]:
+    """
+    Checks the active providers not checked since stale_after, the oldest
+    first: the links of the videos at the same time and the files in the
+    storage. Each batch is saved before the next one starts, so a stopped
+    run keeps what it checked. The providers that could not be checked keep
+    their state and stay stale. Returns the number of providers online,
+    offline and unknown.
+    """
+    checked_before = timezone.now() - stale_after
+    provider_ids = list(
+        Provider.objects.filter(active=True)
+        .exclude(checked_at__gte=checked_before)
+        .order_by(F("checked_at").asc(nulls_first=True), "id")
+        .values_list("id", flat=True)
+    )
+    report = {"online": 0, "offline": 0, "unknown": 0}
+    for index in range(0, len(provider_ids), LinkCheckConstants.BATCH_SIZE):
+        batch_ids = provider_ids[index : index + LinkCheckConstants.BATCH_SIZE]
+        providers = list(
+            Provider.objects.filter(id__in=batch_ids).select_related("piece")
+        )
+        videos = [
+            provider
+            for provider in providers
+            if provider.piece.kind == PieceConstants.KIND_VIDEO
+        ]
+        video_results = asyncio.run(
+            check_urls(
+                urls=[get_check_url(provider=provider) for provider in videos],
+                concurrency=concurrency,
+                rate=rate,
+                retries=retries,
+                retry_delay=retry_delay,
+            )
+        )
+        results = dict(zip(videos, video_results))
+        checked_at = timezone.now()
+        checked_providers = []
+        for provider in providers:
+            if provider in results:
+                online = results[provider]
+            else:
+                online = _is_file_online(provider=provider)
+            if online is None:
+                report["unknown"] += 1
+                continue
+            report["online" if online else "offline"] += 1
+            provider.online = online
+            provider.checked_at = checked_at
+            checked_providers.append(provider)
+        Provider.objects.bulk_update(
+            checked_providers,
+            ["online", "checked_at"],
+            batch_size=LinkCheckConstants.BATCH_SIZE,
+        )
+    return report
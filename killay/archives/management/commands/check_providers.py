@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from killay.archives.lib.constants import LinkCheckConstants
+from killay.archives.links import check_providers
+
+
+class Command(BaseCommand):
+    help = "Check if the videos and files of the active providers are online"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-hours",
+            type=float,
+            default=LinkCheckConstants.STALE_HOURS,
+            help="Check again the providers checked before these hours, 0 for all",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=LinkCheckConstants.CONCURRENCY,
+            help="Requests open at the same time",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=LinkCheckConstants.HOST_RATE,
+            help="Requests started by second to the same host",
+        )
+        parser.add_argument(
+            "--retries",
+            type=int,
+            default=LinkCheckConstants.RETRIES,
+            help="Attempts after a network or server error",
+        )
+
+    def handle(self, *args, **options):
+        report = check_providers(
+            stale_after=timedelta(hours=options["stale_hours"]),
+            concurrency=options["concurrency"],
+            rate=options["rate"],
+            retries=options["retries"],
+        )
+        if report["unknown"]:
+            self.stderr.write(f"{report['unknown']} providers could not be checked")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report['online']} providers online, {report['offline']} offline"
+            )
+        )
@@ -0,0 +1,45 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import django
+
+from django.core.management.base import BaseCommand
+
+from killay.archives.thumbnails import generate_field_thumbnails, get_image_names
+
+
+class Command(BaseCommand):
+    help = "Generate the missing thumbnails of the images of the content"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes resizing images at the same time",
+        )
+        parser.add_argument(
+            "--force", action="store_true", help="Regenerate existing thumbnails"
+        )
+
+    def handle(self, *args, **options):
+        # the names are read here, the workers only touch the storage
+        images = get_image_names()
+        generate = partial(generate_field_thumbnails, force=options["force"])
+        labels = [label for label, _ in images]
+        names = [name for _, name in images]
+        if options["workers"] > 1:
+            with ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=django.setup
+            ) as executor:
+                results = list(executor.map(generate, labels, names, chunksize=8))
+        else:
+            results = [generate(label, name) for label, name in images]
+        failed = [name for name, result in zip(names, results) if not result]
+        for name in failed:
+            self.stderr.write(f"Unreadable image: {name}")
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(names) - len(failed)} images with thumbnails")
+        )
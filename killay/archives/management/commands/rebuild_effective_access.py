@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from killay.archives.models import EffectiveAccess
+from killay.archives.services import rebuild_effective_access
+
+
+class Command(BaseCommand):
+    help = "Rebuild the effective access table of pieces by place"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_effective_access()
+        total = EffectiveAccess.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"{total} effective access rows built"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from killay.archives.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index of pieces"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"{total} search terms indexed"))
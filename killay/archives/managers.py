@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils.translation import gettext_lazy
 
+from killay.archives.lib.text import normalize_text
+
 
 class TimeBase(models.Model):
     created_at = models.DateTimeField(gettext_lazy("Created at"), auto_now_add=True)
@@ -27,6 +29,32 @@ class CategorizationBase(models.Model):
         return f"{self.name} <{self.slug}>"
 
 
+class SearchTextBase(models.Model):
+    """
+    Keeps a normalized copy of SEARCH_TEXT_FIELDS in the search_text field.
+    """
+
+    SEARCH_TEXT_FIELDS = []
+
+    class Meta:
+        abstract = True
+
+    def get_search_text(self) -> str:
+        values = [getattr(self, field) for field in self.SEARCH_TEXT_FIELDS]
+        search_text = normalize_text(" ".join(str(value) for value in values if value))
+        max_length = self._meta.get_field("search_text").max_length
+        return search_text[:max_length] if max_length else search_text
+
+    def save(self, *args, **kwargs):
+        self.search_text = self.get_search_text()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(
+            self.SEARCH_TEXT_FIELDS
+        ):
+            kwargs["update_fields"] = {*update_fields, "search_text"}
+        super().save(*args, **kwargs)
+
+
 class SequenceManager(models.Manager):
     def get_ordered_data(self):
         return [
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.23 on 2026-10-18 08:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0009_auto_20230828_1624'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EffectiveAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('piece', models.ForeignKey(help_text='Piece that can be seen', on_delete=django.db.models.deletion.CASCADE, related_name='effective_access', to='archives.piece', verbose_name='Piece')),
+                ('place', models.ForeignKey(help_text='Place from which the piece can be seen, empty for anonymous access', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='effective_access', to='archives.place', verbose_name='Place')),
+            ],
+            options={
+                'verbose_name': 'effective access',
+                'verbose_name_plural': 'effective accesses',
+                'unique_together': {('place', 'piece')},
+            },
+        ),
+    ]
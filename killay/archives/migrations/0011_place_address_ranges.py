@@ -0,0 +1,28 @@
+# Generated by Django 3.2.23 on 2026-10-18 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0010_effectiveaccess'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='placeaddress',
+            name='ipv4_end',
+            field=models.GenericIPAddressField(blank=True, help_text='Last IP Address of the range, leave it empty for a single address', null=True, verbose_name='Last IP Address'),
+        ),
+        migrations.AddField(
+            model_name='placeaddress',
+            name='prefix_length',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Prefix length of the CIDR block (e.g. 24 for x.x.x.0/24), leave it empty for a single address', null=True, verbose_name='Prefix length'),
+        ),
+        migrations.AlterField(
+            model_name='placeaddress',
+            name='ipv4',
+            field=models.GenericIPAddressField(db_index=True, help_text='IP Address of the place, or first address of a range or CIDR block', unique=True, verbose_name='IP Address'),
+        ),
+    ]
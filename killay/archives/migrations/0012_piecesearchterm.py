@@ -0,0 +1,28 @@
+# Generated by Django 3.2.23 on 2026-10-18 08:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0011_place_address_ranges'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PieceSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(help_text='Normalized word of the piece content', max_length=100, verbose_name='Term')),
+                ('weight', models.PositiveIntegerField(default=1, help_text='Relevance of the term for the piece', verbose_name='Weight')),
+                ('piece', models.ForeignKey(help_text='Piece where the term was found', on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='archives.piece', verbose_name='Piece')),
+            ],
+            options={
+                'verbose_name': 'piece search term',
+                'verbose_name_plural': 'piece search terms',
+                'unique_together': {('term', 'piece')},
+            },
+        ),
+    ]
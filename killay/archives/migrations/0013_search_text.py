@@ -0,0 +1,33 @@
+# Generated by Django 3.2.23 on 2026-10-18 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0012_piecesearchterm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='keyword',
+            name='search_text',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Text without accents, case or punctuation used by the search', max_length=255, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='search_text',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Text without accents, case or punctuation used by the search', max_length=255, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='piece',
+            name='search_text',
+            field=models.CharField(blank=True, default='', help_text='Text without accents, case or punctuation used by the search', max_length=512, verbose_name='Search text'),
+        ),
+        migrations.AddField(
+            model_name='piecemeta',
+            name='search_text',
+            field=models.TextField(blank=True, default='', help_text='Text without accents, case or punctuation used by the search', verbose_name='Search text'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+from killay.archives.lib.constants import SearchTextConstants
+from killay.archives.lib.text import normalize_text
+
+
+MODEL_FIELDS = [
+    ("Piece", SearchTextConstants.PIECE_FIELDS),
+    ("PieceMeta", SearchTextConstants.PIECE_META_FIELDS),
+    ("Person", SearchTextConstants.CATEGORIZATION_FIELDS),
+    ("Keyword", SearchTextConstants.CATEGORIZATION_FIELDS),
+]
+
+
+def fill_search_text(apps, schema_editor):
+    for model_name, fields in MODEL_FIELDS:
+        model = apps.get_model("archives", model_name)
+        max_length = model._meta.get_field("search_text").max_length
+        batch = []
+        for instance in model.objects.only("id", *fields).iterator():
+            values = [getattr(instance, field) for field in fields]
+            search_text = normalize_text(" ".join(str(value) for value in values if value))
+            instance.search_text = search_text[:max_length] if max_length else search_text
+            batch.append(instance)
+            if len(batch) >= SearchTextConstants.BATCH_SIZE:
+                model.objects.bulk_update(batch, ["search_text"])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ["search_text"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0013_search_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.23 on 2026-10-18 08:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0014_fill_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenceSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveIntegerField(help_text='Position of the sequence in the piece', verbose_name='Order')),
+                ('ini_sec', models.PositiveIntegerField(help_text='Second where the sequence starts', verbose_name='Init second')),
+                ('end_sec', models.PositiveIntegerField(help_text='Second where the sequence ends', verbose_name='End second')),
+                ('term', models.CharField(help_text='Normalized word of the sequence content', max_length=100, verbose_name='Term')),
+                ('weight', models.PositiveIntegerField(default=1, help_text='Relevance of the term for the sequence', verbose_name='Weight')),
+                ('piece', models.ForeignKey(help_text='Piece of the sequence', on_delete=django.db.models.deletion.CASCADE, related_name='sequence_search_terms', to='archives.piece', verbose_name='Piece')),
+                ('sequence', models.ForeignKey(help_text='Sequence where the term was found', on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='archives.sequence', verbose_name='Sequence')),
+            ],
+            options={
+                'verbose_name': 'sequence search term',
+                'verbose_name_plural': 'sequence search terms',
+                'unique_together': {('term', 'sequence')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.23 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0015_sequencesearchterm'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='piece',
+            index=models.Index(fields=['title', 'code', 'id'], name='archives_pi_title_326146_idx'),
+        ),
+    ]
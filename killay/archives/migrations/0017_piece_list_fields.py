@@ -0,0 +1,53 @@
+# Generated by Django 3.2.23 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+from killay.archives.lib.constants import PieceConstants, ProviderConstants
+
+
+def fill_piece_list_fields(apps, schema_editor):
+    Piece = apps.get_model("archives", "Piece")
+    PieceMeta = apps.get_model("archives", "PieceMeta")
+    Provider = apps.get_model("archives", "Provider")
+    durations = dict(PieceMeta.objects.values_list("piece_id", "duration"))
+    youtube_codes = dict(
+        Provider.objects.filter(
+            active=True, plyr_provider=ProviderConstants.YOUTUBE
+        ).values_list("piece_id", "ply_embed_id")
+    )
+    batch = []
+    for piece in Piece.objects.only("id", "thumb", "kind").iterator():
+        piece.duration = durations.get(piece.id)
+        if piece.thumb:
+            piece.resolved_thumb_url = piece.thumb.url
+        elif piece.kind == PieceConstants.KIND_VIDEO and piece.id in youtube_codes:
+            piece.resolved_thumb_url = ProviderConstants.THUMB_YOUTUBE_TEMPLATE.format(
+                code=youtube_codes[piece.id]
+            )
+        batch.append(piece)
+        if len(batch) >= PieceConstants.LIST_FIELDS_BATCH_SIZE:
+            Piece.objects.bulk_update(batch, ["resolved_thumb_url", "duration"])
+            batch = []
+    if batch:
+        Piece.objects.bulk_update(batch, ["resolved_thumb_url", "duration"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0016_piece_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='piece',
+            name='duration',
+            field=models.TimeField(blank=True, editable=False, help_text='Duration of the metadata shown in the lists, updated automatically', null=True, verbose_name='Duration'),
+        ),
+        migrations.AddField(
+            model_name='piece',
+            name='resolved_thumb_url',
+            field=models.CharField(blank=True, editable=False, help_text='Thumb or provider image shown in the lists, updated automatically', max_length=500, null=True, verbose_name='Resolved thumb URL'),
+        ),
+        migrations.RunPython(fill_piece_list_fields, migrations.RunPython.noop),
+    ]
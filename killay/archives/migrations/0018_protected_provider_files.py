@@ -0,0 +1,57 @@
+# Generated by Django 3.2.23 on 2026-10-18 10:32
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+import killay.archives.storages
+
+from killay.archives.storages import protected_storage
+from killay.archives.thumbnails import get_thumbnail_names
+
+
+def _get_provider_names(apps):
+    # the files and images of the providers, with the thumbnails of the images
+    Provider = apps.get_model("archives", "Provider")
+    names = set(Provider.objects.exclude(file="").exclude(file__isnull=True).values_list("file", flat=True))
+    for name in Provider.objects.exclude(image="").exclude(image__isnull=True).values_list("image", flat=True):
+        names.add(name)
+        names.update(get_thumbnail_names(name))
+    return sorted(names)
+
+
+def _move_files(names, source, target):
+    for name in names:
+        if not source.exists(name):
+            continue
+        if not target.exists(name):
+            with source.open(name, "rb") as file:
+                target.save(name, file)
+        source.delete(name)
+
+
+def protect_provider_files(apps, schema_editor):
+    _move_files(_get_provider_names(apps), source=default_storage, target=protected_storage)
+
+
+def publish_provider_files(apps, schema_editor):
+    _move_files(_get_provider_names(apps), source=protected_storage, target=default_storage)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0017_piece_list_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='provider',
+            name='file',
+            field=models.FileField(help_text='File hosted on the server, field used by pieces of kind document and sound', null=True, storage=killay.archives.storages.ProtectedStorage(), upload_to='piece_files', verbose_name='File'),
+        ),
+        migrations.AlterField(
+            model_name='provider',
+            name='image',
+            field=models.ImageField(help_text='Image hosted on the server, field used by pieces of kind image', null=True, storage=killay.archives.storages.ProtectedStorage(), upload_to='piece_images', verbose_name='Image'),
+        ),
+        migrations.RunPython(protect_provider_files, publish_provider_files),
+    ]
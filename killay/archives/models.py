@@ -1,3 +1,5 @@
+from typing import Optional
+
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.db import models
@@ -7,16 +9,26 @@ from killay.archives.lib.constants import (
     ArchiveConstants,
     CategoryConstants,
     CollectionConstants,
+    EffectiveAccessConstants,
     KeywordConstants,
     PersonConstants,
     PieceConstants,
     PieceMetaConstants,
+    PieceSearchTermConstants,
     PlaceConstants,
     PlaceAddressConstants,
     ProviderConstants,
+    SearchTextConstants,
     SequenceConstants,
+    SequenceSearchTermConstants,
+)
+from killay.archives.managers import (
+    CategorizationBase,
+    SearchTextBase,
+    SequenceManager,
+    TimeBase,
 )
-from killay.archives.managers import CategorizationBase, SequenceManager, TimeBase
+from killay.archives.storages import protected_storage
 
 
 class Archive(TimeBase):
@@ -171,13 +183,23 @@ class Category(TimeBase, CategorizationBase):
         )
 
 
-class Person(TimeBase, CategorizationBase):
+class Person(TimeBase, CategorizationBase, SearchTextBase):
     site = models.ForeignKey(
         Site,
         on_delete=models.CASCADE,
         related_name="persons",
         default=settings.SITE_ID,
     )
+    search_text = models.CharField(
+        verbose_name=SearchTextConstants.FIELD_SEARCH_TEXT,
+        help_text=SearchTextConstants.FIELD_SEARCH_TEXT_HELP_TEXT,
+        max_length=255,
+        blank=True,
+        default="",
+        db_index=True,
+    )
+
+    SEARCH_TEXT_FIELDS = SearchTextConstants.CATEGORIZATION_FIELDS
 
     class Meta:
         verbose_name = PersonConstants.VERBOSE_NAME
@@ -192,13 +214,23 @@ class Person(TimeBase, CategorizationBase):
         return self.name
 
 
-class Keyword(TimeBase, CategorizationBase):
+class Keyword(TimeBase, CategorizationBase, SearchTextBase):
     site = models.ForeignKey(
         Site,
         on_delete=models.CASCADE,
         related_name="keywords",
         default=settings.SITE_ID,
     )
+    search_text = models.CharField(
+        verbose_name=SearchTextConstants.FIELD_SEARCH_TEXT,
+        help_text=SearchTextConstants.FIELD_SEARCH_TEXT_HELP_TEXT,
+        max_length=255,
+        blank=True,
+        default="",
+        db_index=True,
+    )
+
+    SEARCH_TEXT_FIELDS = SearchTextConstants.CATEGORIZATION_FIELDS
 
     class Meta:
         verbose_name = KeywordConstants.VERBOSE_NAME
@@ -213,7 +245,7 @@ class Keyword(TimeBase, CategorizationBase):
         return self.name
 
 
-class Piece(TimeBase):
+class Piece(TimeBase, SearchTextBase):
     code = models.SlugField(
         verbose_name=PieceConstants.FIELD_CODE,
         help_text=PieceConstants.FIELD_CODE_HELP_TEXT,
@@ -281,12 +313,39 @@ class Piece(TimeBase):
         help_text=PieceConstants.FIELD_IS_RESTRICTED_HELP_TEXT,
         default=False,
     )
+    search_text = models.CharField(
+        verbose_name=SearchTextConstants.FIELD_SEARCH_TEXT,
+        help_text=SearchTextConstants.FIELD_SEARCH_TEXT_HELP_TEXT,
+        max_length=512,
+        blank=True,
+        default="",
+    )
+    # copies of the related content shown by the lists, see
+    # refresh_piece_list_fields
+    resolved_thumb_url = models.CharField(
+        verbose_name=PieceConstants.FIELD_RESOLVED_THUMB_URL,
+        help_text=PieceConstants.FIELD_RESOLVED_THUMB_URL_HELP_TEXT,
+        max_length=500,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    duration = models.TimeField(
+        verbose_name=PieceConstants.FIELD_DURATION,
+        help_text=PieceConstants.FIELD_DURATION_HELP_TEXT,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    SEARCH_TEXT_FIELDS = SearchTextConstants.PIECE_FIELDS
 
     class Meta:
         verbose_name = PieceConstants.VERBOSE_NAME
         verbose_name_plural = PieceConstants.VERBOSE_NAME_PLURAL
         ordering = ["title", "code"]
         unique_together = ["code", "site"]
+        indexes = [models.Index(fields=["title", "code", "id"])]
 
     objects = models.Manager()
     objects_in_site = InSiteManager()
@@ -295,6 +354,7 @@ class Piece(TimeBase):
         return f"Piece <{self.code}>"
 
     def save(self, *args, **kwargs):
+        self.resolved_thumb_url = self.thumb_url
         super().save(*args, **kwargs)
         try:
             self.meta
@@ -307,12 +367,18 @@ class Piece(TimeBase):
 
     @property
     def thumb_url(self):
-        thumb_url = self.thumb.url if self.thumb else None
-        if thumb_url or self.kind != PieceConstants.KIND_VIDEO:
-            return thumb_url
-        active_provider = self.active_provider
+        if self.thumb or self.kind != PieceConstants.KIND_VIDEO or not self.pk:
+            return self.get_thumb_url()
+        return self.get_thumb_url(active_provider=self.active_provider)
+
+    def get_thumb_url(
+        self, active_provider: Optional["Provider"] = None
+    ) -> Optional[str]:
+        if self.thumb:
+            return self.thumb.url
         if (
-            active_provider
+            self.kind == PieceConstants.KIND_VIDEO
+            and active_provider
             and active_provider.plyr_provider == ProviderConstants.YOUTUBE
         ):
             return ProviderConstants.THUMB_YOUTUBE_TEMPLATE.format(
@@ -396,16 +462,18 @@ class Provider(models.Model):
         verbose_name=ProviderConstants.FIELD_IMAGE,
         help_text=ProviderConstants.FIELD_IMAGE_HELP_TEXT,
         upload_to="piece_images",
+        storage=protected_storage,
         null=True,
     )
     file = models.FileField(
         verbose_name=ProviderConstants.FIELD_FILE,
         help_text=ProviderConstants.FIELD_FILE_HELP_TEXT,
         upload_to="piece_files",
+        storage=protected_storage,
         null=True,
     )
 
-    # to implement:
+    # set by the check_providers command
     online = models.BooleanField(
         verbose_name=ProviderConstants.FIELD_ONLINE, default=False
     )
@@ -467,7 +535,7 @@ class Provider(models.Model):
         return self.active
 
 
-class PieceMeta(TimeBase):
+class PieceMeta(TimeBase, SearchTextBase):
     piece = models.OneToOneField(Piece, on_delete=models.CASCADE, related_name="meta")
     event = models.CharField(
         verbose_name=PieceMetaConstants.FIELD_EVENT,
@@ -554,6 +622,14 @@ class PieceMeta(TimeBase):
         null=True,
         blank=True,
     )
+    search_text = models.TextField(
+        verbose_name=SearchTextConstants.FIELD_SEARCH_TEXT,
+        help_text=SearchTextConstants.FIELD_SEARCH_TEXT_HELP_TEXT,
+        blank=True,
+        default="",
+    )
+
+    SEARCH_TEXT_FIELDS = SearchTextConstants.PIECE_META_FIELDS
 
     class Meta:
         verbose_name = PieceMetaConstants.VERBOSE_NAME
@@ -617,6 +693,18 @@ class PlaceAddress(TimeBase):
         blank=False,
         db_index=True,
     )
+    ipv4_end = models.GenericIPAddressField(
+        verbose_name=PlaceAddressConstants.FIELD_IPV4_END,
+        help_text=PlaceAddressConstants.FIELD_IPV4_END_HELP_TEXT,
+        null=True,
+        blank=True,
+    )
+    prefix_length = models.PositiveSmallIntegerField(
+        verbose_name=PlaceAddressConstants.FIELD_PREFIX_LENGTH,
+        help_text=PlaceAddressConstants.FIELD_PREFIX_LENGTH_HELP_TEXT,
+        null=True,
+        blank=True,
+    )
     description = models.CharField(
         verbose_name=PlaceAddressConstants.FIELD_DESCRIPTION,
         help_text=PlaceAddressConstants.FIELD_DESCRIPTION_HELP_TEXT,
@@ -632,3 +720,104 @@ class PlaceAddress(TimeBase):
 
     def __str__(self):
         return f"PlaceAddress <{self.ipv4}>"
+
+
+class EffectiveAccess(models.Model):
+    place = models.ForeignKey(
+        Place,
+        verbose_name=EffectiveAccessConstants.FIELD_PLACE,
+        help_text=EffectiveAccessConstants.FIELD_PLACE_HELP_TEXT,
+        on_delete=models.CASCADE,
+        related_name="effective_access",
+        null=True,
+    )
+    piece = models.ForeignKey(
+        Piece,
+        verbose_name=EffectiveAccessConstants.FIELD_PIECE,
+        help_text=EffectiveAccessConstants.FIELD_PIECE_HELP_TEXT,
+        on_delete=models.CASCADE,
+        related_name="effective_access",
+    )
+
+    class Meta:
+        verbose_name = EffectiveAccessConstants.VERBOSE_NAME
+        verbose_name_plural = EffectiveAccessConstants.VERBOSE_NAME_PLURAL
+        unique_together = ["place", "piece"]
+
+    def __str__(self):
+        return f"EffectiveAccess <{self.place_id}, {self.piece_id}>"
+
+
+class PieceSearchTerm(models.Model):
+    piece = models.ForeignKey(
+        Piece,
+        verbose_name=PieceSearchTermConstants.FIELD_PIECE,
+        help_text=PieceSearchTermConstants.FIELD_PIECE_HELP_TEXT,
+        on_delete=models.CASCADE,
+        related_name="search_terms",
+    )
+    term = models.CharField(
+        verbose_name=PieceSearchTermConstants.FIELD_TERM,
+        help_text=PieceSearchTermConstants.FIELD_TERM_HELP_TEXT,
+        max_length=PieceSearchTermConstants.TERM_MAX_LENGTH,
+    )
+    weight = models.PositiveIntegerField(
+        verbose_name=PieceSearchTermConstants.FIELD_WEIGHT,
+        help_text=PieceSearchTermConstants.FIELD_WEIGHT_HELP_TEXT,
+        default=1,
+    )
+
+    class Meta:
+        verbose_name = PieceSearchTermConstants.VERBOSE_NAME
+        verbose_name_plural = PieceSearchTermConstants.VERBOSE_NAME_PLURAL
+        unique_together = ["term", "piece"]
+
+    def __str__(self):
+        return f"PieceSearchTerm <{self.term}, {self.piece_id}>"
+
+
+class SequenceSearchTerm(models.Model):
+    sequence = models.ForeignKey(
+        Sequence,
+        verbose_name=SequenceSearchTermConstants.FIELD_SEQUENCE,
+        help_text=SequenceSearchTermConstants.FIELD_SEQUENCE_HELP_TEXT,
+        on_delete=models.CASCADE,
+        related_name="search_terms",
+    )
+    piece = models.ForeignKey(
+        Piece,
+        verbose_name=SequenceSearchTermConstants.FIELD_PIECE,
+        help_text=SequenceSearchTermConstants.FIELD_PIECE_HELP_TEXT,
+        on_delete=models.CASCADE,
+        related_name="sequence_search_terms",
+    )
+    order = models.PositiveIntegerField(
+        verbose_name=SequenceSearchTermConstants.FIELD_ORDER,
+        help_text=SequenceSearchTermConstants.FIELD_ORDER_HELP_TEXT,
+    )
+    ini_sec = models.PositiveIntegerField(
+        verbose_name=SequenceSearchTermConstants.FIELD_INI_SEC,
+        help_text=SequenceSearchTermConstants.FIELD_INI_SEC_HELP_TEXT,
+    )
+    end_sec = models.PositiveIntegerField(
+        verbose_name=SequenceSearchTermConstants.FIELD_END_SEC,
+        help_text=SequenceSearchTermConstants.FIELD_END_SEC_HELP_TEXT,
+    )
+    term = models.CharField(
+        verbose_name=SequenceSearchTermConstants.FIELD_TERM,
+        help_text=SequenceSearchTermConstants.FIELD_TERM_HELP_TEXT,
+        max_length=PieceSearchTermConstants.TERM_MAX_LENGTH,
+    )
+    weight = models.PositiveIntegerField(
+        verbose_name=SequenceSearchTermConstants.FIELD_WEIGHT,
+        help_text=SequenceSearchTermConstants.FIELD_WEIGHT_HELP_TEXT,
+        default=1,
+    )
+
+    class Meta:
+        verbose_name = SequenceSearchTermConstants.VERBOSE_NAME
+        verbose_name_plural = SequenceSearchTermConstants.VERBOSE_NAME_PLURAL
+        unique_together = ["term", "sequence"]
+
+    def __str__(self):
+        return f"SequenceSearchTerm <{self.term}, {self.sequence_id}>"
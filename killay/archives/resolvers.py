@@ -0,0 +1,137 @@
+import heapq
+import ipaddress
+import threading
+
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from killay.admin.utils import get_cache_generation
+from killay.archives.lib.constants import PlaceAddressConstants
+from killay.archives.models import Place, PlaceAddress
+
+IPV6_OFFSET = 1 << 128
+
+
+def ip_to_key(ip_address) -> int:
+    # IPv4 and IPv6 share one sorted space, IPv6 addresses go after every IPv4
+    ip = ipaddress.ip_address(ip_address)
+    return int(ip) if ip.version == 4 else IPV6_OFFSET + int(ip)
+
+
+def get_address_interval(address: PlaceAddress) -> Tuple[int, int]:
+    if address.prefix_length is not None:
+        network = ipaddress.ip_network(
+            f"{address.ipv4}/{address.prefix_length}", strict=False
+        )
+        return (
+            ip_to_key(network.network_address),
+            ip_to_key(network.broadcast_address),
+        )
+    start = ip_to_key(address.ipv4)
+    end = ip_to_key(address.ipv4_end) if address.ipv4_end else start
+    return start, max(start, end)
+
+
+class PlaceIndex(NamedTuple):
+    generation: int
+    starts: List[int]
+    ends: List[int]
+    places: List[Place]
+    lookups: Dict[str, Optional[Place]]
+
+
+def build_intervals(
+    intervals: List[Tuple[int, int, Place]]
+) -> Tuple[List[int], List[int], List[Place]]:
+    """
+    Flattens overlapping intervals into sorted disjoint segments, where the
+    most specific (narrowest) interval wins.
+    """
+    bounds = sorted(
+        {start for start, _, _ in intervals} | {end + 1 for _, end, _ in intervals}
+    )
+    by_start = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+    starts, ends, places = [], [], []
+    active = []
+    position = 0
+    for index, bound in enumerate(bounds[:-1]):
+        while position < len(by_start) and intervals[by_start[position]][0] <= bound:
+            start, end, place = intervals[by_start[position]]
+            heapq.heappush(active, (end - start, position, end, place))
+            position += 1
+        while active and active[0][2] < bound:
+            heapq.heappop(active)
+        if not active:
+            continue
+        place = active[0][3]
+        segment_end = bounds[index + 1] - 1
+        if places and places[-1] is place and ends[-1] + 1 == bound:
+            ends[-1] = segment_end
+        else:
+            starts.append(bound)
+            ends.append(segment_end)
+            places.append(place)
+    return starts, ends, places
+
+
+class PlaceResolver:
+    """
+    In-memory resolver from IP addresses to places, rebuilt when the
+    place addresses generation changes in the shared cache.
+    """
+
+    def __init__(self):
+        self._index: Optional[PlaceIndex] = None
+        self._lock = threading.Lock()
+
+    def _build_index(self, generation: int) -> PlaceIndex:
+        places = {}
+        intervals = []
+        for address in PlaceAddress.objects.select_related("place"):
+            place = places.setdefault(address.place_id, address.place)
+            start, end = get_address_interval(address)
+            intervals.append((start, end, place))
+        starts, ends, places = build_intervals(intervals=intervals)
+        return PlaceIndex(
+            generation=generation,
+            starts=starts,
+            ends=ends,
+            places=places,
+            lookups={},
+        )
+
+    def _get_index(self) -> PlaceIndex:
+        generation = get_cache_generation(key=PlaceAddressConstants.GENERATION_KEY)
+        index = self._index
+        if index is None or index.generation != generation:
+            with self._lock:
+                index = self._index
+                if index is None or index.generation != generation:
+                    index = self._build_index(generation=generation)
+                    self._index = index
+        return index
+
+    def _search(self, index: PlaceIndex, ip_address: str) -> Optional[Place]:
+        try:
+            key = ip_to_key(ip_address)
+        except ValueError:
+            return None
+        position = bisect_right(index.starts, key) - 1
+        if position >= 0 and key <= index.ends[position]:
+            return index.places[position]
+        return None
+
+    def resolve(self, ip_address: Optional[str]) -> Optional[Place]:
+        if not ip_address:
+            return None
+        index = self._get_index()
+        if ip_address in index.lookups:
+            return index.lookups[ip_address]
+        place = self._search(index=index, ip_address=ip_address)
+        if len(index.lookups) >= PlaceAddressConstants.MAX_CACHED_LOOKUPS:
+            index.lookups.clear()
+        index.lookups[ip_address] = place
+        return place
+
+
+place_resolver = PlaceResolver()
@@ -0,0 +1,241 @@
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Optional
+
+from django.db.models import Case, F, OuterRef, Q, QuerySet, Subquery, Sum, When
+from django.db.models.functions import Coalesce
+from django.utils.html import strip_tags
+
+from killay.archives.lib.constants import (
+    PieceSearchTermConstants,
+    SequenceSearchTermConstants,
+)
+from killay.archives.lib.text import normalize_text
+from killay.archives.models import (
+    Piece,
+    PieceSearchTerm,
+    Sequence,
+    SequenceSearchTerm,
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [
+        token[: PieceSearchTermConstants.TERM_MAX_LENGTH]
+        for token in normalize_text(text).split()
+        if len(token) >= PieceSearchTermConstants.TERM_MIN_LENGTH
+    ]
+
+
+def get_piece_terms(piece: Piece) -> Dict[str, int]:
+    terms = Counter()
+    texts = [
+        (piece.code, PieceSearchTermConstants.WEIGHT_CODE),
+        (piece.search_text, PieceSearchTermConstants.WEIGHT_TITLE),
+    ]
+    texts += [
+        (person.search_text, PieceSearchTermConstants.WEIGHT_PERSON)
+        for person in piece.people.all()
+    ]
+    texts += [
+        (keyword.search_text, PieceSearchTermConstants.WEIGHT_KEYWORD)
+        for keyword in piece.keywords.all()
+    ]
+    meta = getattr(piece, "meta", None)
+    if meta:
+        texts.append((meta.search_text, PieceSearchTermConstants.WEIGHT_META))
+    for text, weight in texts:
+        for token in tokenize(text):
+            terms[token] += weight
+    return terms
+
+
+def _index_piece_ids(piece_ids: List[int]) -> int:
+    pieces = (
+        Piece.objects.filter(id__in=piece_ids)
+        .select_related("meta")
+        .prefetch_related("people", "keywords")
+    )
+    instances = [
+        PieceSearchTerm(piece_id=piece.id, term=term, weight=weight)
+        for piece in pieces
+        for term, weight in get_piece_terms(piece=piece).items()
+    ]
+    PieceSearchTerm.objects.filter(piece_id__in=piece_ids).delete()
+    PieceSearchTerm.objects.bulk_create(
+        objs=instances, batch_size=PieceSearchTermConstants.BATCH_SIZE
+    )
+    return len(instances)
+
+
+def refresh_search_index_by_pieces(pieces: QuerySet) -> int:
+    piece_ids = list(pieces.values_list("id", flat=True))
+    batch_size = PieceSearchTermConstants.BATCH_SIZE
+    return sum(
+        _index_piece_ids(piece_ids=piece_ids[index : index + batch_size])
+        for index in range(0, len(piece_ids), batch_size)
+    )
+
+
+def get_sequence_terms(sequence: Sequence) -> Dict[str, int]:
+    terms = Counter()
+    texts = [
+        (sequence.title, SequenceSearchTermConstants.WEIGHT_TITLE),
+        (
+            strip_tags(sequence.content or ""),
+            SequenceSearchTermConstants.WEIGHT_CONTENT,
+        ),
+    ]
+    for text, weight in texts:
+        for token in tokenize(text):
+            terms[token] += weight
+    return terms
+
+
+def _index_sequences_by_piece_ids(piece_ids: List[int]) -> int:
+    sequences = Sequence.objects.filter(piece_id__in=piece_ids).order_by(
+        "piece_id", "ini", "id"
+    )
+    instances = []
+    orders = Counter()
+    for sequence in sequences:
+        # same order as the sequences of the piece in the viewer, starting at 1
+        orders[sequence.piece_id] += 1
+        instances.extend(
+            SequenceSearchTerm(
+                sequence_id=sequence.id,
+                piece_id=sequence.piece_id,
+                order=orders[sequence.piece_id],
+                ini_sec=sequence.ini_sec,
+                end_sec=sequence.end_sec,
+                term=term,
+                weight=weight,
+            )
+            for term, weight in get_sequence_terms(sequence=sequence).items()
+        )
+    SequenceSearchTerm.objects.filter(piece_id__in=piece_ids).delete()
+    SequenceSearchTerm.objects.bulk_create(
+        objs=instances, batch_size=PieceSearchTermConstants.BATCH_SIZE
+    )
+    return len(instances)
+
+
+def refresh_sequence_search_index_by_pieces(pieces: QuerySet) -> int:
+    piece_ids = list(pieces.values_list("id", flat=True))
+    batch_size = PieceSearchTermConstants.BATCH_SIZE
+    return sum(
+        _index_sequences_by_piece_ids(piece_ids=piece_ids[index : index + batch_size])
+        for index in range(0, len(piece_ids), batch_size)
+    )
+
+
+def rebuild_search_index() -> int:
+    PieceSearchTerm.objects.all().delete()
+    SequenceSearchTerm.objects.all().delete()
+    pieces = Piece.objects.all()
+    total = refresh_search_index_by_pieces(pieces=pieces)
+    return total + refresh_sequence_search_index_by_pieces(pieces=pieces)
+
+
+def _filter_by_terms(
+    queryset: QuerySet, model, term_filters: List[Q], field: str
+) -> QuerySet:
+    for term_filter in term_filters:
+        matched = model.objects.filter(term_filter).values(field)
+        queryset = queryset.filter(id__in=matched)
+    return queryset
+
+
+def _get_rank(model, tokens: List[str], term_filters: List[Q]) -> Coalesce:
+    rank = (
+        model.objects.filter(reduce(or_, term_filters))
+        .filter(piece_id=OuterRef("id"))
+        .values("piece_id")
+        .annotate(
+            rank=Sum(
+                Case(
+                    When(
+                        term__in=tokens,
+                        then=F("weight") * PieceSearchTermConstants.EXACT_MATCH_FACTOR,
+                    ),
+                    default=F("weight"),
+                )
+            )
+        )
+        .values("rank")
+    )
+    return Coalesce(Subquery(rank), 0)
+
+
+def search_pieces(queryset: QuerySet, query_search: str) -> QuerySet:
+    """
+    Filters the pieces that match every word of the search by prefix, in their
+    own terms or in the terms of one of their sequences, ordered by the sum of
+    the weights of the matched terms.
+    """
+    tokens = tokenize(query_search)
+    if not tokens:
+        return queryset.none()
+    term_filters = [Q(term__startswith=token) for token in tokens]
+    matched_pieces = _filter_by_terms(
+        queryset=Piece.objects.all(),
+        model=PieceSearchTerm,
+        term_filters=term_filters,
+        field="piece_id",
+    )
+    matched_sequences = _filter_by_terms(
+        queryset=Sequence.objects.all(),
+        model=SequenceSearchTerm,
+        term_filters=term_filters,
+        field="sequence_id",
+    )
+    queryset = queryset.filter(
+        Q(id__in=matched_pieces.values("id"))
+        | Q(id__in=matched_sequences.values("piece_id"))
+    )
+    search_rank = _get_rank(
+        model=PieceSearchTerm, tokens=tokens, term_filters=term_filters
+    ) + _get_rank(model=SequenceSearchTerm, tokens=tokens, term_filters=term_filters)
+    return queryset.annotate(search_rank=search_rank).order_by(
+        "-search_rank", *Piece._meta.ordering
+    )
+
+
+def get_sequence_hits(piece_ids: List[int], query_search: str) -> Dict[int, List]:
+    """
+    Returns the sequences of the pieces that match every word of the search,
+    grouped by piece and ordered by rank.
+    """
+    tokens = set(tokenize(query_search))
+    if not tokens or not piece_ids:
+        return {}
+    term_filters = [Q(term__startswith=token) for token in tokens]
+    rows = (
+        SequenceSearchTerm.objects.filter(piece_id__in=piece_ids)
+        .filter(reduce(or_, term_filters))
+        .values(
+            "sequence_id", "piece_id", "order", "ini_sec", "end_sec", "term", "weight"
+        )
+    )
+    hits_by_sequence = {}
+    matched_tokens = defaultdict(set)
+    for row in rows:
+        sequence_id = row.pop("sequence_id")
+        term = row.pop("term")
+        weight = row.pop("weight")
+        hit = hits_by_sequence.setdefault(sequence_id, {**row, "rank": 0})
+        hit["rank"] += weight
+        matched_tokens[sequence_id].update(
+            token for token in tokens if term.startswith(token)
+        )
+    hits = defaultdict(list)
+    for sequence_id, hit in hits_by_sequence.items():
+        if matched_tokens[sequence_id] == tokens:
+            hits[hit["piece_id"]].append(hit)
+    return {
+        piece_id: sorted(piece_hits, key=lambda hit: (-hit["rank"], hit["order"]))[
+            : SequenceSearchTermConstants.MAX_HITS_BY_PIECE
+        ]
+        for piece_id, piece_hits in hits.items()
+    }
@@ -1,12 +1,22 @@
+from collections import defaultdict
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
-from django.db.models import Q, QuerySet
+from django.db.models import Count, IntegerField, Max, Prefetch, Q, QuerySet, Value
 from django.utils.text import slugify
 
+from killay.admin.utils import bump_cache_generation, get_cache_generation
+from killay.archives.access import ANONYMOUS_ACCESS, AccessContext
+from killay.archives.lib.constants import (
+    ContentGenerationConstants,
+    EffectiveAccessConstants,
+    PieceConstants,
+)
 from killay.archives.models import (
     Archive,
     Category,
     Collection,
+    EffectiveAccess,
     Keyword,
     Person,
     Piece,
@@ -14,12 +24,43 @@ from killay.archives.models import (
     Place,
     Provider,
 )
+from killay.archives.resolvers import place_resolver
+from killay.archives.search import search_pieces
 
 
 def bulk_create_pieces(data_list):
     instances = [Piece(**data) for data in data_list]
+    for instance in instances:
+        instance.search_text = instance.get_search_text()
     objs = Piece.objects_in_site.bulk_create(instances)
-    return Piece.objects_in_site.filter(code__in=[obj.code for obj in objs])
+    pieces = Piece.objects_in_site.filter(code__in=[obj.code for obj in objs])
+    refresh_effective_access_by_pieces(pieces=pieces)
+    return pieces
+
+
+def refresh_piece_list_fields(pieces: QuerySet) -> None:
+    """
+    Copies the thumb of the active provider and the duration of the metadata
+    into the pieces, so the lists show them without a query by piece.
+    """
+    active_providers = Prefetch(
+        "providers",
+        queryset=Provider.objects.filter(active=True),
+        to_attr="active_providers",
+    )
+    instances = list(pieces.select_related("meta").prefetch_related(active_providers))
+    for instance in instances:
+        active_provider = next(iter(instance.active_providers), None)
+        instance.resolved_thumb_url = instance.get_thumb_url(
+            active_provider=active_provider
+        )
+        meta = getattr(instance, "meta", None)
+        instance.duration = meta.duration if meta else None
+    Piece.objects.bulk_update(
+        objs=instances,
+        fields=["resolved_thumb_url", "duration"],
+        batch_size=PieceConstants.LIST_FIELDS_BATCH_SIZE,
+    )
 
 
 def bulk_add_piece_categories(
@@ -64,6 +105,8 @@ def _bulk_add_many_to_many_by_list_text(
             and slugify(name) not in current_slug_map
         )
     ]
+    for instance in instances_for_create:
+        instance.search_text = instance.get_search_text()
     related_model.objects_in_site.bulk_create(objs=instances_for_create)
     created_instances = related_model.objects_in_site.filter(
         slug__in=[obj.slug for obj in instances_for_create]
@@ -127,6 +170,8 @@ def bulk_create_meta_pieces(piece_meta_data: List[Tuple[int, Dict]]):
         PieceMeta(id=current_meta_map.get(piece_id), piece_id=piece_id, **meta_data)
         for piece_id, meta_data in piece_meta_data
     ]
+    for instance in instances:
+        instance.search_text = instance.get_search_text()
     instances_for_create = [obj for obj in instances if not obj.id]
     instances_for_update = [obj for obj in instances if obj.id]
     if instances_for_create:
@@ -148,8 +193,12 @@ def bulk_create_meta_pieces(piece_meta_data: List[Tuple[int, Dict]]):
                 "documentary_unit",
                 "lang",
                 "original_format",
+                "search_text",
             ],
         )
+    refresh_piece_list_fields(
+        pieces=Piece.objects.filter(id__in=[obj.piece_id for obj in instances])
+    )
 
 
 def bulk_add_piece_keyword_by_texts(
@@ -175,7 +224,11 @@ def bulk_create_piece_video_provider(piece_video_data: List[Tuple[int, Dict]]):
         )
         for piece_id, video_data in piece_video_data
     ]
-    return Provider.objects.bulk_create(objs=instances)
+    providers = Provider.objects.bulk_create(objs=instances)
+    refresh_piece_list_fields(
+        pieces=Piece.objects.filter(id__in=[obj.piece_id for obj in instances])
+    )
+    return providers
 
 
 def get_pieces_fields_data():
@@ -210,51 +263,162 @@ def get_archive_related_field_data(archive_id: int) -> dict:
     }
 
 
-def _get_allowed_archive_ids_by_place(place: Place) -> list:
-    return list(place.allowed_archives.values_list("id", flat=True)) if place else []
+def _get_allowed_ids_by_place(place: Place, through_field_name: str, field: str):
+    through_class = getattr(Place, through_field_name).through
+    allowed_ids = through_class.objects.filter(place_id=place.id).values_list(
+        field, flat=True
+    )
+    return frozenset(allowed_ids)
+
+
+def get_access_context(
+    place: Optional[Place] = None, is_superuser: bool = False
+) -> AccessContext:
+    if not place:
+        return AccessContext(is_superuser=is_superuser)
+    return AccessContext(
+        place_id=place.id,
+        is_superuser=is_superuser,
+        allowed_archive_ids=_get_allowed_ids_by_place(
+            place=place, through_field_name="allowed_archives", field="archive_id"
+        ),
+        allowed_collection_ids=_get_allowed_ids_by_place(
+            place=place, through_field_name="allowed_collections", field="collection_id"
+        ),
+        allowed_piece_ids=_get_allowed_ids_by_place(
+            place=place, through_field_name="allowed_pieces", field="piece_id"
+        ),
+    )
+
+
+def _get_archive_visibility_q(access: AccessContext, prefix: str = "") -> Q:
+    is_allowed = Q(**{f"{prefix}is_restricted": False})
+    if access.allowed_archive_ids:
+        is_allowed |= Q(**{f"{prefix}id__in": access.allowed_archive_ids})
+    return Q(**{f"{prefix}is_visible": True}) & is_allowed
 
 
-def _can_see_the_archive(archive, allowed_archive_ids) -> bool:
-    return archive.is_visible and (
-        not archive.is_restricted or archive.id in allowed_archive_ids
+def _get_collection_visibility_q(access: AccessContext, prefix: str = "") -> Q:
+    is_allowed = Q(**{f"{prefix}is_restricted": False})
+    if access.allowed_collection_ids:
+        is_allowed |= Q(**{f"{prefix}id__in": access.allowed_collection_ids})
+    archive_q = _get_archive_visibility_q(access=access, prefix=f"{prefix}archive__")
+    return archive_q & is_allowed
+
+
+def _get_piece_visibility_q(access: AccessContext, prefix: str = "") -> Q:
+    is_allowed = Q(**{f"{prefix}is_restricted": False})
+    if access.allowed_piece_ids:
+        is_allowed |= Q(**{f"{prefix}id__in": access.allowed_piece_ids})
+    collection_q = _get_collection_visibility_q(
+        access=access, prefix=f"{prefix}collection__"
     )
+    return collection_q & Q(**{f"{prefix}is_published": True}) & is_allowed
 
 
-def get_public_archives(
-    place: Optional[Place] = None,
-    is_superuser: bool = False,
-) -> List[Archive]:
-    allowed_archive_ids = _get_allowed_archive_ids_by_place(place=place)
-    filters = {}
-    if not is_superuser:
-        filters["is_visible"] = True
+def _get_effective_access_q(access: AccessContext, prefix: str = "") -> Q:
+    piece_ids = EffectiveAccess.objects.filter(place_id=access.place_id).values(
+        "piece_id"
+    )
+    return Q(**{f"{prefix}id__in": piece_ids})
+
+
+def _get_access_contexts(places: List[Optional[Place]]) -> List[AccessContext]:
+    # the allowed ids of all the places with one query by kind of permission
+    place_ids = [place.id for place in places if place]
+    allowed_ids = {}
+    for through_field_name, field in [
+        ("allowed_archives", "archive_id"),
+        ("allowed_collections", "collection_id"),
+        ("allowed_pieces", "piece_id"),
+    ]:
+        through_class = getattr(Place, through_field_name).through
+        rows = through_class.objects.filter(place_id__in=place_ids).values_list(
+            "place_id", field
+        )
+        ids_by_place = defaultdict(set)
+        for place_id, allowed_id in rows:
+            ids_by_place[place_id].add(allowed_id)
+        allowed_ids[field] = ids_by_place
+    return [
+        AccessContext(
+            place_id=place.id,
+            allowed_archive_ids=frozenset(allowed_ids["archive_id"][place.id]),
+            allowed_collection_ids=frozenset(allowed_ids["collection_id"][place.id]),
+            allowed_piece_ids=frozenset(allowed_ids["piece_id"][place.id]),
+        )
+        if place
+        else ANONYMOUS_ACCESS
+        for place in places
+    ]
+
+
+def _create_effective_access(pieces: QuerySet, places: List[Optional[Place]]):
+    batch_size = EffectiveAccessConstants.BATCH_SIZE
+    for access in _get_access_contexts(places=places):
+        piece_ids = pieces.filter(_get_piece_visibility_q(access=access)).values_list(
+            "id", flat=True
+        )
+        instances = [
+            EffectiveAccess(place_id=access.place_id, piece_id=piece_id)
+            for piece_id in piece_ids.iterator(chunk_size=batch_size)
+        ]
+        EffectiveAccess.objects.bulk_create(objs=instances, batch_size=batch_size)
+
+
+def _get_access_places() -> List[Optional[Place]]:
+    return [None, *Place.objects.all()]
+
+
+def get_suggest_generation() -> int:
+    return get_cache_generation(key=ContentGenerationConstants.SUGGEST_GENERATION_KEY)
+
+
+def bump_suggest_generation() -> None:
+    # changes the suggestable labels or the pieces visible to some place
+    bump_cache_generation(key=ContentGenerationConstants.SUGGEST_GENERATION_KEY)
+
+
+def get_access_generation() -> int:
+    return get_cache_generation(key=ContentGenerationConstants.ACCESS_GENERATION_KEY)
 
-    queryset = Archive.objects_in_site.filter(**filters)
-    filtered = []
-    for archive in queryset:
-        if is_superuser or _can_see_the_archive(
-            archive=archive, allowed_archive_ids=allowed_archive_ids
-        ):
-            filtered.append(archive)
-    return filtered
+
+def bump_access_generation() -> None:
+    # changes the visible pieces of a whole place, not of known pieces
+    bump_cache_generation(key=ContentGenerationConstants.ACCESS_GENERATION_KEY)
+
+
+def refresh_effective_access_by_pieces(pieces: QuerySet):
+    EffectiveAccess.objects.filter(piece_id__in=pieces.values("id")).delete()
+    _create_effective_access(pieces=pieces, places=_get_access_places())
+    bump_suggest_generation()
+
+
+def refresh_effective_access_by_place(place: Optional[Place]):
+    EffectiveAccess.objects.filter(place_id=place.id if place else None).delete()
+    _create_effective_access(pieces=Piece.objects.all(), places=[place])
+    bump_suggest_generation()
+    bump_access_generation()
+
+
+def rebuild_effective_access():
+    EffectiveAccess.objects.all().delete()
+    _create_effective_access(pieces=Piece.objects.all(), places=_get_access_places())
+    bump_suggest_generation()
+    bump_access_generation()
+
+
+def get_public_archives(access: AccessContext = ANONYMOUS_ACCESS) -> QuerySet:
+    queryset = Archive.objects_in_site.all()
+    if not access.is_superuser:
+        queryset = queryset.filter(_get_archive_visibility_q(access=access))
+    return queryset
 
 
 def get_public_archive_by_slug(
-    slug: str, place: Optional[Place] = None, is_superuser: bool = False
+    slug: str, access: AccessContext = ANONYMOUS_ACCESS
 ) -> Optional[Archive]:
-    allowed_archive_ids = _get_allowed_archive_ids_by_place(place=place)
-    filters = {"slug": slug}
-    if not is_superuser:
-        filters["is_visible"] = True
-    archive = Archive.objects_in_site.filter(**filters).first()
-    if (
-        is_superuser
-        or not archive
-        or _can_see_the_archive(
-            archive=archive, allowed_archive_ids=allowed_archive_ids
-        )
-    ):
-        return archive
+    return get_public_archives(access=access).filter(slug=slug).first()
 
 
 def get_collection_related_field_data(collection_id: int) -> dict:
@@ -280,70 +444,38 @@ def get_collection_names_and_slugs() -> list:
     return list(Collection.objects_in_site.values("name", "slug"))
 
 
-def _get_allowed_collection_ids_by_place(place: Place) -> list:
-    return list(place.allowed_collections.values_list("id", flat=True)) if place else []
+def get_place_from_ip_address(ip_address: str) -> Optional[Place]:
+    return place_resolver.resolve(ip_address=ip_address)
 
 
-def get_place_from_ip_address(ip_address: str) -> Optional[Place]:
-    return Place.objects.filter(addresses__ipv4=ip_address).first()
+def _get_public_collections(access: AccessContext) -> QuerySet:
+    queryset = Collection.objects_in_site.all()
+    if not access.is_superuser:
+        queryset = queryset.filter(
+            _get_collection_visibility_q(access=access), is_visible=True
+        )
+    return queryset
 
 
-def _can_see_the_collection(
-    collection,
-    allowed_archive_ids,
-    allowed_collection_ids,
-) -> bool:
-    archive = collection.archive
-    can_see_the_archive = _can_see_the_archive(
-        archive=archive, allowed_archive_ids=allowed_archive_ids
-    )
-    return can_see_the_archive and (
-        not collection.is_restricted or collection.id in allowed_collection_ids
-    )
+def get_public_collections(access: AccessContext = ANONYMOUS_ACCESS) -> QuerySet:
+    return _get_public_collections(access=access)
 
 
 def get_public_collections_by_archive_id(
-    archive_id: int, place: Optional[Place] = None, is_superuser: bool = False
-) -> List[Collection]:
-    allowed_archive_ids = _get_allowed_archive_ids_by_place(place=place)
-    allowed_collection_ids = _get_allowed_collection_ids_by_place(place=place)
-    filters = {"archive_id": archive_id}
-    if not is_superuser:
-        filters["is_visible"] = True
-    collections = Collection.objects_in_site.filter(**filters)
-    filtered = []
-    for collection in collections:
-        if is_superuser or _can_see_the_collection(
-            collection=collection,
-            allowed_archive_ids=allowed_archive_ids,
-            allowed_collection_ids=allowed_collection_ids,
-        ):
-            filtered.append(collection)
-    return filtered
+    archive_id: int, access: AccessContext = ANONYMOUS_ACCESS
+) -> QuerySet:
+    return _get_public_collections(access=access).filter(archive_id=archive_id)
 
 
 def get_public_collection_by_slug(
     slug: str,
     archive_id: Optional[int] = None,
-    place: Optional[Place] = None,
-    is_superuser: bool = False,
+    access: AccessContext = ANONYMOUS_ACCESS,
 ) -> Optional[Collection]:
     filters = {"slug": slug}
-    allowed_archive_ids = _get_allowed_archive_ids_by_place(place=place)
-    allowed_collection_ids = _get_allowed_collection_ids_by_place(place=place)
-    if not is_superuser:
-        filters["is_visible"] = True
     if archive_id:
         filters["archive_id"] = archive_id
-    collection = Collection.objects_in_site.filter(**filters).first()
-    if is_superuser or not collection:
-        return collection
-    if _can_see_the_collection(
-        collection=collection,
-        allowed_archive_ids=allowed_archive_ids,
-        allowed_collection_ids=allowed_collection_ids,
-    ):
-        return collection
+    return _get_public_collections(access=access).filter(**filters).first()
 
 
 def get_category_by_slug(slug: str, collection_id: int) -> Optional[Category]:
@@ -360,40 +492,14 @@ def get_keyword_by_slug(slug: str) -> Optional[Keyword]:
     return Keyword.objects_in_site.filter(slug=slug).first()
 
 
-def _get_allowed_piece_ids_by_place(place: Place) -> list:
-    return list(place.allowed_pieces.values_list("id", flat=True)) if place else []
-
-
-def _can_see_the_piece(
-    piece: Piece,
-    allowed_archive_ids: Optional[List[int]],
-    allowed_collection_ids: Optional[List[int]],
-    allowed_piece_ids: Optional[List[int]],
-) -> bool:
-    allowed_collection = _can_see_the_collection(
-        collection=piece.collection,
-        allowed_archive_ids=allowed_archive_ids,
-        allowed_collection_ids=allowed_collection_ids,
-    )
-    return (
-        allowed_collection
-        and piece.is_published
-        and (not piece.is_restricted or piece.id in allowed_piece_ids)
-    )
-
-
 def get_public_pieces(
     archive: Optional[Archive] = None,
     collection: Optional[Collection] = None,
     categorization: Optional[Dict] = None,
-    place: Optional[Place] = None,
-    is_superuser: bool = False,
+    access: AccessContext = ANONYMOUS_ACCESS,
     query_search: Optional[str] = None,
     kind: Optional[str] = None,
-) -> List[Piece]:
-    allowed_archive_ids = _get_allowed_archive_ids_by_place(place=place)
-    allowed_collection_ids = _get_allowed_collection_ids_by_place(place=place)
-    allowed_piece_ids = _get_allowed_piece_ids_by_place(place=place)
+) -> QuerySet:
     filters = {}
     categorization = categorization or {}
     category = categorization.get("category")
@@ -417,153 +523,218 @@ def get_public_pieces(
     )
 
     if query_search:
-        queryset = queryset.filter(
-            Q(code__icontains=query_search)
-            | Q(title__icontains=query_search)
-            | Q(meta__description__icontains=query_search)
-        )
+        queryset = search_pieces(queryset=queryset, query_search=query_search)
 
-    allowed_pieces = []
-    for piece in queryset:
-        if is_superuser or _can_see_the_piece(
-            piece=piece,
-            allowed_archive_ids=allowed_archive_ids,
-            allowed_collection_ids=allowed_collection_ids,
-            allowed_piece_ids=allowed_piece_ids,
-        ):
-            allowed_pieces.append(piece)
-    return allowed_pieces
+    if not access.is_superuser:
+        queryset = queryset.filter(_get_effective_access_q(access=access))
+    return queryset
 
 
 def get_public_piece(
-    piece_code: str, place: Optional[Place] = None, is_superuser: bool = False
+    piece_code: str, access: AccessContext = ANONYMOUS_ACCESS
 ) -> Optional[Piece]:
-    allowed_archive_ids = _get_allowed_archive_ids_by_place(place=place)
-    allowed_collection_ids = _get_allowed_collection_ids_by_place(place=place)
-    allowed_piece_ids = _get_allowed_piece_ids_by_place(place=place)
-    piece = Piece.objects_in_site.filter(code=piece_code).first()
-    if is_superuser or not piece:
-        return piece
-    if _can_see_the_piece(
-        piece=piece,
-        allowed_archive_ids=allowed_archive_ids,
-        allowed_collection_ids=allowed_collection_ids,
-        allowed_piece_ids=allowed_piece_ids,
-    ):
-        return piece
+    queryset = Piece.objects_in_site.filter(code=piece_code)
+    if not access.is_superuser:
+        queryset = queryset.filter(_get_effective_access_q(access=access))
+    return queryset.first()
+
+
+def get_last_modified(queryset: QuerySet, fields: List[str]) -> Optional[datetime]:
+    """
+    Returns the latest of the date fields of the rows with one aggregate query,
+    the fields can follow relations like ``collection__updated_at``.
+    """
+    values = queryset.order_by().aggregate(
+        **{f"last_{index}": Max(field) for index, field in enumerate(fields)}
+    )
+    return max(filter(None, values.values()), default=None)
+
+
+def get_public_piece_last_modified(
+    piece_code: str, access: AccessContext = ANONYMOUS_ACCESS
+) -> Optional[Dict]:
+    fields = [
+        "updated_at",
+        "meta__updated_at",
+        "collection__updated_at",
+        "collection__archive__updated_at",
+    ]
+    queryset = Piece.objects_in_site.filter(code=piece_code)
+    if not access.is_superuser:
+        queryset = queryset.filter(_get_effective_access_q(access=access))
+    values = queryset.values("id", *fields).first()
+    if not values:
+        return
+    return {
+        "id": values["id"],
+        "last_modified": max(filter(None, (values[field] for field in fields))),
+    }
+
+
+def _get_facet_values(
+    queryset: QuerySet,
+    pieces: QuerySet,
+    relation: str,
+    fields: List[str],
+    active_id: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Counts the pieces of the result set by option with a single GROUP BY query,
+    leaving out the options without pieces except the active one.
+    """
+    piece_ids = pieces.order_by().values("id")
+    values = list(
+        queryset.filter(**{f"{relation}__in": piece_ids})
+        .values("id", *fields)
+        .annotate(total=Count(relation, distinct=True))
+        .order_by(*queryset.model._meta.ordering)
+    )
+    if active_id and active_id not in {value["id"] for value in values}:
+        values += list(
+            queryset.filter(id=active_id)
+            .values("id", *fields)
+            .annotate(total=Value(0, output_field=IntegerField()))
+        )
+    return values
 
 
 def get_archive_filter_options(
-    place: Optional[Place] = None,
-    is_superuser: bool = False,
+    pieces: QuerySet,
+    access: AccessContext = ANONYMOUS_ACCESS,
     active_archive_id: Optional[int] = None,
 ) -> List[Dict]:
-    archives = get_public_archives(place=place, is_superuser=is_superuser)
+    values = _get_facet_values(
+        queryset=get_public_archives(access=access),
+        pieces=pieces,
+        relation="collections__pieces",
+        fields=["name", "slug"],
+        active_id=active_archive_id,
+    )
     return [
         {
-            "label": archive.name,
-            "slug": archive.slug,
-            "active": archive.id == active_archive_id,
+            "label": archive["name"],
+            "slug": archive["slug"],
+            "total": archive["total"],
+            "active": archive["id"] == active_archive_id,
         }
-        for archive in archives
+        for archive in values
     ]
 
 
 def get_collection_filter_options(
-    place: Optional[Place] = None,
-    is_superuser: bool = False,
+    pieces: QuerySet,
+    access: AccessContext = ANONYMOUS_ACCESS,
     active_collection_id: Optional[int] = None,
     archive_id: Optional[int] = None,
 ) -> List[Dict]:
-    allowed_archive_ids = _get_allowed_archive_ids_by_place(place=place)
-    allowed_collection_ids = _get_allowed_collection_ids_by_place(place=place)
-    filters = {}
-    if not is_superuser:
-        filters["is_visible"] = True
+    queryset = _get_public_collections(access=access)
     if archive_id:
-        filters["archive_id"] = archive_id
-    queryset = Collection.objects_in_site.select_related("archive").filter(**filters)
+        queryset = queryset.filter(archive_id=archive_id)
+    values = _get_facet_values(
+        queryset=queryset,
+        pieces=pieces,
+        relation="pieces",
+        fields=["name", "slug", "archive__slug"],
+        active_id=active_collection_id,
+    )
     return [
         {
-            "label": collection.name,
-            "slug": collection.slug,
-            "archive_slug": collection.archive.slug,
-            "active": collection.id == active_collection_id,
+            "label": collection["name"],
+            "slug": collection["slug"],
+            "archive_slug": collection["archive__slug"],
+            "total": collection["total"],
+            "active": collection["id"] == active_collection_id,
         }
-        for collection in queryset
-        if is_superuser
-        or _can_see_the_collection(
-            collection=collection,
-            allowed_archive_ids=allowed_archive_ids,
-            allowed_collection_ids=allowed_collection_ids,
-        )
+        for collection in values
     ]
 
 
 def get_category_filter_options(
-    place: Optional[Place] = None,
-    is_superuser: bool = False,
+    pieces: QuerySet,
+    access: AccessContext = ANONYMOUS_ACCESS,
     active_category_id: Optional[int] = None,
     archive_id: Optional[int] = None,
     collection_id: Optional[int] = None,
 ):
-    allowed_archive_ids = _get_allowed_archive_ids_by_place(place=place)
-    allowed_collection_ids = _get_allowed_collection_ids_by_place(place=place)
-
-    queryset = Category.objects_in_site.select_related("collection__archive")
+    queryset = Category.objects_in_site.all()
     if collection_id:
-        queryset.filter(collection_id=collection_id)
+        queryset = queryset.filter(collection_id=collection_id)
     elif archive_id:
-        queryset.filter(collection__archive_id=collection_id)
+        queryset = queryset.filter(collection__archive_id=archive_id)
+    if not access.is_superuser:
+        queryset = queryset.filter(
+            Q(collection__isnull=True)
+            | _get_collection_visibility_q(access=access, prefix="collection__")
+        )
     category_filter_options = []
-    for category in queryset:
-        if is_superuser or (
-            not category.collection
-            or _can_see_the_collection(
-                collection=category.collection,
-                allowed_archive_ids=allowed_archive_ids,
-                allowed_collection_ids=allowed_collection_ids,
-            )
-        ):
-            category_option = {
-                "label": category.name,
-                "slug": category.slug,
-                "active": category.id == active_category_id,
-            }
-            if category.collection:
-                category_option["collection_slug"] = category.collection_slug
-                category_option["archive_slug"] = category.collection.archive.slug
-            category_filter_options.append(category_option)
+    values = _get_facet_values(
+        queryset=queryset,
+        pieces=pieces,
+        relation="pieces",
+        fields=[
+            "name",
+            "slug",
+            "collection_id",
+            "collection__slug",
+            "collection__archive__slug",
+        ],
+        active_id=active_category_id,
+    )
+    for category in values:
+        category_option = {
+            "label": category["name"],
+            "slug": category["slug"],
+            "total": category["total"],
+            "active": category["id"] == active_category_id,
+        }
+        if category["collection_id"]:
+            category_option["collection_slug"] = category["collection__slug"]
+            category_option["archive_slug"] = category["collection__archive__slug"]
+        category_filter_options.append(category_option)
     return category_filter_options
 
 
 def get_person_filter_options(
-    place: Optional[Place] = None,
-    is_superuser: bool = False,
+    pieces: QuerySet,
+    access: AccessContext = ANONYMOUS_ACCESS,
     active_person_id: Optional[int] = None,
 ):
-    queryset = Person.objects_in_site.all()
+    values = _get_facet_values(
+        queryset=Person.objects_in_site.all(),
+        pieces=pieces,
+        relation="pieces",
+        fields=["name", "slug"],
+        active_id=active_person_id,
+    )
     return [
         {
-            "label": person.name,
-            "slug": person.slug,
-            "active": person.id == active_person_id,
+            "label": person["name"],
+            "slug": person["slug"],
+            "total": person["total"],
+            "active": person["id"] == active_person_id,
         }
-        for person in queryset
+        for person in values
     ]
 
 
 def get_keyword_filter_options(
-    place: Optional[Place] = None,
-    is_superuser: bool = False,
+    pieces: QuerySet,
+    access: AccessContext = ANONYMOUS_ACCESS,
     active_keyword_id: Optional[int] = None,
 ):
-    queryset = Keyword.objects_in_site.all()
+    values = _get_facet_values(
+        queryset=Keyword.objects_in_site.all(),
+        pieces=pieces,
+        relation="pieces",
+        fields=["name", "slug"],
+        active_id=active_keyword_id,
+    )
     return [
         {
-            "label": keyword.name,
-            "slug": keyword.slug,
-            "active": keyword.id == active_keyword_id,
+            "label": keyword["name"],
+            "slug": keyword["slug"],
+            "total": keyword["total"],
+            "active": keyword["id"] == active_keyword_id,
         }
-        for keyword in queryset
+        for keyword in values
     ]
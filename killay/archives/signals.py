@@ -0,0 +1,254 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from killay.admin.utils import bump_cache_generation
+from killay.archives.lib.constants import PlaceAddressConstants, ThumbnailConstants
+from killay.archives.models import (
+    Archive,
+    Category,
+    Collection,
+    Keyword,
+    Person,
+    Piece,
+    PieceMeta,
+    Place,
+    PlaceAddress,
+    Provider,
+    Sequence,
+)
+from killay.archives.search import (
+    refresh_search_index_by_pieces,
+    refresh_sequence_search_index_by_pieces,
+)
+from killay.archives.services import (
+    bump_suggest_generation,
+    refresh_piece_list_fields,
+    refresh_effective_access_by_pieces,
+    refresh_effective_access_by_place,
+)
+from killay.archives.thumbnails import generate_thumbnails, has_thumbnails
+
+
+# fields that change which places see a piece
+ACCESS_FIELDS = {
+    Archive: ["is_visible", "is_restricted"],
+    Collection: ["is_visible", "is_restricted", "archive_id"],
+    Piece: ["is_published", "is_restricted", "collection_id"],
+}
+SEARCH_FIELDS = {"code", "title"}
+# fields shown or matched by the suggestions, the visibility changes through
+# the effective access refreshes
+SUGGEST_FIELDS = {
+    Collection: ["slug"],
+    Category: ["name", "slug", "collection_id"],
+    Person: ["name", "slug"],
+    Keyword: ["name", "slug"],
+    Piece: ["code", "title"],
+}
+M2M_ACTIONS = ["post_add", "post_remove", "post_clear"]
+
+
+def _has_changes(sender, instance, fields, update_fields) -> bool:
+    # compares with the saved row, a new instance always changes
+    names = {sender._meta.get_field(field).name for field in fields}
+    if update_fields and not names & set(update_fields):
+        return False
+    previous = (
+        sender.objects.filter(id=instance.id).values(*fields).first()
+        if instance.id
+        else None
+    )
+    return previous is None or any(
+        previous[field] != getattr(instance, field) for field in fields
+    )
+
+
+def _changes_search(update_fields) -> bool:
+    return not update_fields or bool(SEARCH_FIELDS & set(update_fields))
+
+
+@receiver(pre_save, sender=Archive)
+@receiver(pre_save, sender=Collection)
+@receiver(pre_save, sender=Piece)
+def keep_access_changes(sender, instance, update_fields=None, **kwargs):
+    instance._changes_access = _has_changes(
+        sender=sender,
+        instance=instance,
+        fields=ACCESS_FIELDS[sender],
+        update_fields=update_fields,
+    )
+
+
+@receiver(post_save, sender=Piece)
+def refresh_piece_access(sender, instance, **kwargs):
+    if getattr(instance, "_changes_access", True):
+        pieces = Piece.objects.filter(id=instance.id)
+        refresh_effective_access_by_pieces(pieces=pieces)
+
+
+@receiver(post_save, sender=Collection)
+def refresh_collection_access(sender, instance, created, **kwargs):
+    if not created and getattr(instance, "_changes_access", True):
+        pieces = Piece.objects.filter(collection_id=instance.id)
+        refresh_effective_access_by_pieces(pieces=pieces)
+
+
+@receiver(post_save, sender=Archive)
+def refresh_archive_access(sender, instance, created, **kwargs):
+    if not created and getattr(instance, "_changes_access", True):
+        pieces = Piece.objects.filter(collection__archive_id=instance.id)
+        refresh_effective_access_by_pieces(pieces=pieces)
+
+
+@receiver(post_save, sender=Place)
+def refresh_place_access(sender, instance, created, **kwargs):
+    if created:
+        refresh_effective_access_by_place(place=instance)
+
+
+@receiver(m2m_changed, sender=Place.allowed_archives.through)
+@receiver(m2m_changed, sender=Place.allowed_collections.through)
+@receiver(m2m_changed, sender=Place.allowed_pieces.through)
+def refresh_allowed_access(sender, instance, action, reverse, **kwargs):
+    if action not in M2M_ACTIONS:
+        return
+    if not reverse:
+        refresh_effective_access_by_place(place=instance)
+    elif isinstance(instance, Archive):
+        pieces = Piece.objects.filter(collection__archive_id=instance.id)
+        refresh_effective_access_by_pieces(pieces=pieces)
+    elif isinstance(instance, Collection):
+        pieces = Piece.objects.filter(collection_id=instance.id)
+        refresh_effective_access_by_pieces(pieces=pieces)
+    elif isinstance(instance, Piece):
+        pieces = Piece.objects.filter(id=instance.id)
+        refresh_effective_access_by_pieces(pieces=pieces)
+
+
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+@receiver(post_save, sender=PlaceAddress)
+@receiver(post_delete, sender=PlaceAddress)
+def invalidate_place_resolver(sender, **kwargs):
+    bump_cache_generation(key=PlaceAddressConstants.GENERATION_KEY)
+
+
+@receiver(post_save, sender=Piece)
+def refresh_piece_search_index(sender, instance, update_fields=None, **kwargs):
+    if _changes_search(update_fields=update_fields):
+        pieces = Piece.objects.filter(id=instance.id)
+        refresh_search_index_by_pieces(pieces=pieces)
+
+
+@receiver(post_save, sender=PieceMeta)
+@receiver(post_delete, sender=PieceMeta)
+def refresh_meta_search_index(sender, instance, **kwargs):
+    pieces = Piece.objects.filter(id=instance.piece_id)
+    refresh_search_index_by_pieces(pieces=pieces)
+
+
+@receiver(m2m_changed, sender=Piece.people.through)
+@receiver(m2m_changed, sender=Piece.keywords.through)
+def refresh_related_search_index(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in M2M_ACTIONS:
+        return
+    if not reverse:
+        pieces = Piece.objects.filter(id=instance.id)
+    elif pk_set:
+        pieces = Piece.objects.filter(id__in=pk_set)
+    else:
+        pieces = instance.pieces.all()
+    refresh_search_index_by_pieces(pieces=pieces)
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_save, sender=Keyword)
+def refresh_categorization_search_index(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_index_by_pieces(pieces=instance.pieces.all())
+
+
+@receiver(pre_delete, sender=Person)
+@receiver(pre_delete, sender=Keyword)
+def keep_categorization_piece_ids(sender, instance, **kwargs):
+    instance._search_piece_ids = list(instance.pieces.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Person)
+@receiver(post_delete, sender=Keyword)
+def refresh_deleted_categorization_search_index(sender, instance, **kwargs):
+    pieces = Piece.objects.filter(id__in=getattr(instance, "_search_piece_ids", []))
+    refresh_search_index_by_pieces(pieces=pieces)
+
+
+@receiver(post_save, sender=Sequence)
+@receiver(post_delete, sender=Sequence)
+def refresh_sequence_search_index(sender, instance, **kwargs):
+    pieces = Piece.objects.filter(id=instance.piece_id)
+    refresh_sequence_search_index_by_pieces(pieces=pieces)
+
+
+@receiver(pre_save, sender=Collection)
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Person)
+@receiver(pre_save, sender=Keyword)
+@receiver(pre_save, sender=Piece)
+def keep_suggest_changes(sender, instance, update_fields=None, **kwargs):
+    instance._changes_suggest = _has_changes(
+        sender=sender,
+        instance=instance,
+        fields=SUGGEST_FIELDS[sender],
+        update_fields=update_fields,
+    )
+
+
+@receiver(post_save, sender=Collection)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Person)
+@receiver(post_save, sender=Keyword)
+@receiver(post_save, sender=Piece)
+def invalidate_suggest(sender, instance, **kwargs):
+    if getattr(instance, "_changes_suggest", True):
+        bump_suggest_generation()
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Person)
+@receiver(post_delete, sender=Keyword)
+@receiver(post_delete, sender=Piece)
+def invalidate_deleted_suggest(sender, **kwargs):
+    bump_suggest_generation()
+
+
+@receiver(m2m_changed, sender=Piece.categories.through)
+@receiver(m2m_changed, sender=Piece.people.through)
+@receiver(m2m_changed, sender=Piece.keywords.through)
+def invalidate_suggest_relations(sender, action, **kwargs):
+    if action in M2M_ACTIONS:
+        bump_suggest_generation()
+
+
+@receiver(post_save, sender=Archive)
+@receiver(post_save, sender=Collection)
+@receiver(post_save, sender=Piece)
+@receiver(post_save, sender=Provider)
+def generate_image_thumbnails(sender, instance, update_fields=None, **kwargs):
+    field_name = dict(ThumbnailConstants.IMAGE_FIELDS)[sender._meta.label]
+    if update_fields and field_name not in update_fields:
+        return
+    image = getattr(instance, field_name)
+    if image and not has_thumbnails(name=image.name, storage=image.storage):
+        generate_thumbnails(name=image.name, storage=image.storage)
+
+
+@receiver(post_save, sender=PieceMeta)
+@receiver(post_save, sender=Provider)
+@receiver(post_delete, sender=Provider)
+def refresh_piece_list_copies(sender, instance, **kwargs):
+    refresh_piece_list_fields(pieces=Piece.objects.filter(id=instance.piece_id))
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+
+@deconstructible
+class ProtectedStorage(FileSystemStorage):
+    """
+    Keeps the files of the pieces in PROTECTED_MEDIA_ROOT, apart from the
+    public media, so they are only reached through the views that check the
+    access to their piece.
+    """
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == "PROTECTED_MEDIA_ROOT":
+            self.__dict__.pop("base_location", None)
+            self.__dict__.pop("location", None)
+        elif setting == "PROTECTED_MEDIA_URL":
+            self.__dict__.pop("base_url", None)
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.PROTECTED_MEDIA_ROOT)
+
+    @cached_property
+    def base_url(self):
+        return self._value_or_setting(self._base_url, settings.PROTECTED_MEDIA_URL)
+
+
+protected_storage = ProtectedStorage()
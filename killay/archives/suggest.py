@@ -0,0 +1,170 @@
+import threading
+
+from bisect import bisect_left
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from killay.archives.access import ANONYMOUS_ACCESS, AccessContext
+from killay.archives.lib.constants import SuggestConstants
+from killay.archives.lib.text import normalize_text
+from killay.archives.models import (
+    Category,
+    EffectiveAccess,
+    Keyword,
+    Person,
+    Piece,
+)
+from killay.archives.services import get_suggest_generation
+
+VisibleEntries = FrozenSet[Tuple[str, int]]
+
+
+class SuggestEntry(NamedTuple):
+    kind: str
+    id: int
+    label: str
+    slug: str
+    parent_slug: Optional[str] = None
+
+
+class SuggestIndex(NamedTuple):
+    generation: int
+    keys: List[str]
+    entries: List[SuggestEntry]
+    visible_by_place: Dict[Optional[int], VisibleEntries]
+
+
+def get_entry_keys(text: Optional[str]) -> List[str]:
+    # every word starts a key, so "violeta parra" is found by "parra" too
+    words = normalize_text(text).split()
+    return [
+        " ".join(words[index:])[: SuggestConstants.KEY_MAX_LENGTH]
+        for index in range(len(words))
+    ]
+
+
+def _get_entries() -> List[Tuple[str, SuggestEntry]]:
+    entries = []
+    for piece in Piece.objects_in_site.values("id", "title", "code", "search_text"):
+        entry = SuggestEntry(
+            kind=SuggestConstants.KIND_PIECE,
+            id=piece["id"],
+            label=piece["title"],
+            slug=piece["code"],
+        )
+        entries.extend((key, entry) for key in get_entry_keys(piece["search_text"]))
+    for kind, model in [
+        (SuggestConstants.KIND_PERSON, Person),
+        (SuggestConstants.KIND_KEYWORD, Keyword),
+    ]:
+        for item in model.objects_in_site.values("id", "name", "slug", "search_text"):
+            entry = SuggestEntry(
+                kind=kind, id=item["id"], label=item["name"], slug=item["slug"]
+            )
+            entries.extend((key, entry) for key in get_entry_keys(item["search_text"]))
+    categories = Category.objects_in_site.values(
+        "id", "name", "slug", "collection__slug"
+    )
+    for category in categories:
+        entry = SuggestEntry(
+            kind=SuggestConstants.KIND_CATEGORY,
+            id=category["id"],
+            label=category["name"],
+            slug=category["slug"],
+            parent_slug=category["collection__slug"],
+        )
+        entries.extend((key, entry) for key in get_entry_keys(category["name"]))
+    return entries
+
+
+def get_visible_entries(place_id: Optional[int]) -> VisibleEntries:
+    """
+    Returns the entries with at least one piece visible from the place, so the
+    suggestions never point to an empty list.
+    """
+    piece_ids = EffectiveAccess.objects.filter(place_id=place_id).values("piece_id")
+    visible = {
+        (SuggestConstants.KIND_PIECE, piece_id)
+        for piece_id in piece_ids.values_list("piece_id", flat=True)
+    }
+    for kind, through, field in [
+        (SuggestConstants.KIND_PERSON, Piece.people.through, "person_id"),
+        (SuggestConstants.KIND_KEYWORD, Piece.keywords.through, "keyword_id"),
+        (SuggestConstants.KIND_CATEGORY, Piece.categories.through, "category_id"),
+    ]:
+        related_ids = (
+            through.objects.filter(piece_id__in=piece_ids)
+            .values_list(field, flat=True)
+            .distinct()
+        )
+        visible.update((kind, related_id) for related_id in related_ids)
+    return frozenset(visible)
+
+
+class Suggester:
+    """
+    In-memory sorted prefix index of the normalized names of the content,
+    rebuilt when the suggest generation changes in the shared cache.
+    """
+
+    def __init__(self):
+        self._index: Optional[SuggestIndex] = None
+        self._lock = threading.Lock()
+
+    def _build_index(self, generation: int) -> SuggestIndex:
+        entries = sorted(_get_entries(), key=lambda entry: entry[0])
+        return SuggestIndex(
+            generation=generation,
+            keys=[key for key, _ in entries],
+            entries=[entry for _, entry in entries],
+            visible_by_place={},
+        )
+
+    def _get_index(self) -> SuggestIndex:
+        generation = get_suggest_generation()
+        index = self._index
+        if index is None or index.generation != generation:
+            with self._lock:
+                index = self._index
+                if index is None or index.generation != generation:
+                    index = self._build_index(generation=generation)
+                    self._index = index
+        return index
+
+    def _get_visible(
+        self, index: SuggestIndex, access: AccessContext
+    ) -> Optional[VisibleEntries]:
+        if access.is_superuser:
+            return None
+        if access.place_id not in index.visible_by_place:
+            index.visible_by_place[access.place_id] = get_visible_entries(
+                place_id=access.place_id
+            )
+        return index.visible_by_place[access.place_id]
+
+    def suggest(
+        self, query: Optional[str], access: AccessContext = ANONYMOUS_ACCESS
+    ) -> Dict[str, List[SuggestEntry]]:
+        results = {kind: [] for kind in SuggestConstants.KINDS}
+        prefix = normalize_text(query)[: SuggestConstants.KEY_MAX_LENGTH]
+        if len(prefix) < SuggestConstants.QUERY_MIN_LENGTH:
+            return results
+        index = self._get_index()
+        visible = self._get_visible(index=index, access=access)
+        max_results = SuggestConstants.MAX_RESULTS_BY_KIND
+        missing = len(SuggestConstants.KINDS) * max_results
+        position = bisect_left(index.keys, prefix)
+        end = min(len(index.keys), position + SuggestConstants.MAX_SCANNED_KEYS)
+        for key, entry in zip(index.keys[position:end], index.entries[position:end]):
+            if not key.startswith(prefix) or not missing:
+                break
+            kind_results = results[entry.kind]
+            if len(kind_results) >= max_results or entry in kind_results:
+                continue
+            if visible is not None and (entry.kind, entry.id) not in visible:
+                continue
+            kind_results.append(entry)
+            missing -= 1
+        return results
+
+
+suggester = Suggester()
@@ -0,0 +1,37 @@
+import pytest
+
+from django.core.management import call_command
+
+from killay.archives.lib.constants import PieceConstants
+from killay.archives.models import EffectiveAccess, PieceSearchTerm
+from killay.archives.tests import recipes as archives_recipes
+
+
+@pytest.mark.django_db
+def test_rebuild_effective_access():
+    piece = archives_recipes.piece_recipe.make()
+    place = archives_recipes.place_recipe.make()
+    EffectiveAccess.objects.all().delete()
+    call_command("rebuild_effective_access")
+    place_ids = EffectiveAccess.objects.filter(piece_id=piece.id).values_list(
+        "place_id", flat=True
+    )
+    assert set(place_ids) == {None, place.id}
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index():
+    piece = archives_recipes.piece_recipe.make(title="Memorias")
+    PieceSearchTerm.objects.all().delete()
+    call_command("rebuild_search_index")
+    assert PieceSearchTerm.objects.filter(piece_id=piece.id, term="memorias").exists()
+
+
+@pytest.mark.django_db
+def test_check_providers(capsys):
+    piece = archives_recipes.piece_recipe.make(kind=PieceConstants.KIND_DOCUMENT)
+    provider = archives_recipes.provider_recipe.make(piece=piece, active=True)
+    call_command("check_providers")
+    provider.refresh_from_db()
+    assert provider.checked_at and not provider.online
+    assert "0 providers online, 1 offline" in capsys.readouterr().out
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+
+from collections import Counter
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from killay.archives.lib.constants import (
+    LinkCheckConstants,
+    PieceConstants,
+    ProviderConstants,
+)
+from killay.archives.links import (
+    HostRateLimiter,
+    check_providers,
+    check_url,
+    check_urls,
+)
+from killay.archives.models import Provider
+from killay.archives.tests import recipes as archives_recipes
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # answers by the first part of the path, "flaky" fails the first time
+    requests = Counter()
+    hosts = []
+
+    def do_GET(self):
+        name = self.path.strip("/").split("/")[0]
+        self.requests[name] += 1
+        self.hosts.append(self.headers["Host"])
+        if name == "ok":
+            self.send_response(200)
+        elif name == "moved":
+            self.send_response(302)
+            self.send_header("Location", "/ok/")
+        elif name == "flaky":
+            self.send_response(200 if self.requests[name] > 1 else 503)
+        elif name == "down":
+            self.send_response(500)
+        else:
+            self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        return
+
+
+@pytest.fixture
+def server_url():
+    StandInHandler.requests.clear()
+    StandInHandler.hosts.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _check(urls, **kwargs):
+    return asyncio.run(check_urls(urls=urls, retry_delay=0, rate=0, **kwargs))
+
+
+def test_check_urls(server_url):
+    urls = [f"{server_url}/{name}/" for name in ["ok", "moved", "missing", "flaky"]]
+    assert _check(urls) == [True, True, False, True]
+    assert StandInHandler.requests["flaky"] == 2
+
+
+def test_check_urls_unknown(server_url):
+    assert _check([f"{server_url}/down/"], retries=1) == [None]
+    assert StandInHandler.requests["down"] == 2
+    assert _check(["http://127.0.0.1:1/"], retries=0) == [None]
+    assert _check([None]) == [False]
+
+
+def test_host_header_without_credentials(server_url):
+    url = server_url.replace("http://", "http://user:secret@")
+    assert _check([f"{url}/ok/"]) == [True]
+    assert StandInHandler.hosts == [server_url.replace("http://", "")]
+
+
+def test_rate_limit_keeps_slots_free(server_url):
+    async def get_end_times():
+        semaphore = asyncio.Semaphore(1)
+        limiter = HostRateLimiter(rate=2)
+        loop = asyncio.get_running_loop()
+        end_times = {}
+
+        async def check(key, url):
+            await check_url(url=url, semaphore=semaphore, limiter=limiter)
+            end_times[key] = loop.time()
+
+        other_url = server_url.replace("127.0.0.1", "localhost")
+        await asyncio.gather(
+            check("first", f"{server_url}/ok/"),
+            check("second", f"{server_url}/ok/"),
+            check("other_host", f"{other_url}/ok/"),
+        )
+        return end_times
+
+    end_times = asyncio.run(get_end_times())
+    # the second url of the host waits its turn without holding the only slot
+    assert end_times["other_host"] < end_times["second"]
+
+
+def test_host_rate_limiter():
+    async def get_start_times():
+        limiter = HostRateLimiter(rate=20)
+        loop = asyncio.get_running_loop()
+        times = []
+
+        async def start(host):
+            await limiter.wait(host=host)
+            times.append((host, loop.time()))
+
+        await asyncio.gather(*(start(host) for host in ["a", "a", "a", "b"]))
+        return times
+
+    times = asyncio.run(get_start_times())
+    a_times = [time for host, time in times if host == "a"]
+    assert a_times[2] - a_times[0] >= 0.09
+    assert times[-1][0] == "a"
+
+
+@pytest.mark.django_db
+class TestCheckProviders:
+    @pytest.fixture(autouse=True)
+    def url_template(self, server_url):
+        template = {ProviderConstants.YOUTUBE: f"{server_url}/{{ply_embed_id}}/"}
+        with mock.patch.dict(LinkCheckConstants.URL_TEMPLATE, template):
+            yield
+
+    def _make_video(self, embed_id, **kwargs):
+        return archives_recipes.provider_recipe.make(
+            active=True,
+            plyr_provider=ProviderConstants.YOUTUBE,
+            ply_embed_id=embed_id,
+            **kwargs,
+        )
+
+    def test_videos_and_files(self):
+        online = self._make_video(embed_id="ok")
+        offline = self._make_video(embed_id="missing")
+        sound_piece = archives_recipes.piece_recipe.make(kind=PieceConstants.KIND_SOUND)
+        sound = archives_recipes.provider_recipe.make(
+            piece=sound_piece,
+            active=True,
+            file=SimpleUploadedFile("sound.mp3", b"sound", content_type="audio/mpeg"),
+        )
+        report = check_providers(rate=0, retry_delay=0)
+        assert report == {"online": 2, "offline": 1, "unknown": 0}
+        checked = Provider.objects.in_bulk([online.id, offline.id, sound.id])
+        assert checked[online.id].online and checked[sound.id].online
+        assert not checked[offline.id].online
+        assert all(provider.checked_at for provider in checked.values())
+        sound.file.storage.delete(sound.file.name)
+        report = check_providers(stale_after=timedelta(0), rate=0, retry_delay=0)
+        assert report == {"online": 1, "offline": 2, "unknown": 0}
+
+    def test_only_stale(self):
+        checked_at = timezone.now() - timedelta(hours=1)
+        self._make_video(embed_id="ok", checked_at=checked_at, online=True)
+        stale = self._make_video(
+            embed_id="missing", checked_at=checked_at - timedelta(days=30)
+        )
+        self._make_video(embed_id="inactive")
+        Provider.objects.filter(ply_embed_id="inactive").update(active=False)
+        report = check_providers(rate=0, retry_delay=0)
+        assert report == {"online": 0, "offline": 1, "unknown": 0}
+        assert set(StandInHandler.requests) == {"missing"}
+        stale.refresh_from_db()
+        assert stale.checked_at > checked_at
+
+    def test_unknown_keeps_state(self):
+        checked_at = timezone.now() - timedelta(days=30)
+        provider = self._make_video(embed_id="down", checked_at=checked_at, online=True)
+        report = check_providers(rate=0, retries=0)
+        assert report == {"online": 0, "offline": 0, "unknown": 1}
+        provider.refresh_from_db()
+        assert provider.online and provider.checked_at == checked_at
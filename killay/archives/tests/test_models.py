@@ -1,8 +1,15 @@
 from datetime import time
+from importlib import import_module
 
 import pytest
 
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from killay.archives.storages import protected_storage
 from killay.archives.tests import recipes as archives_recipes
+from killay.archives.thumbnails import get_thumbnail_names
 
 
 @pytest.mark.django_db
@@ -97,3 +104,34 @@ class TestPieceMeta:
         piece = archives_recipes.piece_recipe.make()
         piece.save()
         assert str(piece.meta) == f"PieceMeta <of {piece.id}>"
+
+
+@pytest.mark.django_db
+class TestSearchText:
+    def test_saved_normalized(self):
+        piece = archives_recipes.piece_recipe.make(title="Canción del Niño")
+        assert piece.search_text == "cancion del nino"
+
+    def test_saved_with_update_fields(self):
+        person = archives_recipes.person_recipe.make(name="Violeta")
+        person.name = "Víctor Jara"
+        person.save(update_fields=["name"])
+        person.refresh_from_db()
+        assert person.search_text == "victor jara"
+
+
+@pytest.mark.django_db
+def test_protect_provider_files(image):
+    migration = import_module(
+        "killay.archives.migrations.0018_protected_provider_files"
+    )
+    provider = archives_recipes.provider_recipe.make(image=image)
+    # as saved in the public media before the migration
+    names = [provider.image.name, *get_thumbnail_names(provider.image.name)]
+    for name in names:
+        with protected_storage.open(name) as file:
+            default_storage.save(name, ContentFile(file.read()))
+        protected_storage.delete(name)
+    migration.protect_provider_files(apps=apps, schema_editor=None)
+    assert all(protected_storage.exists(name) for name in names)
+    assert not any(default_storage.exists(name) for name in names)
@@ -0,0 +1,106 @@
+import pytest
+
+from killay.archives.resolvers import PlaceResolver, build_intervals
+from killay.archives.tests import recipes as archives_recipes
+
+
+@pytest.fixture
+def resolver():
+    return PlaceResolver()
+
+
+@pytest.fixture
+def place():
+    return archives_recipes.place_recipe.make()
+
+
+class TestBuildIntervals:
+    def test_disjoint(self):
+        intervals = [(10, 20, "a"), (30, 40, "b")]
+        assert build_intervals(intervals=intervals) == (
+            [10, 30],
+            [20, 40],
+            ["a", "b"],
+        )
+
+    def test_most_specific_wins(self):
+        intervals = [(0, 100, "a"), (10, 20, "b")]
+        assert build_intervals(intervals=intervals) == (
+            [0, 10, 21],
+            [9, 20, 100],
+            ["a", "b", "a"],
+        )
+
+    def test_empty(self):
+        assert build_intervals(intervals=[]) == ([], [], [])
+
+
+@pytest.mark.django_db
+class TestPlaceResolver:
+    def test_single_address(self, resolver, place):
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        assert resolver.resolve(ip_address="10.0.0.1") == place
+        assert resolver.resolve(ip_address="10.0.0.2") is None
+
+    def test_cidr_block(self, resolver, place):
+        archives_recipes.place_address_recipe.make(
+            place=place, ipv4="192.168.1.0", prefix_length=24
+        )
+        assert resolver.resolve(ip_address="192.168.1.0") == place
+        assert resolver.resolve(ip_address="192.168.1.255") == place
+        assert resolver.resolve(ip_address="192.168.2.1") is None
+
+    def test_range(self, resolver, place):
+        archives_recipes.place_address_recipe.make(
+            place=place, ipv4="10.0.0.10", ipv4_end="10.0.0.20"
+        )
+        assert resolver.resolve(ip_address="10.0.0.9") is None
+        assert resolver.resolve(ip_address="10.0.0.15") == place
+        assert resolver.resolve(ip_address="10.0.0.20") == place
+        assert resolver.resolve(ip_address="10.0.0.21") is None
+
+    def test_ipv6(self, resolver, place):
+        archives_recipes.place_address_recipe.make(
+            place=place, ipv4="2001:db8::", prefix_length=32
+        )
+        assert resolver.resolve(ip_address="2001:db8::1") == place
+        assert resolver.resolve(ip_address="0.0.0.1") is None
+
+    def test_most_specific_place(self, resolver, place):
+        other_place = archives_recipes.place_recipe.make()
+        archives_recipes.place_address_recipe.make(
+            place=place, ipv4="10.0.0.0", prefix_length=8
+        )
+        archives_recipes.place_address_recipe.make(
+            place=other_place, ipv4="10.1.0.0", prefix_length=16
+        )
+        assert resolver.resolve(ip_address="10.0.0.1") == place
+        assert resolver.resolve(ip_address="10.1.0.1") == other_place
+
+    def test_invalid_address(self, resolver):
+        assert resolver.resolve(ip_address="not an address") is None
+        assert resolver.resolve(ip_address=None) is None
+
+    def test_lookups_without_queries(self, resolver, place, django_assert_num_queries):
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        resolver.resolve(ip_address="10.0.0.1")
+        with django_assert_num_queries(0):
+            assert resolver.resolve(ip_address="10.0.0.1") == place
+            assert resolver.resolve(ip_address="10.0.0.2") is None
+            assert resolver.resolve(ip_address="10.0.0.2") is None
+
+    def test_invalidated_on_address_change(self, resolver, place):
+        assert resolver.resolve(ip_address="10.0.0.1") is None
+        address = archives_recipes.place_address_recipe.make(
+            place=place, ipv4="10.0.0.1"
+        )
+        assert resolver.resolve(ip_address="10.0.0.1") == place
+        address.delete()
+        assert resolver.resolve(ip_address="10.0.0.1") is None
+
+    def test_invalidated_on_place_change(self, resolver, place):
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        assert resolver.resolve(ip_address="10.0.0.1").name == place.name
+        place.name = "Other name"
+        place.save()
+        assert resolver.resolve(ip_address="10.0.0.1").name == "Other name"
@@ -0,0 +1,155 @@
+from datetime import time
+
+import pytest
+
+from killay.archives import search as archives_search
+from killay.archives.models import Piece
+from killay.archives.tests import recipes as archives_recipes
+
+
+def _search(query_search):
+    queryset = archives_search.search_pieces(
+        queryset=Piece.objects.all(), query_search=query_search
+    )
+    return list(queryset.values_list("id", flat=True))
+
+
+def test_tokenize():
+    assert archives_search.tokenize("La Canción, del 2-B!") == [
+        "la",
+        "cancion",
+        "del",
+    ]
+    assert archives_search.tokenize(None) == []
+
+
+@pytest.mark.django_db
+class TestSearchPieces:
+    def test_by_title_prefix(self):
+        piece = archives_recipes.piece_recipe.make(title="Memorias del barrio")
+        archives_recipes.piece_recipe.make(title="Otra pieza")
+        assert _search("memo barr") == [piece.id]
+
+    def test_every_word_must_match(self):
+        archives_recipes.piece_recipe.make(title="Memorias del barrio")
+        assert _search("memorias puerto") == []
+
+    def test_by_code(self):
+        piece = archives_recipes.piece_recipe.make(code="arc-0042")
+        assert _search("arc-0042") == [piece.id]
+
+    def test_by_meta_person_and_keyword(self):
+        piece = archives_recipes.piece_recipe.make(
+            people=[archives_recipes.person_recipe.make(name="Violeta Parra")],
+            keywords=[archives_recipes.keyword_recipe.make(name="Folclor")],
+        )
+        piece.meta.description = "Registro en el puerto"
+        piece.meta.save()
+        assert _search("violeta") == [piece.id]
+        assert _search("folclor") == [piece.id]
+        assert _search("puerto") == [piece.id]
+
+    def test_ranked(self):
+        in_description = archives_recipes.piece_recipe.make(title="Otra pieza")
+        in_description.meta.description = "Una canción"
+        in_description.meta.save()
+        in_title = archives_recipes.piece_recipe.make(title="Canción")
+        assert _search("canción") == [in_title.id, in_description.id]
+
+    def test_accent_and_case_insensitive(self):
+        piece = archives_recipes.piece_recipe.make(title="Canción del Niño")
+        assert _search("cancion nino") == [piece.id]
+        assert _search("CANCIÓN") == [piece.id]
+
+    def test_without_words(self):
+        archives_recipes.piece_recipe.make()
+        assert _search("!") == []
+
+
+@pytest.mark.django_db
+class TestSearchIndexSignals:
+    def test_title_changed(self):
+        piece = archives_recipes.piece_recipe.make(title="Antes")
+        piece.title = "Después"
+        piece.save()
+        assert _search("antes") == []
+        assert _search("después") == [piece.id]
+
+    def test_person_renamed(self):
+        person = archives_recipes.person_recipe.make(name="Antes")
+        piece = archives_recipes.piece_recipe.make(people=[person])
+        person.name = "Después"
+        person.save()
+        assert _search("después") == [piece.id]
+
+    def test_keyword_removed(self):
+        keyword = archives_recipes.keyword_recipe.make(name="Folclor")
+        piece = archives_recipes.piece_recipe.make(keywords=[keyword])
+        piece.keywords.remove(keyword)
+        assert _search("folclor") == []
+
+    def test_person_deleted(self):
+        person = archives_recipes.person_recipe.make(name="Violeta")
+        archives_recipes.piece_recipe.make(people=[person])
+        person.delete()
+        assert _search("violeta") == []
+
+
+@pytest.mark.django_db
+class TestSequenceSearch:
+    @pytest.fixture
+    def piece(self):
+        piece = archives_recipes.piece_recipe.make(title="Entrevista")
+        archives_recipes.sequence_recipe.make(
+            piece=piece, content="<p>Infancia</p>", ini=time(0, 0), end=time(0, 1)
+        )
+        archives_recipes.sequence_recipe.make(
+            piece=piece,
+            title="Música",
+            content="<b>Una canción del puerto</b>",
+            ini=time(0, 12, 31),
+            end=time(0, 13),
+        )
+        return piece
+
+    def test_search_pieces_by_content(self, piece):
+        assert _search("cancion puerto") == [piece.id]
+        assert _search("infancia puerto") == []
+
+    def test_html_is_not_indexed(self, piece):
+        assert _search("infancia") == [piece.id]
+        assert _search("p") == []
+
+    def test_sequence_hits(self, piece):
+        hits = archives_search.get_sequence_hits(
+            piece_ids=[piece.id], query_search="canción"
+        )
+        assert hits == {
+            piece.id: [
+                {
+                    "piece_id": piece.id,
+                    "order": 2,
+                    "ini_sec": 751,
+                    "end_sec": 780,
+                    "rank": 1,
+                }
+            ]
+        }
+
+    def test_sequence_hits_ranked_by_piece(self, piece):
+        archives_recipes.sequence_recipe.make(
+            piece=piece, title="Canción", ini=time(0, 20), end=time(0, 21)
+        )
+        hits = archives_search.get_sequence_hits(
+            piece_ids=[piece.id], query_search="cancion"
+        )
+        assert [hit["order"] for hit in hits[piece.id]] == [3, 2]
+
+    def test_order_updated(self, piece):
+        archives_recipes.sequence_recipe.make(
+            piece=piece, ini=time(0, 0, 0), end=time(0, 0, 1)
+        )
+        hits = archives_search.get_sequence_hits(
+            piece_ids=[piece.id], query_search="cancion"
+        )
+        assert hits[piece.id][0]["order"] == 3
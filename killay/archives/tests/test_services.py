@@ -1,9 +1,12 @@
 import pytest
 from datetime import datetime, time, date
 
+from django.db.models import QuerySet
+
 from killay.archives import services as archives_services
+from killay.archives.access import AccessContext
 from killay.archives.tests import recipes as archives_recipes
-from killay.archives.models import Collection
+from killay.archives.models import Collection, Piece
 
 
 @pytest.fixture
@@ -58,7 +61,9 @@ class TestGetPublicArchives:
     def test_not_is_visible_superuser(self, archive):
         archive.is_visible = False
         archive.save()
-        public_archives = archives_services.get_public_archives(is_superuser=True)
+        public_archives = archives_services.get_public_archives(
+            access=AccessContext(is_superuser=True)
+        )
         assert public_archives[0].id == archive.id
 
     def test_is_restricted(self, archive):
@@ -70,14 +75,18 @@ class TestGetPublicArchives:
     def test_is_restricted_with_superuser(self, archive):
         archive.is_restricted = True
         archive.save()
-        public_archives = archives_services.get_public_archives(is_superuser=True)
+        public_archives = archives_services.get_public_archives(
+            access=AccessContext(is_superuser=True)
+        )
         assert public_archives[0].id == archive.id
 
     def test_is_restricted_with_place(self, archive, place):
         archive.is_restricted = True
         archive.save()
         place.allowed_archives.add(archive.id)
-        public_archives = archives_services.get_public_archives(place=place)
+        public_archives = archives_services.get_public_archives(
+            access=archives_services.get_access_context(place=place)
+        )
         assert public_archives[0].id == archive.id
 
 
@@ -98,7 +107,7 @@ class TestGetPublicArchiveBySlug:
         archive.save()
         public_archive = archives_services.get_public_archive_by_slug(
             slug=archive.slug,
-            is_superuser=True,
+            access=AccessContext(is_superuser=True),
         )
         assert public_archive.id == archive.id
 
@@ -113,7 +122,7 @@ class TestGetPublicArchiveBySlug:
         archive.save()
         public_archive = archives_services.get_public_archive_by_slug(
             slug=archive.slug,
-            is_superuser=True,
+            access=AccessContext(is_superuser=True),
         )
         assert public_archive.id == archive.id
 
@@ -123,7 +132,7 @@ class TestGetPublicArchiveBySlug:
         place.allowed_archives.add(archive.id)
         public_archive = archives_services.get_public_archive_by_slug(
             slug=archive.slug,
-            place=place,
+            access=archives_services.get_access_context(place=place),
         )
         assert public_archive.id == archive.id
 
@@ -148,7 +157,7 @@ class TestGetPublicCollectionsByArchiveID:
         collection.is_visible = False
         collection.save()
         public_collections = archives_services.get_public_collections_by_archive_id(
-            archive_id=collection.archive_id, is_superuser=True
+            archive_id=collection.archive_id, access=AccessContext(is_superuser=True)
         )
         assert public_collections[0].id == collection.id
 
@@ -165,7 +174,7 @@ class TestGetPublicCollectionsByArchiveID:
         collection.save()
         public_collections = archives_services.get_public_collections_by_archive_id(
             archive_id=collection.archive_id,
-            is_superuser=True,
+            access=AccessContext(is_superuser=True),
         )
         assert public_collections[0].id == collection.id
 
@@ -174,7 +183,8 @@ class TestGetPublicCollectionsByArchiveID:
         collection.save()
         place.allowed_collections.add(collection.id)
         public_collections = archives_services.get_public_collections_by_archive_id(
-            archive_id=collection.archive_id, place=place
+            archive_id=collection.archive_id,
+            access=archives_services.get_access_context(place=place),
         )
         assert public_collections[0].id == collection.id
 
@@ -191,7 +201,7 @@ class TestGetPublicCollectionsByArchiveID:
         collection.archive.save()
         public_collections = archives_services.get_public_collections_by_archive_id(
             archive_id=collection.archive_id,
-            is_superuser=True,
+            access=AccessContext(is_superuser=True),
         )
         assert public_collections[0].id == collection.id
 
@@ -200,7 +210,8 @@ class TestGetPublicCollectionsByArchiveID:
         collection.archive.save()
         place.allowed_archives.add(collection.archive_id)
         public_collections = archives_services.get_public_collections_by_archive_id(
-            archive_id=collection.archive_id, place=place
+            archive_id=collection.archive_id,
+            access=archives_services.get_access_context(place=place),
         )
         assert public_collections[0].id == collection.id
 
@@ -228,7 +239,7 @@ class TestGetPublicCollectionBySlug:
         public_collection = archives_services.get_public_collection_by_slug(
             slug=collection.slug,
             archive_id=collection.archive_id,
-            is_superuser=True,
+            access=AccessContext(is_superuser=True),
         )
         assert public_collection.id == collection.id
 
@@ -246,7 +257,7 @@ class TestGetPublicCollectionBySlug:
         public_collection = archives_services.get_public_collection_by_slug(
             slug=collection.slug,
             archive_id=collection.archive_id,
-            is_superuser=True,
+            access=AccessContext(is_superuser=True),
         )
         assert public_collection.id == collection.id
 
@@ -257,7 +268,7 @@ class TestGetPublicCollectionBySlug:
         public_collection = archives_services.get_public_collection_by_slug(
             slug=collection.slug,
             archive_id=collection.archive_id,
-            place=place,
+            access=archives_services.get_access_context(place=place),
         )
         assert public_collection.id == collection.id
 
@@ -275,7 +286,7 @@ class TestGetPublicCollectionBySlug:
         public_collection = archives_services.get_public_collection_by_slug(
             slug=collection.slug,
             archive_id=collection.archive_id,
-            is_superuser=True,
+            access=AccessContext(is_superuser=True),
         )
         assert public_collection.id == collection.id
 
@@ -286,7 +297,7 @@ class TestGetPublicCollectionBySlug:
         public_collection = archives_services.get_public_collection_by_slug(
             slug=collection.slug,
             archive_id=collection.archive_id,
-            place=place,
+            access=archives_services.get_access_context(place=place),
         )
         assert public_collection.id == collection.id
 
@@ -378,7 +389,9 @@ class TestGetPublicPieces:
     def test_is_not_pusblished_with_superuser(seld, piece):
         piece.is_published = False
         piece.save()
-        public_pieces = archives_services.get_public_pieces(is_superuser=True)
+        public_pieces = archives_services.get_public_pieces(
+            access=AccessContext(is_superuser=True)
+        )
         assert public_pieces[0].id == piece.id
 
     def test_is_restricted(self, piece):
@@ -390,14 +403,18 @@ class TestGetPublicPieces:
     def test_is_restricted_with_superuser(self, piece):
         piece.is_restricted = True
         piece.save()
-        public_pieces = archives_services.get_public_pieces(is_superuser=True)
+        public_pieces = archives_services.get_public_pieces(
+            access=AccessContext(is_superuser=True)
+        )
         assert public_pieces[0].id == piece.id
 
     def test_is_restricted_with_place(self, piece, place):
         piece.is_restricted = True
         piece.save()
         place.allowed_pieces.add(piece.id)
-        public_pieces = archives_services.get_public_pieces(place=place)
+        public_pieces = archives_services.get_public_pieces(
+            access=archives_services.get_access_context(place=place)
+        )
         assert public_pieces[0].id == piece.id
 
     def test_archive_is_restricted(self, piece):
@@ -409,14 +426,18 @@ class TestGetPublicPieces:
     def test_archive_is_restricted_with_superuser(self, piece):
         piece.collection.archive.is_restricted = True
         piece.collection.archive.save()
-        public_pieces = archives_services.get_public_pieces(is_superuser=True)
+        public_pieces = archives_services.get_public_pieces(
+            access=AccessContext(is_superuser=True)
+        )
         assert public_pieces[0].id == piece.id
 
     def test_archive_is_restricted_with_place(self, piece, place):
         piece.collection.archive.is_restricted = True
         piece.collection.archive.save()
         place.allowed_archives.add(piece.collection.archive_id)
-        public_pieces = archives_services.get_public_pieces(place=place)
+        public_pieces = archives_services.get_public_pieces(
+            access=archives_services.get_access_context(place=place)
+        )
         assert public_pieces[0].id == piece.id
 
     def test_collection_is_restricted(self, piece):
@@ -428,16 +449,38 @@ class TestGetPublicPieces:
     def test_collection_is_restricted_with_superuser(self, piece):
         piece.collection.is_restricted = True
         piece.collection.save()
-        public_pieces = archives_services.get_public_pieces(is_superuser=True)
+        public_pieces = archives_services.get_public_pieces(
+            access=AccessContext(is_superuser=True)
+        )
         assert public_pieces[0].id == piece.id
 
     def test_collection_is_restricted_with_place(self, piece, place):
         piece.collection.is_restricted = True
         piece.collection.save()
         place.allowed_collections.add(piece.collection_id)
-        public_pieces = archives_services.get_public_pieces(place=place)
+        public_pieces = archives_services.get_public_pieces(
+            access=archives_services.get_access_context(place=place)
+        )
         assert public_pieces[0].id == piece.id
 
+    def test_is_restricted_with_other_place(self, piece, place):
+        piece.is_restricted = True
+        piece.save()
+        other_place = archives_recipes.place_recipe.make()
+        other_place.allowed_pieces.add(piece.id)
+        public_pieces = archives_services.get_public_pieces(
+            access=archives_services.get_access_context(place=place)
+        )
+        assert not public_pieces
+
+    def test_is_lazy_queryset(self, piece, place, django_assert_num_queries):
+        access = archives_services.get_access_context(place=place)
+        with django_assert_num_queries(0):
+            public_pieces = archives_services.get_public_pieces(access=access)
+        assert isinstance(public_pieces, QuerySet)
+        with django_assert_num_queries(1):
+            assert public_pieces.count() == 1
+
 
 @pytest.mark.django_db
 class TestGetPublicPiece:
@@ -455,7 +498,7 @@ class TestGetPublicPiece:
         piece.is_published = False
         piece.save()
         public_piece = archives_services.get_public_piece(
-            piece_code=piece.code, is_superuser=True
+            piece_code=piece.code, access=AccessContext(is_superuser=True)
         )
         assert public_piece.id == piece.id
 
@@ -470,7 +513,7 @@ class TestGetPublicPiece:
         piece.save()
         public_piece = archives_services.get_public_piece(
             piece_code=piece.code,
-            is_superuser=True,
+            access=AccessContext(is_superuser=True),
         )
         assert public_piece.id == piece.id
 
@@ -480,7 +523,7 @@ class TestGetPublicPiece:
         place.allowed_pieces.add(piece.id)
         public_piece = archives_services.get_public_piece(
             piece_code=piece.code,
-            place=place,
+            access=archives_services.get_access_context(place=place),
         )
         assert public_piece.id == piece.id
 
@@ -496,7 +539,7 @@ class TestGetPublicPiece:
         piece.collection.archive.is_restricted = True
         piece.collection.archive.save()
         public_piece = archives_services.get_public_piece(
-            piece_code=piece.code, is_superuser=True
+            piece_code=piece.code, access=AccessContext(is_superuser=True)
         )
         assert public_piece.id == piece.id
 
@@ -506,7 +549,7 @@ class TestGetPublicPiece:
         place.allowed_archives.add(piece.collection.archive_id)
         public_piece = archives_services.get_public_piece(
             piece_code=piece.code,
-            place=place,
+            access=archives_services.get_access_context(place=place),
         )
         assert public_piece.id == piece.id
 
@@ -522,7 +565,7 @@ class TestGetPublicPiece:
         piece.collection.is_restricted = True
         piece.collection.save()
         public_piece = archives_services.get_public_piece(
-            piece_code=piece.code, is_superuser=True
+            piece_code=piece.code, access=AccessContext(is_superuser=True)
         )
         assert public_piece.id == piece.id
 
@@ -532,67 +575,199 @@ class TestGetPublicPiece:
         place.allowed_collections.add(piece.collection_id)
         public_piece = archives_services.get_public_piece(
             piece_code=piece.code,
-            place=place,
+            access=archives_services.get_access_context(place=place),
         )
         assert public_piece.id == piece.id
 
 
 @pytest.mark.django_db
-def test_get_archive_filter_options(archive):
-    result = archives_services.get_archive_filter_options()
+class TestGetAccessContext:
+    def test_without_place(self):
+        access = archives_services.get_access_context()
+        assert access == AccessContext()
+
+    def test_with_place(self, place, piece):
+        place.allowed_archives.add(piece.collection.archive_id)
+        place.allowed_collections.add(piece.collection_id)
+        place.allowed_pieces.add(piece.id)
+        access = archives_services.get_access_context(place=place, is_superuser=True)
+        assert access.place_id == place.id
+        assert access.is_superuser
+        assert access.allowed_archive_ids == frozenset([piece.collection.archive_id])
+        assert access.allowed_collection_ids == frozenset([piece.collection_id])
+        assert access.allowed_piece_ids == frozenset([piece.id])
+
+
+@pytest.mark.django_db
+def test_get_archive_filter_options():
+    piece = archives_recipes.piece_recipe.make()
+    archive = piece.collection.archive
+    archives_recipes.archive_recipe.make()
+    pieces = archives_services.get_public_pieces()
+    result = archives_services.get_archive_filter_options(pieces=pieces)
+    assert len(result) == 1
     assert result[0]["label"] == archive.name
     assert result[0]["slug"] == archive.slug
+    assert result[0]["total"] == 1
     assert result[0]["active"] is False
 
 
 @pytest.mark.django_db
-def test_get_collection_filter_options(collection):
-    result = archives_services.get_collection_filter_options()
+def test_get_collection_filter_options():
+    piece = archives_recipes.piece_recipe.make()
+    collection = piece.collection
+    archives_recipes.piece_recipe.make(collection=collection)
+    pieces = archives_services.get_public_pieces()
+    result = archives_services.get_collection_filter_options(pieces=pieces)
     assert result[0]["label"] == collection.name
     assert result[0]["slug"] == collection.slug
     assert result[0]["archive_slug"] == collection.archive.slug
+    assert result[0]["total"] == 2
     assert result[0]["active"] is False
 
 
 @pytest.mark.django_db
 def test_get_category_filter_options():
     category = archives_recipes.category_recipe.make()
-    result = archives_services.get_category_filter_options()
+    piece = archives_recipes.piece_recipe.make(collection=category.collection)
+    piece.categories.set([category])
+    pieces = archives_services.get_public_pieces()
+    result = archives_services.get_category_filter_options(pieces=pieces)
     assert result[0]["label"] == category.name
     assert result[0]["slug"] == category.slug
+    assert result[0]["total"] == 1
     assert result[0]["active"] is False
 
 
+@pytest.mark.django_db
+def test_get_category_filter_options_by_collection():
+    category = archives_recipes.category_recipe.make()
+    other_category = archives_recipes.category_recipe.make()
+    for item in [category, other_category]:
+        piece = archives_recipes.piece_recipe.make(collection=item.collection)
+        piece.categories.set([item])
+    pieces = archives_services.get_public_pieces()
+    result = archives_services.get_category_filter_options(
+        pieces=pieces, collection_id=category.collection_id
+    )
+    assert [option["slug"] for option in result] == [category.slug]
+
+
+@pytest.mark.django_db
+def test_get_category_filter_options_restricted_collection():
+    category = archives_recipes.category_recipe.make()
+    piece = archives_recipes.piece_recipe.make(collection=category.collection)
+    piece.categories.set([category])
+    category.collection.is_restricted = True
+    category.collection.save()
+    pieces = Piece.objects.all()
+    result = archives_services.get_category_filter_options(pieces=pieces)
+    assert not result
+
+
 @pytest.mark.django_db
 def test_get_person_filter_options():
     person = archives_recipes.person_recipe.make()
-    result = archives_services.get_person_filter_options()
+    archives_recipes.person_recipe.make()
+    piece = archives_recipes.piece_recipe.make()
+    piece.people.set([person])
+    pieces = archives_services.get_public_pieces()
+    result = archives_services.get_person_filter_options(pieces=pieces)
+    assert len(result) == 1
     assert result[0]["label"] == person.name
     assert result[0]["slug"] == person.slug
+    assert result[0]["total"] == 1
     assert result[0]["active"] is False
 
 
 @pytest.mark.django_db
 def test_get_keyword_filter_options():
     keyword = archives_recipes.keyword_recipe.make()
-    result = archives_services.get_keyword_filter_options()
+    archives_recipes.keyword_recipe.make()
+    piece = archives_recipes.piece_recipe.make()
+    piece.keywords.set([keyword])
+    pieces = archives_services.get_public_pieces()
+    result = archives_services.get_keyword_filter_options(pieces=pieces)
+    assert len(result) == 1
     assert result[0]["label"] == keyword.name
     assert result[0]["slug"] == keyword.slug
+    assert result[0]["total"] == 1
     assert result[0]["active"] is False
 
 
+@pytest.mark.django_db
+def test_get_filter_options_scoped_to_result_set():
+    keyword = archives_recipes.keyword_recipe.make()
+    other_keyword = archives_recipes.keyword_recipe.make()
+    person = archives_recipes.person_recipe.make()
+    pieces = archives_recipes.piece_recipe.make(_quantity=3)
+    for piece in pieces:
+        piece.keywords.set([keyword])
+        piece.people.set([person])
+    pieces[0].keywords.add(other_keyword)
+    result_set = archives_services.get_public_pieces(
+        categorization={"keyword": other_keyword}
+    )
+    keyword_options = archives_services.get_keyword_filter_options(
+        pieces=result_set, active_keyword_id=other_keyword.id
+    )
+    person_options = archives_services.get_person_filter_options(pieces=result_set)
+    assert {option["slug"]: option["total"] for option in keyword_options} == {
+        keyword.slug: 1,
+        other_keyword.slug: 1,
+    }
+    assert [option["total"] for option in person_options] == [1]
+
+
+@pytest.mark.django_db
+def test_get_filter_options_hides_restricted_pieces():
+    keyword = archives_recipes.keyword_recipe.make()
+    piece = archives_recipes.piece_recipe.make()
+    restricted_piece = archives_recipes.piece_recipe.make(is_restricted=True)
+    for item in [piece, restricted_piece]:
+        item.keywords.set([keyword])
+    pieces = archives_services.get_public_pieces()
+    result = archives_services.get_keyword_filter_options(pieces=pieces)
+    assert result[0]["total"] == 1
+
+
+@pytest.mark.django_db
+def test_get_filter_options_keeps_active_option_without_pieces():
+    keyword = archives_recipes.keyword_recipe.make()
+    pieces = archives_services.get_public_pieces()
+    result = archives_services.get_keyword_filter_options(
+        pieces=pieces, active_keyword_id=keyword.id
+    )
+    assert result == [
+        {"label": keyword.name, "slug": keyword.slug, "total": 0, "active": True}
+    ]
+
+
+@pytest.mark.django_db
+def test_get_filter_options_constant_queries(django_assert_num_queries):
+    keywords = archives_recipes.keyword_recipe.make(_quantity=5)
+    for keyword in keywords:
+        piece = archives_recipes.piece_recipe.make()
+        piece.keywords.set([keyword])
+    pieces = archives_services.get_public_pieces(query_search="")
+    with django_assert_num_queries(1):
+        result = archives_services.get_keyword_filter_options(pieces=pieces)
+    assert len(result) == 5
+
+
 @pytest.mark.django_db
 def test_bulk_create_piece():
     collection = archives_recipes.collection_recipe.make()
     data = {
         "collection_id": collection.id,
         "code": "fake-code",
-        "title": "fake",
+        "title": "Canción Fake",
         "is_published": True,
         "kind": "VIDEO",
     }
     returned_pieces = archives_services.bulk_create_pieces(data_list=[data])
     assert returned_pieces[0].code == data["code"]
+    assert returned_pieces[0].search_text == "cancion fake"
 
 
 @pytest.mark.django_db
@@ -621,6 +796,7 @@ def test_bulk_add_piece_people_by_texts():
     assert piece.keywords.count() == 1
     archives_services.bulk_add_piece_people_by_texts(piece_people_data=[data])
     assert piece.people.count() == 3
+    assert piece.people.filter(search_text="new person").exists()
 
 
 @pytest.mark.django_db
@@ -680,6 +856,8 @@ def test_bulk_create_meta_pieces():
         else:
             assert getattr(piece.meta, field) == value
             assert getattr(piece_without_meta.meta, field) == value
+    assert piece.meta.search_text == "fake fake fake fake fake fake fake"
+    assert piece_without_meta.meta.search_text == piece.meta.search_text
 
 
 @pytest.mark.django_db
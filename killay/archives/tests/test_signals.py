@@ -0,0 +1,137 @@
+from datetime import time
+
+import pytest
+
+from killay.archives.lib.constants import ProviderConstants
+from killay.archives.models import EffectiveAccess
+from killay.archives.services import (
+    bulk_create_meta_pieces,
+    bulk_create_piece_video_provider,
+)
+from killay.archives.tests import recipes as archives_recipes
+
+
+@pytest.fixture
+def piece():
+    return archives_recipes.piece_recipe.make()
+
+
+@pytest.fixture
+def place():
+    return archives_recipes.place_recipe.make()
+
+
+def _get_access_place_ids(piece):
+    return set(
+        EffectiveAccess.objects.filter(piece_id=piece.id).values_list(
+            "place_id", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestEffectiveAccessSignals:
+    def test_piece_created(self, piece, place):
+        assert _get_access_place_ids(piece=piece) == {None, place.id}
+
+    def test_piece_not_published(self, piece, place):
+        piece.is_published = False
+        piece.save()
+        assert _get_access_place_ids(piece=piece) == set()
+
+    def test_piece_restricted_and_allowed(self, piece, place):
+        piece.is_restricted = True
+        piece.save()
+        assert _get_access_place_ids(piece=piece) == set()
+        place.allowed_pieces.add(piece)
+        assert _get_access_place_ids(piece=piece) == {place.id}
+
+    def test_piece_allowed_from_reverse_relation(self, piece, place):
+        piece.is_restricted = True
+        piece.save()
+        piece.allowed_places.add(place)
+        assert _get_access_place_ids(piece=piece) == {place.id}
+        piece.allowed_places.clear()
+        assert _get_access_place_ids(piece=piece) == set()
+
+    def test_collection_restricted_and_allowed(self, piece, place):
+        collection = piece.collection
+        collection.is_restricted = True
+        collection.save()
+        assert _get_access_place_ids(piece=piece) == set()
+        place.allowed_collections.add(collection)
+        assert _get_access_place_ids(piece=piece) == {place.id}
+
+    def test_archive_restricted_and_allowed(self, piece, place):
+        archive = piece.collection.archive
+        archive.is_restricted = True
+        archive.save()
+        assert _get_access_place_ids(piece=piece) == set()
+        archive.allowed_places.add(place)
+        assert _get_access_place_ids(piece=piece) == {place.id}
+
+    def test_archive_not_visible(self, piece, place):
+        archive = piece.collection.archive
+        archive.is_visible = False
+        archive.save()
+        assert _get_access_place_ids(piece=piece) == set()
+
+    def test_save_without_access_fields(self, piece, place):
+        EffectiveAccess.objects.all().delete()
+        piece.title = "new title"
+        piece.save(update_fields=["title"])
+        assert _get_access_place_ids(piece=piece) == set()
+
+    def test_save_without_access_changes(self, piece, place):
+        EffectiveAccess.objects.all().delete()
+        piece.title = "new title"
+        piece.save()
+        collection = piece.collection
+        collection.name = "new name"
+        collection.save()
+        assert _get_access_place_ids(piece=piece) == set()
+
+    def test_places_allowed_apart(self, piece, place):
+        other_place = archives_recipes.place_recipe.make()
+        other_piece = archives_recipes.piece_recipe.make(is_restricted=True)
+        other_place.allowed_pieces.add(other_piece)
+        piece.is_restricted = True
+        piece.save()
+        place.allowed_pieces.add(piece)
+        assert _get_access_place_ids(piece=piece) == {place.id}
+        assert _get_access_place_ids(piece=other_piece) == {other_place.id}
+
+    def test_place_deleted(self, piece, place):
+        place.delete()
+        assert _get_access_place_ids(piece=piece) == {None}
+
+
+@pytest.mark.django_db
+class TestPieceListFieldsSignals:
+    def test_provider_saved_and_deleted(self, piece):
+        provider = archives_recipes.provider_recipe.make(
+            piece=piece,
+            active=True,
+            plyr_provider=ProviderConstants.YOUTUBE,
+            ply_embed_id="abc",
+        )
+        piece.refresh_from_db()
+        assert piece.resolved_thumb_url == "https://i.ytimg.com/vi/abc/sddefault.jpg"
+        provider.delete()
+        piece.refresh_from_db()
+        assert piece.resolved_thumb_url is None
+
+    def test_meta_saved(self, piece):
+        piece.meta.duration = time(0, 3, 20)
+        piece.meta.save()
+        piece.refresh_from_db()
+        assert piece.duration == time(0, 3, 20)
+
+    def test_bulk_created(self, piece):
+        bulk_create_piece_video_provider(
+            [(piece.id, {"ply_embed_id": "xyz", "plyr_provider": "youtube"})]
+        )
+        bulk_create_meta_pieces([(piece.id, {"duration": time(1, 0, 0)})])
+        piece.refresh_from_db()
+        assert piece.resolved_thumb_url == "https://i.ytimg.com/vi/xyz/sddefault.jpg"
+        assert piece.duration == time(1, 0, 0)
@@ -0,0 +1,109 @@
+import pytest
+
+from killay.archives import services as archives_services
+from killay.archives.lib.constants import PieceConstants, SuggestConstants
+from killay.archives.suggest import Suggester, get_entry_keys
+from killay.archives.tests import recipes as archives_recipes
+
+
+def test_get_entry_keys():
+    assert get_entry_keys("Violeta Parra") == ["violeta parra", "parra"]
+    assert get_entry_keys("") == []
+
+
+def _get_labels(results, kind):
+    return [entry.label for entry in results[kind]]
+
+
+@pytest.mark.django_db
+class TestSuggester:
+    def test_suggest_by_prefix_of_any_word(self):
+        piece = archives_recipes.piece_recipe.make(title="Canción de Violeta Parra")
+        archives_recipes.piece_recipe.make(title="Otra pieza")
+        person = piece.people.first()
+        person.name = "Violeta Parra"
+        person.save()
+        results = Suggester().suggest(query="PARR")
+        assert _get_labels(results, SuggestConstants.KIND_PIECE) == [piece.title]
+        assert _get_labels(results, SuggestConstants.KIND_PERSON) == [person.name]
+        assert _get_labels(results, SuggestConstants.KIND_KEYWORD) == []
+
+    def test_suggest_accent_insensitive(self):
+        piece = archives_recipes.piece_recipe.make(title="Canción")
+        results = Suggester().suggest(query="cancion")
+        assert _get_labels(results, SuggestConstants.KIND_PIECE) == [piece.title]
+
+    def test_short_query(self):
+        archives_recipes.piece_recipe.make(title="Canción")
+        results = Suggester().suggest(query="c")
+        assert not any(results.values())
+
+    def test_hides_not_visible_content(self):
+        piece = archives_recipes.piece_recipe.make(title="Canción", is_restricted=True)
+        keyword = piece.keywords.first()
+        keyword.name = "Cantos"
+        keyword.save()
+        suggester = Suggester()
+        results = suggester.suggest(query="can")
+        assert not any(results.values())
+        superuser_access = archives_services.get_access_context(is_superuser=True)
+        results = suggester.suggest(query="can", access=superuser_access)
+        assert _get_labels(results, SuggestConstants.KIND_PIECE) == [piece.title]
+        assert _get_labels(results, SuggestConstants.KIND_KEYWORD) == [keyword.name]
+
+    def test_visible_from_place(self):
+        place = archives_recipes.place_recipe.make()
+        piece = archives_recipes.piece_recipe.make(title="Canción", is_restricted=True)
+        place.allowed_pieces.add(piece)
+        access = archives_services.get_access_context(place=place)
+        results = Suggester().suggest(query="can", access=access)
+        assert _get_labels(results, SuggestConstants.KIND_PIECE) == [piece.title]
+
+    def test_rebuilds_when_content_changes(self):
+        suggester = Suggester()
+        assert not suggester.suggest(query="can")[SuggestConstants.KIND_PIECE]
+        piece = archives_recipes.piece_recipe.make(title="Canción")
+        results = suggester.suggest(query="can")
+        assert _get_labels(results, SuggestConstants.KIND_PIECE) == [piece.title]
+
+    def test_rebuilds_when_label_changes(self):
+        piece = archives_recipes.piece_recipe.make(title="Canción")
+        suggester = Suggester()
+        suggester.suggest(query="can")
+        keyword = piece.keywords.first()
+        keyword.name = "Cantos"
+        keyword.save()
+        results = suggester.suggest(query="can")
+        assert _get_labels(results, SuggestConstants.KIND_KEYWORD) == [keyword.name]
+
+    def test_keeps_index_on_other_changes(self, django_assert_num_queries):
+        piece = archives_recipes.piece_recipe.make(title="Canción")
+        suggester = Suggester()
+        suggester.suggest(query="can")
+        piece.meta.description = "Canción de cuna"
+        piece.meta.save()
+        archives_recipes.sequence_recipe.make(piece=piece)
+        archives_recipes.provider_recipe.make(piece=piece)
+        piece.kind = PieceConstants.KIND_SOUND
+        piece.save()
+        with django_assert_num_queries(0):
+            results = suggester.suggest(query="can")
+        assert _get_labels(results, SuggestConstants.KIND_PIECE) == [piece.title]
+
+    def test_no_queries_on_hot_path(self, django_assert_num_queries):
+        archives_recipes.piece_recipe.make(title="Canción")
+        suggester = Suggester()
+        suggester.suggest(query="can")
+        with django_assert_num_queries(0):
+            results = suggester.suggest(query="canc")
+        assert results[SuggestConstants.KIND_PIECE]
+
+    def test_max_results_by_kind(self):
+        archives_recipes.piece_recipe.make(
+            title="Canción", _quantity=SuggestConstants.MAX_RESULTS_BY_KIND + 1
+        )
+        results = Suggester().suggest(query="can")
+        assert (
+            len(results[SuggestConstants.KIND_PIECE])
+            == SuggestConstants.MAX_RESULTS_BY_KIND
+        )
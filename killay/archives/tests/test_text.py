@@ -0,0 +1,7 @@
+from killay.archives.lib.text import normalize_text
+
+
+def test_normalize_text():
+    assert normalize_text("¡Canción del Niño!") == "cancion del nino"
+    assert normalize_text("  Über_straße,  ÁRBOL ") == "uber strasse arbol"
+    assert normalize_text(None) == ""
@@ -0,0 +1,108 @@
+from io import BytesIO
+
+import pytest
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from killay.archives.lib.constants import ThumbnailConstants
+from killay.archives.tests import recipes as archives_recipes
+from killay.archives.thumbnails import (
+    generate_thumbnails,
+    get_srcset,
+    get_thumbnail_name,
+    get_thumbnail_names,
+    get_thumbnail_url,
+    has_thumbnails,
+)
+
+
+def _get_png(size=(1600, 900), mode="RGBA") -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 10, 10, 128)).save(buffer, format="PNG")
+    return SimpleUploadedFile("foto.png", buffer.getvalue(), content_type="image/png")
+
+
+def test_get_thumbnail_name():
+    assert (
+        get_thumbnail_name(
+            name="piece_thumbs/foto.png",
+            width=320,
+            image_format=ThumbnailConstants.FORMAT_JPEG,
+        )
+        == "piece_thumbs/thumbnails/foto-320w.jpg"
+    )
+
+
+def test_get_srcset():
+    assert get_srcset(name=None) is None
+    name = default_storage.save("piece_thumbs/foto.png", _get_png())
+    assert get_srcset(name=name) is None
+    generate_thumbnails(name=name)
+    assert get_srcset(name=name) == (
+        "/media/piece_thumbs/thumbnails/foto-320w.webp 320w, "
+        "/media/piece_thumbs/thumbnails/foto-640w.webp 640w, "
+        "/media/piece_thumbs/thumbnails/foto-1280w.webp 1280w"
+    )
+
+
+def test_get_thumbnail_url_without_thumbnails():
+    name = default_storage.save("piece_thumbs/foto.png", _get_png())
+    assert get_thumbnail_url(name=name) == "/media/piece_thumbs/foto.png"
+    # an unreadable image never gets thumbnails, the original is kept
+    broken_name = default_storage.save("piece_thumbs/rota.png", ContentFile(b"rota"))
+    assert not generate_thumbnails(name=broken_name)
+    assert get_thumbnail_url(name=broken_name) == "/media/piece_thumbs/rota.png"
+    generate_thumbnails(name=name)
+    assert get_thumbnail_url(name=name) == (
+        "/media/piece_thumbs/thumbnails/foto-640w.webp"
+    )
+
+
+def test_generate_thumbnails():
+    name = default_storage.save("piece_thumbs/foto.png", _get_png())
+    assert not has_thumbnails(name=name)
+    assert generate_thumbnails(name=name)
+    assert has_thumbnails(name=name)
+    thumbnail_name = get_thumbnail_name(
+        name=name, width=640, image_format=ThumbnailConstants.FORMAT_JPEG
+    )
+    with default_storage.open(thumbnail_name) as file:
+        thumbnail = Image.open(file)
+        assert thumbnail.format == "JPEG"
+        assert thumbnail.size == (640, 360)
+
+
+def test_generate_thumbnails_smaller_original():
+    name = default_storage.save("piece_thumbs/icono.png", _get_png(size=(100, 50)))
+    assert generate_thumbnails(name=name)
+    thumbnail_name = get_thumbnail_name(
+        name=name, width=1280, image_format=ThumbnailConstants.FORMAT_WEBP
+    )
+    with default_storage.open(thumbnail_name) as file:
+        assert Image.open(file).size == (100, 50)
+
+
+def test_generate_thumbnails_unreadable():
+    name = default_storage.save("piece_thumbs/image.jpg", ContentFile(b"fake"))
+    assert not generate_thumbnails(name=name)
+    assert not generate_thumbnails(name="piece_thumbs/missing.jpg")
+
+
+@pytest.mark.django_db
+def test_generated_on_upload():
+    piece = archives_recipes.piece_recipe.make(thumb=_get_png())
+    assert has_thumbnails(name=piece.thumb.name)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [1, 2])
+def test_generate_thumbnails_command(workers):
+    piece = archives_recipes.piece_recipe.make(thumb=_get_png())
+    for thumbnail_name in get_thumbnail_names(name=piece.thumb.name):
+        default_storage.delete(thumbnail_name)
+    call_command("generate_thumbnails", workers=workers)
+    assert has_thumbnails(name=piece.thumb.name)
@@ -0,0 +1,179 @@
+import hashlib
+import os
+
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, default_storage
+from PIL import Image, ImageOps
+
+from killay.archives.lib.constants import ThumbnailConstants
+
+
+def get_thumbnail_name(name: str, width: int, image_format: str) -> str:
+    """
+    Returns the name of a thumbnail, stored in a directory next to the
+    original so it can be derived from the name without reading the storage.
+    """
+    directory, filename = os.path.split(name)
+    return ThumbnailConstants.NAME_TEMPLATE.format(
+        directory=os.path.join(directory, ThumbnailConstants.DIRECTORY),
+        stem=os.path.splitext(filename)[0],
+        width=width,
+        extension=ThumbnailConstants.EXTENSIONS[image_format],
+    )
+
+
+def get_thumbnail_names(name: str) -> List[str]:
+    return [
+        get_thumbnail_name(name=name, width=width, image_format=image_format)
+        for image_format in ThumbnailConstants.FORMATS
+        for width in ThumbnailConstants.WIDTHS
+    ]
+
+
+def has_thumbnails(name: str, storage: Optional[Storage] = None) -> bool:
+    storage = storage or default_storage
+    return all(storage.exists(thumbnail) for thumbnail in get_thumbnail_names(name))
+
+
+def _get_ready_key(name: str) -> str:
+    return ThumbnailConstants.READY_KEY.format(
+        digest=hashlib.md5(name.encode()).hexdigest()
+    )
+
+
+def are_thumbnails_ready(name: str, storage: Optional[Storage] = None) -> bool:
+    """
+    Tells if every thumbnail of the image exists, from the cache when it was
+    looked up before. The images saved before the thumbnails existed and the
+    unreadable ones have none.
+    """
+    key = _get_ready_key(name=name)
+    is_ready = cache.get(key)
+    if is_ready is None:
+        is_ready = has_thumbnails(name=name, storage=storage)
+        timeout = None if is_ready else ThumbnailConstants.MISSING_TIMEOUT
+        cache.set(key, is_ready, timeout=timeout)
+    return is_ready
+
+
+def get_thumbnail_url(
+    name: Optional[str],
+    width: int = ThumbnailConstants.DEFAULT_WIDTH,
+    image_format: str = ThumbnailConstants.FORMAT_WEBP,
+) -> Optional[str]:
+    if not name:
+        return None
+    if not are_thumbnails_ready(name=name):
+        return default_storage.url(name)
+    return default_storage.url(
+        get_thumbnail_name(name=name, width=width, image_format=image_format)
+    )
+
+
+def get_srcset(
+    name: Optional[str], image_format: str = ThumbnailConstants.FORMAT_WEBP
+) -> Optional[str]:
+    if not name or not are_thumbnails_ready(name=name):
+        return None
+    return ", ".join(
+        f"{get_thumbnail_url(name, width=width, image_format=image_format)} {width}w"
+        for width in ThumbnailConstants.WIDTHS
+    )
+
+
+def get_srcsets(name: Optional[str]) -> Optional[Dict[str, str]]:
+    # by format, for the sources of a picture element
+    if not name or not are_thumbnails_ready(name=name):
+        return None
+    return {
+        image_format: get_srcset(name=name, image_format=image_format)
+        for image_format in ThumbnailConstants.FORMATS
+    }
+
+
+def _resize(image: Image.Image, width: int) -> Image.Image:
+    # never enlarges, a narrow original keeps its size under every width
+    if image.width <= width:
+        return image.copy()
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def _to_format(image: Image.Image, image_format: str) -> Image.Image:
+    has_alpha = image.mode in ["RGBA", "LA"] or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    if image_format == ThumbnailConstants.FORMAT_WEBP and has_alpha:
+        return image.convert("RGBA")
+    if has_alpha:
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image.convert("RGBA"), mask=image.convert("RGBA"))
+        return background
+    return image.convert("RGB")
+
+
+def generate_thumbnails(
+    name: str, storage: Optional[Storage] = None, force: bool = False
+) -> bool:
+    """
+    Generates the WebP and JPEG thumbnails of every width of an image of the
+    storage, skipping the existing ones unless forced. Returns False when the
+    original can not be read as an image.
+    """
+    storage = storage or default_storage
+    try:
+        with storage.open(name) as file:
+            image = Image.open(file)
+            image.load()
+    except (OSError, Image.DecompressionBombError):
+        return False
+    image = ImageOps.exif_transpose(image)
+    for image_format in ThumbnailConstants.FORMATS:
+        converted = _to_format(image=image, image_format=image_format)
+        for width in ThumbnailConstants.WIDTHS:
+            thumbnail_name = get_thumbnail_name(
+                name=name, width=width, image_format=image_format
+            )
+            if storage.exists(thumbnail_name):
+                if not force:
+                    continue
+                storage.delete(thumbnail_name)
+            buffer = BytesIO()
+            _resize(image=converted, width=width).save(
+                buffer,
+                format=image_format.upper(),
+                quality=ThumbnailConstants.QUALITY,
+            )
+            storage.save(thumbnail_name, ContentFile(buffer.getvalue()))
+    cache.delete(_get_ready_key(name=name))
+    return True
+
+
+def get_image_storage(label: str) -> Storage:
+    field_name = dict(ThumbnailConstants.IMAGE_FIELDS)[label]
+    return apps.get_model(label)._meta.get_field(field_name).storage
+
+
+def get_image_names() -> List[Tuple[str, str]]:
+    # with the label of their model, the images of the pieces are protected
+    names = set()
+    for label, field_name in ThumbnailConstants.IMAGE_FIELDS:
+        model = apps.get_model(label)
+        names.update(
+            (label, name)
+            for name in model.objects.exclude(**{field_name: ""})
+            .exclude(**{f"{field_name}__isnull": True})
+            .values_list(field_name, flat=True)
+        )
+    return sorted(names)
+
+
+def generate_field_thumbnails(label: str, name: str, force: bool = False) -> bool:
+    return generate_thumbnails(
+        name=name, storage=get_image_storage(label=label), force=force
+    )
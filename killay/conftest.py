@@ -1,16 +1,20 @@
 import pytest
 
+from io import BytesIO
 from typing import List
 
 from django.contrib.messages.storage.fallback import FallbackStorage
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
 
 from killay.users.models import User
 from killay.users.tests.factories import UserFactory, UserAdminFactory
 
 from killay.pages.models import Page
 from killay.pages.tests.factories import PageFactory, HomePageFactory
+from killay.viewer.engine.stats import view_buffer
 
 
 @pytest.fixture
@@ -31,6 +35,17 @@ def rf_msg(rf):
 @pytest.fixture(autouse=True)
 def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
+    settings.PROTECTED_MEDIA_ROOT = tmpdir.join("protected").strpath
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_view_buffer():
+    view_buffer.drain()
 
 
 @pytest.fixture
@@ -55,4 +70,7 @@ def home_page() -> Page:
 
 @pytest.fixture
 def image():
-    return SimpleUploadedFile("image.jpg", b"fake content", content_type="image/jpg")
+    # a real image, so its thumbnails are generated when it is saved
+    buffer = BytesIO()
+    Image.new("RGB", (32, 18), (200, 10, 10)).save(buffer, format="JPEG")
+    return SimpleUploadedFile("image.jpg", buffer.getvalue(), content_type="image/jpg")
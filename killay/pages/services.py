@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 
 from django.conf import settings
@@ -54,3 +55,20 @@ def get_public_collection_menu_pages(
     )
     place_id = place.id if place else None
     return _filter_pages(pages=pages, place_id=place_id, is_superuser=is_superuser)
+
+
+def get_page_last_modified(slug: str) -> Optional[datetime]:
+    return (
+        Page.objects.filter(site_id=settings.SITE_ID, slug=slug)
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+
+
+def get_public_pages() -> List[Page]:
+    # the pages any visitor can see, whatever their place
+    return _filter_pages(pages=Page.objects.filter(site_id=settings.SITE_ID))
+
+
+def get_public_page_slugs() -> List[str]:
+    return [page.slug for page in get_public_pages()]
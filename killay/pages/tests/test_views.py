@@ -15,6 +15,16 @@ class TestPageDetailView:
         assert response.render()
         assert page.title in str(response.content)
 
+    def test_not_modified(self, page: Page, client: Client):
+        page.is_visible = True
+        page.save()
+        response = client.get(f"/pages/{page.slug}/")
+        assert response["ETag"]
+        response = client.get(
+            f"/pages/{page.slug}/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == 304
+
     def test_not_found(self, rf: RequestFactory):
         request = rf.get("/pages/X")
         with pytest.raises(Http404):
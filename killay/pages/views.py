@@ -5,13 +5,21 @@ from killay.pages.lib.constants import PageConstants
 from killay.pages.models import Page
 
 from killay.admin.views.mixins import PublishRequiredMixin
+from killay.viewer.engine.pipelines import ValidatorPipeline
+from killay.viewer.views.mixins import ConditionalGetMixin, PageCacheMixin
 
 
-class PageDetailView(PublishRequiredMixin, DetailView):
+class PageDetailView(
+    PublishRequiredMixin, ConditionalGetMixin, PageCacheMixin, DetailView
+):
     model = Page
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    def get_page_validators(self):
+        pipeline = ValidatorPipeline(request=self.request)
+        return pipeline.get_page_validators(slug=self.kwargs.get(self.slug_url_kwarg))
+
     def get(self, request, *args, **kwargs):
         response = super().get(request, *args, **kwargs)
         if self.object.kind == PageConstants.KIND_LINK and self.object.redirect_to:
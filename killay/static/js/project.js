@@ -27,6 +27,7 @@ class SequenceEngine {
 
   run () {
     this._load_sequences_data();
+    this.select_sequence_by_hash();
     $player.on("timeupdate", this.callback_timeupdate.bind(this));
   }
 
@@ -153,6 +154,12 @@ class SequenceEngine {
     return sequence ? this.select_sequence(sequence) : null;
   }
 
+  select_sequence_by_hash () {
+    // deep links from the search results, like #sequence-{order}-{ini}-{end}
+    let sequence = this.get_sequence_by_id(window.location.hash.slice(1));
+    return sequence ? this.select_sequence(sequence) : null;
+  }
+
   callback_timeupdate (event) {
     let current_second = parseInt($player.currentTime);
     if (this._current_second == current_second) {return}
@@ -6,3 +6,6 @@ class ViewerConfig(AppConfig):
     name = "killay.viewer"
     verbose_name = _("Viewer")
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        import killay.viewer.signals  # noqa F401
@@ -1,8 +1,9 @@
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from django.http import HttpRequest
 from django.urls import reverse
 
+from killay.viewer.engine.dependencies import track_dependencies
 from killay.viewer.lib.constants import ViewerConstants, ViewerPatternConstants
 
 
@@ -18,6 +19,7 @@ class PipelineBase:
         self.viewer = request.viewer
         self.user = request.user
         self.place = request.place
+        self.access = request.access
         self.init_prepare()
 
     def init_prepare(self) -> None:
@@ -34,6 +36,9 @@ class PipelineBase:
         base_url = reverse(pattern)
         return base_url
 
+    def _track(self, model, ids: Optional[Iterable] = None) -> None:
+        track_dependencies(request=self.request, model=model, ids=ids)
+
     def _get_url_param(self, key: str) -> Optional[str]:
         value = self.request.GET.get(key, "").strip()
         return value or None
@@ -45,3 +50,6 @@ class PipelineBase:
             if key in ViewerConstants.CURSOR_KEYS
         ]
         return "&".join(queryparams_list)
+
+    def get_page_cursor(self) -> Optional[str]:
+        return self._get_url_param(ViewerConstants.KEY_PAGE_CURSOR)
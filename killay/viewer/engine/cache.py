@@ -0,0 +1,129 @@
+import hashlib
+import time
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+from killay.admin.lib.constants import SiteConfigurationConstants
+from killay.admin.utils import get_cache_generation
+from killay.archives.services import get_access_generation
+from killay.viewer.engine.dependencies import get_dependency_versions
+from killay.viewer.lib.constants import PageCacheConstants
+
+
+def is_cacheable_request(request: HttpRequest) -> bool:
+    # authenticated users see their own menu, pending messages must be shown
+    user = getattr(request, "user", None)
+    return (
+        bool(settings.VIEWER_PAGE_CACHE_TIMEOUT)
+        and request.method in ["GET", "HEAD"]
+        and user is not None
+        and not user.is_authenticated
+        and not len(messages.get_messages(request))
+    )
+
+
+def is_cacheable_response(response: HttpResponse) -> bool:
+    return response.status_code == 200 and not response.cookies
+
+
+def get_page_generation() -> str:
+    # content changes only invalidate the pages that depend on them, while
+    # the configuration and the access of the places affect every page
+    config_generation = get_cache_generation(
+        key=SiteConfigurationConstants.GENERATION_KEY
+    )
+    return f"{get_access_generation()}-{config_generation}"
+
+
+def get_page_variant(request: HttpRequest) -> Tuple:
+    # what tells apart two renders of the same view for anonymous visitors
+    params = sorted(
+        (key, value.strip())
+        for key, value in request.GET.items()
+        if key in PageCacheConstants.QUERY_KEYS and value.strip()
+    )
+    place = getattr(request, "place", None)
+    language = getattr(request, "LANGUAGE_CODE", settings.LANGUAGE_CODE)
+    return request.path, params, place.id if place else None, language
+
+
+def get_page_cache_key(request: HttpRequest) -> str:
+    raw_key = repr(get_page_variant(request=request))
+    return PageCacheConstants.KEY.format(
+        generation=get_page_generation(),
+        digest=hashlib.md5(raw_key.encode()).hexdigest(),
+    )
+
+
+def get_cached_page(key: str) -> Optional[HttpResponse]:
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    response, versions = entry
+    if versions and cache.get_many(versions.keys()) != versions:
+        return None
+    return response
+
+
+def set_cached_page(
+    key: str, response: HttpResponse, dependencies: Iterable[str] = ()
+) -> None:
+    versions = get_dependency_versions(keys=dependencies)
+    cache.set(key, (response, versions), timeout=settings.VIEWER_PAGE_CACHE_TIMEOUT)
+
+
+def _incr(key: str, delta: int) -> None:
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=None)
+
+
+def record_page_cache(response: HttpResponse, status: str, start: float) -> None:
+    duration = time.perf_counter() - start
+    response[PageCacheConstants.HEADER] = status
+    response["Server-Timing"] = f'page-cache;desc="{status}";dur={duration * 1000:.1f}'
+    _incr(PageCacheConstants.STATS_COUNT_KEY.format(status=status), 1)
+    _incr(
+        PageCacheConstants.STATS_TIME_KEY.format(status=status),
+        int(duration * 1_000_000),
+    )
+
+
+def get_page_cache_stats() -> Dict:
+    stats = {}
+    for status in [PageCacheConstants.STATUS_HIT, PageCacheConstants.STATUS_MISS]:
+        count = cache.get(PageCacheConstants.STATS_COUNT_KEY.format(status=status), 0)
+        total_time = cache.get(
+            PageCacheConstants.STATS_TIME_KEY.format(status=status), 0
+        )
+        stats[status] = {
+            "count": count,
+            "mean_ms": (total_time / count / 1000) if count else 0,
+        }
+    hits = stats[PageCacheConstants.STATUS_HIT]["count"]
+    total = hits + stats[PageCacheConstants.STATUS_MISS]["count"]
+    stats["hit_ratio"] = hits / total if total else 0
+    return stats
+
+
+def reset_page_cache_stats() -> None:
+    cache.delete_many(
+        [
+            key.format(status=status)
+            for key in [
+                PageCacheConstants.STATS_COUNT_KEY,
+                PageCacheConstants.STATS_TIME_KEY,
+            ]
+            for status in [
+                PageCacheConstants.STATUS_HIT,
+                PageCacheConstants.STATUS_MISS,
+            ]
+        ]
+    )
@@ -0,0 +1,67 @@
+import hashlib
+
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+
+from django.contrib import messages
+from django.http import HttpRequest, HttpResponse
+from django.utils.http import http_date, quote_etag
+
+from killay.viewer.engine.cache import get_page_generation, get_page_variant
+from killay.viewer.engine.dependencies import get_dependency_versions
+
+
+class PageValidators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def is_validated_request(request: HttpRequest) -> bool:
+    # same audience as the page cache, the validators know nothing of the user
+    user = getattr(request, "user", None)
+    return (
+        request.method in ["GET", "HEAD"]
+        and user is not None
+        and not user.is_authenticated
+        and not len(messages.get_messages(request))
+    )
+
+
+def is_conditional_request(request: HttpRequest) -> bool:
+    # only the ETag is compared, a date alone never answers 304
+    return is_validated_request(request=request) and bool(
+        request.headers.get("If-None-Match")
+    )
+
+
+def get_page_validators(
+    request: HttpRequest,
+    last_modified: Optional[datetime] = None,
+    dependencies: Iterable[str] = (),
+) -> PageValidators:
+    """
+    Builds the validators of a page from the latest update of its rows, the
+    versions of the instances it depends on and the generation of the
+    configuration and the access of the places.
+    """
+    versions = get_dependency_versions(keys=dependencies)
+    raw_etag = repr(
+        (
+            *get_page_variant(request=request),
+            get_page_generation(),
+            last_modified.isoformat() if last_modified else None,
+            sorted(versions.items()),
+        )
+    )
+    return PageValidators(
+        etag=quote_etag(hashlib.md5(raw_etag.encode()).hexdigest()),
+        last_modified=last_modified,
+    )
+
+
+def set_page_validators(response: HttpResponse, validators: PageValidators) -> None:
+    if response.status_code not in [200, 304]:
+        return
+    response["ETag"] = validators.etag
+    if validators.last_modified:
+        response["Last-Modified"] = http_date(validators.last_modified.timestamp())
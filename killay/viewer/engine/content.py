@@ -1,47 +1,88 @@
-from typing import Dict
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
 
+from django.core.files.storage import default_storage
 from django.urls import reverse
 from django.templatetags.static import static
 
-from killay.archives.lib.constants import PieceConstants
-from killay.viewer.lib.constants import ContentConstants, ViewerPatternConstants
+from killay.archives.lib.constants import PieceConstants, SuggestConstants
+from killay.archives.models import Category, Collection, Keyword, Person
+from killay.archives.thumbnails import get_srcsets
+from killay.viewer.engine.media import get_media_srcsets, get_media_url
+from killay.viewer.lib.constants import (
+    ContentConstants,
+    MediaConstants,
+    ViewerMessageConstants,
+    ViewerPatternConstants,
+)
 
 
 class ContentSerializer:
     def _serialize_archives(self, archives):
-        archive_list = []
-        for archive in archives:
-            archive_data = self._serialize_archive(archive=archive)
-            archive_list.append(archive_data)
-        return archive_list
+        """
+        Serializes the archives with their visible collections, read with one
+        query for all the archives and grouped in memory.
+        """
+        archive_rows = list(archives.values(*ContentConstants.ARCHIVE_FIELDS))
+        collections = self.get_collections_by_archive_ids(
+            archive_ids=[archive["id"] for archive in archive_rows]
+        )
+        collections_by_archive = defaultdict(list)
+        for collection in collections.values(*ContentConstants.COLLECTION_FIELDS):
+            collections_by_archive[collection["archive_id"]].append(collection)
+        return [
+            self._serialize_archive_row(
+                archive=archive, collections=collections_by_archive[archive["id"]]
+            )
+            for archive in archive_rows
+        ]
 
     def _serialize_archive(self, archive):
-        pattern = ViewerPatternConstants.pattern_by_name(
-            name=ViewerPatternConstants.ARCHIVE_DETAIL
-        )
-        default_image = static("images/default-background.svg")
-        archive_data = {
-            **archive.__dict__,
-            "image": archive.image.url if archive.image else default_image,
-            "link": reverse(pattern, kwargs={"slug": archive.slug}),
+        archive_row = {
+            field: getattr(archive, field) for field in ContentConstants.ARCHIVE_FIELDS
         }
+        archive_row["image"] = archive.image.name
         collections = self.get_collections_by_archive_id(archive_id=archive.id)
-        archive_data["collections"] = self._serialize_collections(
-            collections=collections,
+        return self._serialize_archive_row(
+            archive=archive_row,
+            collections=collections.values(*ContentConstants.COLLECTION_FIELDS),
         )
-        return archive_data
 
-    def _serialize_collections(self, collections):
-        link_template = "{base_url}?archive={archive_slug}&collection={slug}"
-        default_image = static("images/default-background.svg")
-        collections_data = self._serialize_categorization(
-            instances=collections,
-            link_template=link_template,
-            link_fields=["archive_slug", "slug"],
+    @staticmethod
+    def _get_image_url(name: Optional[str]) -> str:
+        if not name:
+            return static("images/default-background.svg")
+        return default_storage.url(name)
+
+    def _serialize_archive_row(self, archive: Dict, collections: Iterable[Dict]):
+        pattern = ViewerPatternConstants.pattern_by_name(
+            name=ViewerPatternConstants.ARCHIVE_DETAIL
         )
-        for data in collections_data["items"]:
-            data["image"] = data["image"] or default_image
-        return collections_data
+        return {
+            **archive,
+            "image": self._get_image_url(name=archive["image"]),
+            "image_srcsets": get_srcsets(name=archive["image"]),
+            "link": reverse(pattern, kwargs={"slug": archive["slug"]}),
+            "collections": self._serialize_collection_rows(collections=collections),
+        }
+
+    def _serialize_collection_rows(self, collections: Iterable[Dict]) -> Dict:
+        base_url = self._get_piece_list_base_url()
+        items = [
+            {
+                **collection,
+                "archive_slug": collection["archive__slug"],
+                "image": self._get_image_url(name=collection["image"]),
+                "image_srcsets": get_srcsets(name=collection["image"]),
+                "link": (
+                    f"{base_url}?archive={collection['archive__slug']}"
+                    f"&collection={collection['slug']}"
+                ),
+            }
+            for collection in collections
+        ]
+        label = Collection._meta.verbose_name_plural.capitalize() if items else None
+        return {"total": len(items), "items": items, "label": label}
 
     def _serialize_collection(self, collection):
         collection_data = collection.__dict__
@@ -52,14 +93,17 @@ class ContentSerializer:
     def _get_categorization(self, piece) -> Dict:
         categorization = {}
         categories = piece.categories.all()
+        self._track(model=Category, ids=[category.id for category in categories])
         if categories:
             categorization["categories"] = self._serialize_categories(
                 categories=categories
             )
         people = piece.people.all()
+        self._track(model=Person, ids=[person.id for person in people])
         if people:
             categorization["people"] = self._serialize_people(people=people)
         keywords = piece.keywords.all()
+        self._track(model=Keyword, ids=[keyword.id for keyword in keywords])
         if keywords:
             categorization["keywords"] = self._serialize_keywords(keywords=keywords)
         return categorization
@@ -71,6 +115,7 @@ class ContentSerializer:
             instance_data = instance.__dict__
             if "image" in instance_data:
                 instance_data["image"] = instance.image.url if instance.image else None
+                instance_data["image_srcsets"] = get_srcsets(name=instance.image.name)
             kwargs = {field: getattr(instance, field) for field in link_fields}
             instance_data["link"] = link_template.format(base_url=base_url, **kwargs)
             instances_data.append(instance_data)
@@ -128,6 +173,54 @@ class ContentSerializer:
             sequences.append(sequence_data)
         return sequences
 
+    def _serialize_sequence_hits(self, hits):
+        sequence_hits = []
+        for hit in hits:
+            order, ini_sec, end_sec = hit["order"], hit["ini_sec"], hit["end_sec"]
+            minutes, seconds = divmod(ini_sec, 60)
+            hours, minutes = divmod(minutes, 60)
+            time = f"{hours:02}:{minutes:02}:{seconds:02}"
+            sequence_hits.append(
+                {
+                    "id": f"sequence-{order}-{ini_sec}-{end_sec}",
+                    "order": order,
+                    "time": time,
+                    "label": ViewerMessageConstants.SEQUENCE_MATCHED_AT.format(
+                        time=time
+                    ),
+                }
+            )
+        return sequence_hits
+
+    def _get_suggestion_url(self, entry) -> str:
+        base_url = self._get_piece_list_base_url()
+        if entry.kind == SuggestConstants.KIND_PIECE:
+            pattern = ViewerPatternConstants.pattern_by_name(
+                name=ViewerPatternConstants.PIECE_DETAIL
+            )
+            return reverse(pattern, kwargs={"slug": entry.slug})
+        if entry.kind == SuggestConstants.KIND_PERSON:
+            return f"{base_url}?person={entry.slug}"
+        if entry.kind == SuggestConstants.KIND_KEYWORD:
+            return f"{base_url}?keyword={entry.slug}"
+        if entry.parent_slug:
+            return f"{base_url}?collection={entry.parent_slug}&category={entry.slug}"
+        return f"{base_url}?category={entry.slug}"
+
+    def _serialize_suggestions(self, suggestions):
+        # grouped as the category results of the semantic ui search module
+        return {
+            kind: {
+                "name": ViewerMessageConstants.SUGGEST_LABELS[kind],
+                "results": [
+                    {"title": entry.label, "url": self._get_suggestion_url(entry)}
+                    for entry in entries
+                ],
+            }
+            for kind, entries in suggestions.items()
+            if entries
+        }
+
     def _serialize_field(self, instance, field):
         return {
             "value": getattr(instance, field),
@@ -160,11 +253,16 @@ class ContentSerializer:
         provider_data = {"active": True}
         if piece.kind == PieceConstants.KIND_VIDEO:
             provider_data["player_url"] = provider.video_url_for_plyr
-        elif piece.kind == PieceConstants.KIND_IMAGE:
-            provider_data["image"] = provider.image
-        elif piece.kind in [
-            PieceConstants.KIND_SOUND,
-            PieceConstants.KIND_DOCUMENT,
-        ]:
-            provider_data["file"] = provider.file
+        media_field = MediaConstants.FIELD_BY_KIND.get(piece.kind)
+        if media_field:
+            # the files are served after checking the access to the piece
+            provider_data["url"] = get_media_url(
+                piece_code=piece.code, field=media_field
+            )
+        if media_field == MediaConstants.FIELD_IMAGE:
+            provider_data["srcsets"] = get_media_srcsets(
+                piece_code=piece.code,
+                name=provider.image.name,
+                storage=provider.image.storage,
+            )
         return provider_data
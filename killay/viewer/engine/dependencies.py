@@ -0,0 +1,53 @@
+import time
+
+from typing import Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+from django.http import HttpRequest
+
+from killay.admin.utils import bump_cache_generation
+from killay.viewer.lib.constants import PageCacheConstants
+
+
+def get_dependency_keys(model, ids: Optional[Iterable] = None) -> List[str]:
+    """
+    Returns the keys of the instances of the model, or the key of the whole
+    model when no ids are given, for the pages that list an unknown set.
+    """
+    model_name = model._meta.label_lower
+    ids = [PageCacheConstants.ANY_ID] if ids is None else ids
+    return [
+        PageCacheConstants.DEPENDENCY_KEY.format(model=model_name, id=instance_id)
+        for instance_id in ids
+    ]
+
+
+def start_tracking(request: HttpRequest) -> None:
+    request.page_dependencies = set()
+
+
+def track_dependencies(
+    request: HttpRequest, model, ids: Optional[Iterable] = None
+) -> None:
+    dependencies = getattr(request, "page_dependencies", None)
+    if dependencies is not None:
+        dependencies.update(get_dependency_keys(model=model, ids=ids))
+
+
+def get_dependency_versions(keys: Iterable[str]) -> Dict[str, int]:
+    keys = list(keys)
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # like the cache generations, a missing version starts from the current
+        # time so it never matches a version stored before an eviction
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+        versions.update(cache.get_many(missing))
+    return versions
+
+
+def purge_dependencies(model, ids: Optional[Iterable] = None) -> None:
+    for key in get_dependency_keys(model=model, ids=ids):
+        bump_cache_generation(key=key)
@@ -0,0 +1,302 @@
+import gzip
+import hashlib
+import json
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.db.models import Count, Max
+from django.http import HttpRequest
+from django.test import Client, RequestFactory
+from django.urls import resolve, reverse
+
+from killay.admin.middleware import SiteConfigurationMiddleware
+from killay.admin.models import Logo, SiteConfiguration, SocialMedia
+from killay.archives.lib.constants import PieceConstants
+from killay.archives.models import (
+    Archive,
+    Category,
+    Collection,
+    Keyword,
+    Person,
+    Piece,
+    Provider,
+    Sequence,
+)
+from killay.archives.services import (
+    get_public_archives,
+    get_public_collections,
+    get_public_pieces,
+)
+from killay.pages.models import Page
+from killay.pages.services import get_public_page_slugs
+from killay.viewer.lib.constants import (
+    ExportConstants,
+    ViewerConstants,
+    ViewerPatternConstants,
+)
+from killay.viewer.models import RelatedPiece, TrendingPiece, Viewer
+
+# rows the validators of the pages do not cover, like those of the menus
+TIMESTAMPED_MODELS = [Archive, Collection, Category, Person, Keyword, Sequence, Page]
+UNTIMESTAMPED_MODELS = [SiteConfiguration, Viewer, SocialMedia, Logo, Provider]
+# fields no page shows, like the results of check_providers
+UNRENDERED_FIELDS = {Provider: ["online", "checked_at"]}
+
+
+def _reverse(name: str, **kwargs) -> str:
+    return reverse(ViewerPatternConstants.pattern_by_name(name=name), kwargs=kwargs)
+
+
+def get_filter_params() -> List[Dict[str, str]]:
+    """
+    Returns the query params of each filter of the piece list, the categories
+    are only found inside their collection.
+    """
+    collections = get_public_collections()
+    categories = Category.objects_in_site.filter(collection__in=collections)
+    return [
+        *(
+            {ViewerConstants.KEY_ARCHIVE: slug}
+            for slug in get_public_archives().values_list("slug", flat=True)
+        ),
+        *(
+            {ViewerConstants.KEY_COLLECTION: slug}
+            for slug in collections.values_list("slug", flat=True)
+        ),
+        *(
+            {
+                ViewerConstants.KEY_COLLECTION: collection_slug,
+                ViewerConstants.KEY_CATEGORY: slug,
+            }
+            for collection_slug, slug in categories.values_list(
+                "collection__slug", "slug"
+            )
+        ),
+        *(
+            {ViewerConstants.KEY_PERSON: slug}
+            for slug in Person.objects_in_site.values_list("slug", flat=True)
+        ),
+        *(
+            {ViewerConstants.KEY_KEYWORD: slug}
+            for slug in Keyword.objects_in_site.values_list("slug", flat=True)
+        ),
+        *({ViewerConstants.KEY_KIND: kind} for kind, _ in PieceConstants.KIND_CHOICES),
+    ]
+
+
+def get_piece_list_urls(depth: int) -> List[str]:
+    base_url = _reverse(name=ViewerPatternConstants.PIECE_LIST)
+    filter_params = get_filter_params()
+    urls = [base_url]
+    for size in range(1, depth + 1):
+        for combination in combinations(filter_params, size):
+            params = {}
+            for filter_param in combination:
+                params.update(filter_param)
+            # two values of the same filter can not be combined
+            if len(params) < sum(len(filter_param) for filter_param in combination):
+                continue
+            urls.append(f"{base_url}?{urlencode(sorted(params.items()))}")
+    return urls
+
+
+def get_export_urls(depth: int = ExportConstants.DEFAULT_DEPTH) -> List[str]:
+    """
+    Returns the urls of the viewer an anonymous visitor without place can
+    browse, the piece list with every combination of up to depth filters.
+    """
+    archive_slugs = get_public_archives().values_list("slug", flat=True)
+    piece_codes = get_public_pieces().values_list("code", flat=True)
+    return [
+        _reverse(name=ViewerPatternConstants.ROOT),
+        _reverse(name=ViewerPatternConstants.ARCHIVE_LIST),
+        *(
+            _reverse(name=ViewerPatternConstants.ARCHIVE_DETAIL, slug=slug)
+            for slug in archive_slugs
+        ),
+        *get_piece_list_urls(depth=depth),
+        *(
+            _reverse(name=ViewerPatternConstants.PIECE_DETAIL, slug=code)
+            for code in piece_codes.iterator(chunk_size=ExportConstants.BATCH_SIZE)
+        ),
+        *(
+            reverse("pages:detail", kwargs={"slug": slug})
+            for slug in get_public_page_slugs()
+        ),
+    ]
+
+
+def get_file_name(url: str) -> str:
+    # a static host can not tell apart query strings, they go in the name
+    path, _, query = url.partition("?")
+    name = ExportConstants.INDEX_NAME
+    if query:
+        name = f"{name}{ExportConstants.QUERY_SEPARATOR}{query}"
+    return os.path.join(path.strip("/"), f"{name}{ExportConstants.EXTENSION}")
+
+
+def get_site_fingerprint() -> str:
+    """
+    Sums up the rows shared by every page. The counts catch the deleted rows
+    and the rows without update dates are hashed whole.
+    """
+    summary = [
+        (
+            model._meta.label_lower,
+            *model.objects.aggregate(
+                total=Count("id"), last=Max("updated_at")
+            ).values(),
+        )
+        for model in TIMESTAMPED_MODELS
+    ]
+    for model in UNTIMESTAMPED_MODELS:
+        fields = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if field.name not in UNRENDERED_FIELDS.get(model, [])
+        ]
+        rows = model.objects.order_by("id").values(*fields)
+        summary.append((model._meta.label_lower, list(rows)))
+    summary.append(Piece.objects.count())
+    summary.append(list(TrendingPiece.objects.values_list("archive_id", "piece_id")))
+    summary.append(
+        list(RelatedPiece.objects.values_list("piece_id", "related_piece_id"))
+    )
+    return hashlib.md5(repr(summary).encode()).hexdigest()
+
+
+def _get_anonymous_request(url: str, host: str) -> HttpRequest:
+    request = RequestFactory().get(url, HTTP_HOST=host, REMOTE_ADDR="")
+    request.user = AnonymousUser()
+    SiteConfigurationMiddleware(get_response=lambda request: None)(request)
+    request.resolver_match = resolve(request.path)
+    return request
+
+
+def get_last_modified(url: str, host: str) -> Optional[str]:
+    """
+    Returns the date of the latest change of the rows of the page, from the
+    validators of its view, without building the content.
+    """
+    request = _get_anonymous_request(url=url, host=host)
+    view_class = getattr(request.resolver_match.func, "view_class", None)
+    if not hasattr(view_class, "get_page_validators"):
+        return None
+    view = view_class()
+    view.setup(request, *request.resolver_match.args, **request.resolver_match.kwargs)
+    validators = view.get_page_validators()
+    if not validators or not validators.last_modified:
+        return None
+    # http dates drop the microseconds, two changes in a second must differ
+    return validators.last_modified.isoformat()
+
+
+def export_page(url: str, output_dir: str, host: str) -> Dict:
+    client = Client(raise_request_exception=False, HTTP_HOST=host, REMOTE_ADDR="")
+    response = client.get(url)
+    entry = {"status": response.status_code}
+    if response.status_code in ExportConstants.REDIRECT_STATUSES:
+        entry["redirect"] = response["Location"]
+        return entry
+    if response.status_code != 200:
+        return entry
+    file_name = get_file_name(url=url)
+    path = os.path.join(output_dir, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as html_file:
+        html_file.write(response.content)
+    # a fixed mtime keeps the same bytes for the same page
+    with open(f"{path}{ExportConstants.GZIP_EXTENSION}", "wb") as gzip_file:
+        gzip_file.write(gzip.compress(response.content, mtime=0))
+    entry["file"] = file_name
+    entry["digest"] = hashlib.sha256(response.content).hexdigest()
+    return entry
+
+
+def read_manifest(output_dir: str) -> Dict:
+    path = os.path.join(output_dir, ExportConstants.MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def _write_manifest(output_dir: str, manifest: Dict) -> None:
+    path = os.path.join(output_dir, ExportConstants.MANIFEST_NAME)
+    with open(path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+
+def _remove_page(output_dir: str, entry: Dict) -> None:
+    if not entry.get("file"):
+        return
+    path = os.path.join(output_dir, entry["file"])
+    for file_path in [path, f"{path}{ExportConstants.GZIP_EXTENSION}"]:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def export_site(
+    output_dir: str,
+    host: str,
+    depth: int = ExportConstants.DEFAULT_DEPTH,
+    workers: int = 1,
+    full: bool = False,
+) -> Dict[str, List[str]]:
+    """
+    Renders the public pages of the viewer into the output directory with a
+    manifest of their files and redirects. A page is rendered again only when
+    the rows shared by every page or its own rows changed since the manifest
+    was written, or when full is given.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = read_manifest(output_dir=output_dir)
+    fingerprint = get_site_fingerprint()
+    previous_pages = manifest.get("pages", {})
+    reusable_pages = (
+        {} if full or manifest.get("fingerprint") != fingerprint else previous_pages
+    )
+
+    def export(url: str):
+        last_modified = get_last_modified(url=url, host=host)
+        entry = reusable_pages.get(url)
+        if last_modified and entry and entry.get("last_modified") == last_modified:
+            return entry, False
+        entry = export_page(url=url, output_dir=output_dir, host=host)
+        entry["last_modified"] = last_modified
+        return entry, True
+
+    def export_in_thread(url: str):
+        try:
+            return export(url=url)
+        finally:
+            connections.close_all()
+
+    urls = list(dict.fromkeys(get_export_urls(depth=depth)))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(export_in_thread, urls))
+    else:
+        results = [export(url=url) for url in urls]
+    pages = {}
+    report = {"exported": [], "skipped": [], "failed": [], "removed": []}
+    for url, (entry, is_exported) in zip(urls, results):
+        if entry["status"] not in [200, *ExportConstants.REDIRECT_STATUSES]:
+            report["failed"].append(url)
+            continue
+        pages[url] = entry
+        report["exported" if is_exported else "skipped"].append(url)
+    for url, entry in previous_pages.items():
+        if url not in pages:
+            _remove_page(output_dir=output_dir, entry=entry)
+            report["removed"].append(url)
+    _write_manifest(
+        output_dir=output_dir, manifest={"fingerprint": fingerprint, "pages": pages}
+    )
+    return report
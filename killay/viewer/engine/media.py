@@ -0,0 +1,166 @@
+import hashlib
+import mimetypes
+import re
+
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import Storage
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from killay.archives.lib.constants import ThumbnailConstants
+from killay.archives.thumbnails import are_thumbnails_ready
+from killay.viewer.lib.constants import MediaConstants, ViewerPatternConstants
+
+
+def get_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Returns the first and last byte of a single range like ``bytes=0-99``,
+    ``bytes=100-`` or ``bytes=-100``. The malformed headers and the lists of
+    ranges are ignored with None, so the whole file is sent, and a range out
+    of the file raises ValueError.
+    """
+    match = re.match(MediaConstants.RANGE_PATTERN, header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # a suffix range, the last bytes of the file
+        length = int(last)
+        if not length or not size:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first >= size or first > last:
+        raise ValueError(header)
+    return first, last
+
+
+def iter_file(
+    file: IO, start: int, length: int, chunk_size: int = MediaConstants.CHUNK_SIZE
+) -> Iterator[bytes]:
+    # only one chunk is held in memory, the file closes with the response
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def _get_accel_response(name: str, content_type: str) -> HttpResponse:
+    # the web server reads the file and answers the ranges itself
+    response = HttpResponse(content_type=content_type)
+    path = f"{settings.VIEWER_MEDIA_ACCEL_PREFIX}{quote(name)}"
+    response[settings.VIEWER_MEDIA_ACCEL_HEADER] = path
+    return response
+
+
+def get_media_url(
+    piece_code: str,
+    field: str,
+    width: Optional[int] = None,
+    image_format: Optional[str] = None,
+) -> str:
+    if width:
+        name = ViewerPatternConstants.PIECE_MEDIA_THUMBNAIL
+        kwargs = {"width": width, "image_format": image_format}
+    else:
+        name = ViewerPatternConstants.PIECE_MEDIA
+        kwargs = {}
+    pattern = ViewerPatternConstants.pattern_by_name(name=name)
+    return reverse(pattern, kwargs={"slug": piece_code, "field": field, **kwargs})
+
+
+def get_media_srcsets(
+    piece_code: str, name: str, storage: Storage
+) -> Optional[Dict[str, str]]:
+    # the thumbnails of the image of a piece, behind the same access check
+    if not name or not are_thumbnails_ready(name=name, storage=storage):
+        return None
+    return {
+        image_format: ", ".join(
+            f"{get_media_url(piece_code, MediaConstants.FIELD_IMAGE, width, image_format)}"
+            f" {width}w"
+            for width in ThumbnailConstants.WIDTHS
+        )
+        for image_format in ThumbnailConstants.FORMATS
+    }
+
+
+def get_media_response(
+    request: HttpRequest, storage: Storage, name: str
+) -> HttpResponse:
+    """
+    Answers with a file of the storage, handed to the web server when a prefix
+    for its internal location is configured, else streamed by chunks with
+    support for a single range so the players can seek.
+    """
+    content_type = mimetypes.guess_type(name)[0] or MediaConstants.DEFAULT_CONTENT_TYPE
+    if settings.VIEWER_MEDIA_ACCEL_PREFIX:
+        response = _get_accel_response(name=name, content_type=content_type)
+        response["Cache-Control"] = MediaConstants.CACHE_CONTROL
+        return response
+    size = storage.size(name)
+    last_modified = int(storage.get_modified_time(name).timestamp())
+    etag = quote_etag(
+        hashlib.md5(f"{name}:{size}:{last_modified}".encode()).hexdigest()
+    )
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _get_stream_response(
+            request=request,
+            storage=storage,
+            name=name,
+            size=size,
+            content_type=content_type,
+            validators=[etag, http_date(last_modified)],
+        )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = MediaConstants.CACHE_CONTROL
+    return response
+
+
+def _get_stream_response(
+    request: HttpRequest,
+    storage: Storage,
+    name: str,
+    size: int,
+    content_type: str,
+    validators: List[str],
+) -> HttpResponse:
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    # a range of an older version of the file would mix two files
+    if range_header and if_range and if_range not in validators:
+        range_header = None
+    try:
+        byte_range = (
+            get_byte_range(header=range_header, size=size) if range_header else None
+        )
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    response = StreamingHttpResponse(
+        iter_file(file=storage.open(name, "rb"), start=start, length=length),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    response["Content-Length"] = str(length)
+    if byte_range:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
@@ -2,6 +2,7 @@ from typing import Dict, List
 
 from django.urls import reverse
 
+from killay.archives.models import Category
 from killay.archives.services import (
     get_public_archives,
     get_public_archive_by_slug,
@@ -62,6 +63,7 @@ class MenuBase(PipelineBase):
     def _get_category_links(self, categories, selected_category=None):
         base_url = self._get_piece_list_base_url()
         category_links = []
+        self._track(model=Category)
         for category in categories:
             collection = (
                 f"&collection={category.collection.slug}" if category.collection else ""
@@ -131,15 +133,13 @@ class MenuOneArchiveBase:
         main_menu = self._get_initial_main_menu()
         archive = get_public_archive_by_slug(
             slug=self.viewer.scope_archive.slug,
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
         )
         if not archive:
             return main_menu
         collections = get_public_collections_by_archive_id(
             archive_id=archive.id,
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
         )
         archive_page_links = self._get_archive_page_links(archive_id=archive.id)
         main_menu.extend(archive_page_links)
@@ -172,8 +172,7 @@ class MenuOneCollectionBase:
         main_menu = self._get_initial_main_menu()
         collection = get_public_collection_by_slug(
             slug=self.viewer.scope_collection.slug,
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
             archive_id=self.viewer.scope_collection.archive_id,
         )
         if not collection:
@@ -198,8 +197,7 @@ class MenuAllBase:
         assert self.viewer.scope == ViewerConstants.SCOPE_ALL
         main_menu = self._get_initial_main_menu()
         archives = get_public_archives(
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
         )
         selected_archive = self.cursor.get("archive")
         archive_links = self._get_archive_links(
@@ -216,8 +214,7 @@ class MenuAllBase:
         if selected_archive:
             collections = get_public_collections_by_archive_id(
                 archive_id=selected_archive.id,
-                place=self.place,
-                is_superuser=self.user.is_superuser,
+                access=self.access,
             )
             collection_links = self._get_collection_links(
                 collections=collections,
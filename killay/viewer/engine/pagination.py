@@ -0,0 +1,143 @@
+import hashlib
+
+from typing import List, Optional, Tuple
+
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Q, QuerySet
+
+from killay.viewer.lib.constants import PaginationConstants
+
+
+def encode_cursor(values: List, direction: str) -> str:
+    return signing.dumps(
+        [direction, *values], salt=PaginationConstants.CURSOR_SALT, compress=True
+    )
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, List]]:
+    if not cursor:
+        return None
+    try:
+        direction, *values = signing.loads(cursor, salt=PaginationConstants.CURSOR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    directions = [
+        PaginationConstants.DIRECTION_NEXT,
+        PaginationConstants.DIRECTION_PREVIOUS,
+    ]
+    if direction not in directions:
+        return None
+    if len(values) != len(PaginationConstants.KEYSET_FIELDS):
+        return None
+    return direction, values
+
+
+def _get_seek_q(values: List, lookup: str) -> Q:
+    """
+    Expands the row comparison (title, code, id) > (t, c, i) into the
+    equivalent OR of prefixes, so each branch can use the keyset index.
+    """
+    fields = PaginationConstants.KEYSET_FIELDS
+    seek_q = Q()
+    for index, field in enumerate(fields):
+        equals = dict(zip(fields[:index], values[:index]))
+        seek_q |= Q(**equals, **{f"{field}__{lookup}": values[index]})
+    return seek_q
+
+
+def get_cached_count(queryset: QuerySet, generation: str) -> int:
+    """
+    Returns the number of rows of the queryset, kept in the cache by its query
+    and the generation of its content, so the pages of a list seeking with a
+    cursor do not count the same rows on each page.
+    """
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(repr((sql, params)).encode()).hexdigest()
+    key = PaginationConstants.COUNT_KEY.format(generation=generation, digest=digest)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=PaginationConstants.COUNT_TIMEOUT)
+    return count
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        object_list: List,
+        next_cursor: Optional[str] = None,
+        previous_cursor: Optional[str] = None,
+    ):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+def _get_cursor(row, direction: str) -> str:
+    # model instances for the viewer, values() rows for the api
+    values = [
+        row[field] if isinstance(row, dict) else getattr(row, field)
+        for field in PaginationConstants.KEYSET_FIELDS
+    ]
+    return encode_cursor(values=values, direction=direction)
+
+
+def get_keyset_page(
+    queryset: QuerySet, cursor: Optional[str], per_page: int
+) -> KeysetPage:
+    """
+    Returns the page after or before the position of the cursor, seeking on
+    (title, code, id) instead of counting the rows of the previous pages.
+    An invalid cursor returns the first page.
+    """
+    fields = PaginationConstants.KEYSET_FIELDS
+    position = decode_cursor(cursor=cursor)
+    has_previous = has_next = False
+    if position is None:
+        rows = list(queryset.order_by(*fields)[: per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+    elif position[0] == PaginationConstants.DIRECTION_NEXT:
+        queryset = queryset.filter(_get_seek_q(values=position[1], lookup="gt"))
+        rows = list(queryset.order_by(*fields)[: per_page + 1])
+        has_previous = True
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+    else:
+        queryset = queryset.filter(_get_seek_q(values=position[1], lookup="lt"))
+        descending = [f"-{field}" for field in fields]
+        rows = list(queryset.order_by(*descending)[: per_page + 1])
+        has_next = True
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+    if not rows:
+        return KeysetPage(object_list=[])
+    return KeysetPage(
+        object_list=rows,
+        next_cursor=(
+            _get_cursor(rows[-1], PaginationConstants.DIRECTION_NEXT)
+            if has_next
+            else None
+        ),
+        previous_cursor=(
+            _get_cursor(rows[0], PaginationConstants.DIRECTION_PREVIOUS)
+            if has_previous
+            else None
+        ),
+    )
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Dict, List, Optional
 
 from django.contrib import messages
@@ -5,6 +6,17 @@ from django.http import HttpRequest
 from django.urls import reverse
 
 from killay.archives.lib.constants import PieceConstants
+from killay.archives.models import (
+    Category,
+    Keyword,
+    Person,
+    Piece,
+    PieceMeta,
+    Provider,
+    Sequence,
+)
+from killay.archives.search import get_sequence_hits
+from killay.archives.suggest import suggester
 from killay.archives.services import (
     get_archive_filter_options,
     get_collection_filter_options,
@@ -13,16 +25,24 @@ from killay.archives.services import (
     get_keyword_filter_options,
     get_category_by_slug,
     get_keyword_by_slug,
+    get_last_modified,
     get_person_by_slug,
     get_public_archives,
     get_public_archive_by_slug,
     get_public_collection_by_slug,
+    get_public_collections,
     get_public_collections_by_archive_id,
     get_public_piece,
+    get_public_piece_last_modified,
     get_public_pieces,
 )
+from killay.pages.services import get_page_last_modified
+from killay.viewer.models import RelatedPiece, TrendingPiece
+from killay.viewer.services import get_trending_piece_ids
 from killay.viewer.engine.base import PipelineBase
+from killay.viewer.engine.conditional import PageValidators, get_page_validators
 from killay.viewer.engine.content import ContentSerializer
+from killay.viewer.engine.dependencies import get_dependency_keys
 from killay.viewer.engine.menu import (
     MenuBase,
     MenuOneArchiveBase,
@@ -30,6 +50,7 @@ from killay.viewer.engine.menu import (
     MenuAllBase,
 )
 from killay.viewer.lib.constants import (
+    RelatedPieceConstants,
     SiteContextConstants,
     ViewerConstants,
     ViewerMessageConstants,
@@ -124,9 +145,14 @@ class MenuPipeline(
     def get_search(self) -> Dict:
         query_search = self._get_url_param(key=ViewerConstants.KEY_SEARCH)
         base_url = self._get_piece_list_base_url()
+        suggest_pattern = ViewerPatternConstants.pattern_by_name(
+            name=ViewerPatternConstants.SUGGEST
+        )
         return {
             "query": query_search,
             "url": base_url,
+            "suggest_url": reverse(suggest_pattern),
+            "suggest_key": ViewerConstants.KEY_SUGGEST_QUERY,
             "key": ViewerConstants.KEY_SEARCH,
             "placeholder": ViewerMessageConstants.SEARCH_ACTION_NAME,
         }
@@ -157,7 +183,6 @@ class SiteContextPipeline:
 
     def get_site_title(self) -> str:
         viewer = self.request.viewer
-        viewer.refresh_from_db()
         if viewer.scope == ViewerConstants.SCOPE_ONE_ARCHIVE:
             site_title = viewer.scope_archive.name
         elif viewer.scope == ViewerConstants.SCOPE_ONE_COLLECTION:
@@ -180,8 +205,7 @@ class ContentPipeline(ContentSerializer, PipelineBase):
         if self._archives:
             return self._serialize_archives(archives=self._archives)
         self._archives = get_public_archives(
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
         )
         return self._serialize_archives(archives=self._archives)
 
@@ -192,8 +216,7 @@ class ContentPipeline(ContentSerializer, PipelineBase):
         slug = self.request.resolver_match.kwargs.get("slug")
         self._archive_by_slug = get_public_archive_by_slug(
             slug=slug,
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
         )
         return self._serialize_archive(archive=self._archive_by_slug)
 
@@ -216,16 +239,20 @@ class ContentPipeline(ContentSerializer, PipelineBase):
         if archive_slug:
             return get_public_archive_by_slug(
                 slug=archive_slug,
-                place=self.place,
-                is_superuser=self.user.is_superuser,
+                access=self.access,
             )
 
+    def get_collections_by_archive_ids(self, archive_ids: List[int]):
+        assert self.viewer.scope != ViewerConstants.SCOPE_ONE_COLLECTION
+        return get_public_collections(access=self.access).filter(
+            archive_id__in=archive_ids
+        )
+
     def get_collections_by_archive_id(self, archive_id: int):
         assert self.viewer.scope != ViewerConstants.SCOPE_ONE_COLLECTION
         return get_public_collections_by_archive_id(
             archive_id=archive_id,
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
         )
 
     def get_collection(self, archive_id: Optional[int] = None):
@@ -236,8 +263,7 @@ class ContentPipeline(ContentSerializer, PipelineBase):
         if collection_slug:
             return get_public_collection_by_slug(
                 slug=collection_slug,
-                place=self.place,
-                is_superuser=self.user.is_superuser,
+                access=self.access,
                 archive_id=archive_id,
             )
 
@@ -295,16 +321,65 @@ class ContentPipeline(ContentSerializer, PipelineBase):
             "person": person,
             "keyword": keyword,
         }
+        # any piece can join the list, and with a search any matched text too
+        self._track(model=Piece)
+        if query_search:
+            self._track(model=PieceMeta)
+            self._track(model=Sequence)
         return get_public_pieces(
             archive=archive,
             collection=collection,
             categorization=categorization,
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
             query_search=query_search,
             kind=kind,
         )
 
+    def get_trending_pieces(self, archive=None) -> List[Piece]:
+        piece_ids = get_trending_piece_ids(
+            place_id=self.access.place_id, archive_id=archive.id if archive else None
+        )
+        self._track(model=TrendingPiece)
+        if not piece_ids:
+            return []
+        pieces = get_public_pieces(access=self.access).filter(id__in=piece_ids)
+        pieces_by_id = {piece.id: piece for piece in pieces}
+        # the ranking is rebuilt on a schedule, hidden pieces are left out
+        trending_pieces = [
+            pieces_by_id[piece_id] for piece_id in piece_ids if piece_id in pieces_by_id
+        ]
+        self.track_pieces(pieces=trending_pieces)
+        return trending_pieces
+
+    def get_related_pieces(self, piece: Piece) -> List[Piece]:
+        # one query on the index of the related pieces, hidden ones left out
+        related_pieces = list(
+            get_public_pieces(access=self.access)
+            .filter(related_to__piece_id=piece.id)
+            .order_by("related_to__position")[: RelatedPieceConstants.LIMIT]
+        )
+        self._track(model=RelatedPiece)
+        self.track_pieces(pieces=related_pieces)
+        return related_pieces
+
+    def track_pieces(self, pieces) -> None:
+        self._track(model=Piece, ids=[piece.id for piece in pieces])
+
+    def set_sequence_hits(self, pieces) -> None:
+        query_search = self.get_query_search()
+        hits = (
+            get_sequence_hits(
+                piece_ids=[piece.id for piece in pieces],
+                query_search=query_search,
+            )
+            if query_search
+            else {}
+        )
+        for piece in pieces:
+            piece.sequence_hits = self._serialize_sequence_hits(
+                hits=hits.get(piece.id, [])
+            )
+
     def get_kind_options(self) -> Dict:
         kind = self.get_kind()
 
@@ -322,7 +397,13 @@ class ContentPipeline(ContentSerializer, PipelineBase):
             "field": ViewerConstants.KEY_KIND,
         }
 
-    def get_filter_options(self, archive=None, collection=None, category=None):
+    def get_filter_options(
+        self, pieces=None, archive=None, collection=None, category=None
+    ):
+        if pieces is None:
+            pieces = self.get_pieces(
+                archive=archive, collection=collection, category=category
+            )
         if category:
             collection = category.collection
             archive = collection.archive
@@ -331,11 +412,13 @@ class ContentPipeline(ContentSerializer, PipelineBase):
             archive_id=archive.id if archive else None
         )
         filter_options = {}
+        for model in [Category, Person, Keyword]:
+            self._track(model=model)
         if self.viewer.scope == ViewerConstants.SCOPE_ALL:
             active_archive_id = archive.id if archive else None
             archive_options = get_archive_filter_options(
-                place=self.place,
-                is_superuser=self.user.is_superuser,
+                pieces=pieces,
+                access=self.access,
                 active_archive_id=active_archive_id,
             )
             label = ViewerMessageConstants.LABEL_ARCHIVES
@@ -354,8 +437,8 @@ class ContentPipeline(ContentSerializer, PipelineBase):
         ]:
             active_collection_id = collection.id if collection else None
             collection_options = get_collection_filter_options(
-                place=self.place,
-                is_superuser=self.user.is_superuser,
+                pieces=pieces,
+                access=self.access,
                 active_collection_id=active_collection_id,
                 archive_id=archive_id,
             )
@@ -371,8 +454,8 @@ class ContentPipeline(ContentSerializer, PipelineBase):
             else None
         )
         category_options = get_category_filter_options(
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            pieces=pieces,
+            access=self.access,
             active_category_id=active_category_id,
             collection_id=collection_id,
             archive_id=archive_id,
@@ -385,8 +468,8 @@ class ContentPipeline(ContentSerializer, PipelineBase):
         person = self.get_person()
         active_person_id = person.id if person else None
         person_options = get_person_filter_options(
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            pieces=pieces,
+            access=self.access,
             active_person_id=active_person_id,
         )
         filter_options[ViewerConstants.KEY_PERSON] = {
@@ -397,8 +480,8 @@ class ContentPipeline(ContentSerializer, PipelineBase):
         keyword = self.get_keyword()
         active_keyword_id = keyword.id if keyword else None
         keyword_options = get_keyword_filter_options(
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            pieces=pieces,
+            access=self.access,
             active_keyword_id=active_keyword_id,
         )
         filter_options[ViewerConstants.KEY_KEYWORD] = {
@@ -408,14 +491,19 @@ class ContentPipeline(ContentSerializer, PipelineBase):
 
         return filter_options
 
+    def get_suggestions(self) -> Dict:
+        query = self._get_url_param(key=ViewerConstants.KEY_SUGGEST_QUERY)
+        suggestions = suggester.suggest(query=query, access=self.access)
+        return {"results": self._serialize_suggestions(suggestions=suggestions)}
+
     def get_piece(self, piece_code: str) -> Optional[Dict]:
         piece = get_public_piece(
             piece_code=piece_code,
-            place=self.place,
-            is_superuser=self.user.is_superuser,
+            access=self.access,
         )
         if not piece:
             return
+        self._track(model=Piece, ids=[piece.id])
         piece_data = piece.__dict__
         piece_data["instance"] = piece
         piece_data["collection"] = self._serialize_collection(
@@ -427,3 +515,70 @@ class ContentPipeline(ContentSerializer, PipelineBase):
         piece_data["provider"] = self._serialize_provider(piece=piece)
         piece_data["meta"] = self._serialize_meta(piece=piece)
         return piece_data
+
+
+class ValidatorPipeline(PipelineBase):
+    """
+    Computes the validators of the pages with aggregate queries, without
+    building their content, so a revalidation can be answered before the
+    content pipelines run.
+    """
+
+    # the menus of every page list the categories
+    base_dependency_models = [Category]
+
+    def _get_validators(
+        self,
+        last_modified: Optional[datetime] = None,
+        models: Optional[List] = None,
+        piece_id: Optional[int] = None,
+    ) -> PageValidators:
+        dependencies = []
+        for model in [*self.base_dependency_models, *(models or [])]:
+            dependencies.extend(get_dependency_keys(model=model))
+        if piece_id:
+            dependencies.extend(get_dependency_keys(model=Piece, ids=[piece_id]))
+        return get_page_validators(
+            request=self.request,
+            last_modified=last_modified,
+            dependencies=dependencies,
+        )
+
+    def get_archive_list_validators(self) -> PageValidators:
+        last_modified = get_last_modified(
+            queryset=get_public_archives(access=self.access),
+            fields=["updated_at", "collections__updated_at"],
+        )
+        # the most viewed pieces are shown with the archives
+        models = [Piece, TrendingPiece]
+        return self._get_validators(last_modified=last_modified, models=models)
+
+    def get_archive_validators(self, slug: str) -> PageValidators:
+        last_modified = get_last_modified(
+            queryset=get_public_archives(access=self.access).filter(slug=slug),
+            fields=["updated_at", "collections__updated_at"],
+        )
+        models = [Piece, TrendingPiece]
+        return self._get_validators(last_modified=last_modified, models=models)
+
+    def get_piece_list_validators(self) -> PageValidators:
+        # the filters, the searches and the cards of any piece of the list, a
+        # date of the whole catalog would scan it and tell nothing of a filter
+        models = [Piece, PieceMeta, Sequence, Provider, Person, Keyword]
+        return self._get_validators(models=models)
+
+    def get_piece_validators(self, piece_code: str) -> Optional[PageValidators]:
+        values = get_public_piece_last_modified(
+            piece_code=piece_code, access=self.access
+        )
+        if not values:
+            return
+        # the related pieces are shown with the piece
+        return self._get_validators(
+            last_modified=values["last_modified"],
+            models=[Person, Keyword, Piece, RelatedPiece],
+            piece_id=values["id"],
+        )
+
+    def get_page_validators(self, slug: str) -> PageValidators:
+        return self._get_validators(last_modified=get_page_last_modified(slug=slug))
@@ -0,0 +1,179 @@
+import os
+import re
+import shutil
+import tempfile
+
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+from xml.sax.saxutils import escape
+
+from django.urls import reverse
+
+from killay.archives.services import (
+    get_public_archives,
+    get_public_collections,
+    get_public_pieces,
+)
+from killay.pages.services import get_public_pages
+from killay.viewer.lib.constants import (
+    SitemapConstants,
+    ViewerConstants,
+    ViewerPatternConstants,
+)
+
+Entry = Tuple[str, Optional[datetime]]
+
+
+def _get_path(name: str, **kwargs) -> str:
+    return reverse(ViewerPatternConstants.pattern_by_name(name=name), kwargs=kwargs)
+
+
+def _format_date(value: datetime) -> str:
+    return value.isoformat(timespec="seconds")
+
+
+def _iter_archives() -> Iterator[Entry]:
+    rows = get_public_archives().order_by("id").values_list("slug", "updated_at")
+    for slug, updated_at in rows.iterator(chunk_size=SitemapConstants.CHUNK_SIZE):
+        yield _get_path(
+            name=ViewerPatternConstants.ARCHIVE_DETAIL, slug=slug
+        ), updated_at
+
+
+def _iter_collections() -> Iterator[Entry]:
+    base_path = _get_path(name=ViewerPatternConstants.PIECE_LIST)
+    rows = get_public_collections().order_by("id").values_list("slug", "updated_at")
+    for slug, updated_at in rows.iterator(chunk_size=SitemapConstants.CHUNK_SIZE):
+        query = urlencode({ViewerConstants.KEY_COLLECTION: slug})
+        yield f"{base_path}?{query}", updated_at
+
+
+def _iter_pieces() -> Iterator[Entry]:
+    rows = get_public_pieces().order_by("id").values_list("code", "updated_at")
+    for code, updated_at in rows.iterator(chunk_size=SitemapConstants.CHUNK_SIZE):
+        yield _get_path(name=ViewerPatternConstants.PIECE_DETAIL, slug=code), updated_at
+
+
+def _iter_pages() -> Iterator[Entry]:
+    for page in get_public_pages():
+        yield reverse("pages:detail", kwargs={"slug": page.slug}), page.updated_at
+
+
+SECTIONS = {
+    SitemapConstants.SECTION_ARCHIVES: _iter_archives,
+    SitemapConstants.SECTION_COLLECTIONS: _iter_collections,
+    SitemapConstants.SECTION_PIECES: _iter_pieces,
+    SitemapConstants.SECTION_PAGES: _iter_pages,
+}
+
+
+class SitemapWriter:
+    """
+    Writes the urls of a section as they come, in files of up to the chunk
+    size, keeping only the open file and the latest date in memory.
+    """
+
+    def __init__(self, directory: str, section: str, base_url: str):
+        self.directory = directory
+        self.section = section
+        self.base_url = base_url
+        self.files: List[Entry] = []
+        self._file = None
+        self._name = None
+        self._total = 0
+        self._last_modified = None
+
+    def add(self, path: str, last_modified: Optional[datetime]) -> None:
+        if self._file is None:
+            self._open()
+        line = f"<url><loc>{escape(self.base_url + path)}</loc>"
+        if last_modified:
+            line += f"<lastmod>{_format_date(last_modified)}</lastmod>"
+            self._last_modified = max(
+                filter(None, [self._last_modified, last_modified])
+            )
+        self._file.write(f"{line}</url>\n")
+        self._total += 1
+        if self._total == SitemapConstants.CHUNK_SIZE:
+            self.close()
+
+    def _open(self) -> None:
+        self._name = SitemapConstants.FILE_NAME.format(
+            section=self.section, number=len(self.files) + 1
+        )
+        self._file = open(os.path.join(self.directory, self._name), "w")
+        self._file.write(SitemapConstants.XML_HEADER)
+        self._file.write(f'<urlset xmlns="{SitemapConstants.NAMESPACE}">\n')
+        self._total = 0
+        self._last_modified = None
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.write("</urlset>\n")
+        self._file.close()
+        _set_last_modified(
+            path=os.path.join(self.directory, self._name),
+            last_modified=self._last_modified,
+        )
+        self.files.append((self._name, self._last_modified))
+        self._file = None
+
+
+def _set_last_modified(path: str, last_modified: Optional[datetime]) -> None:
+    # the file is served with the date of its latest url, not of this run
+    if last_modified:
+        timestamp = last_modified.timestamp()
+        os.utime(path, (timestamp, timestamp))
+
+
+def _write_index(directory: str, base_url: str, files: List[Entry]) -> None:
+    path = os.path.join(directory, SitemapConstants.INDEX_NAME)
+    with open(path, "w") as index_file:
+        index_file.write(SitemapConstants.XML_HEADER)
+        index_file.write(f'<sitemapindex xmlns="{SitemapConstants.NAMESPACE}">\n')
+        for name, last_modified in files:
+            location = base_url + _get_path(
+                name=ViewerPatternConstants.SITEMAP, file_name=name
+            )
+            line = f"<sitemap><loc>{escape(location)}</loc>"
+            if last_modified:
+                line += f"<lastmod>{_format_date(last_modified)}</lastmod>"
+            index_file.write(f"{line}</sitemap>\n")
+        index_file.write("</sitemapindex>\n")
+    dates = [last_modified for _, last_modified in files if last_modified]
+    _set_last_modified(path=path, last_modified=max(dates) if dates else None)
+
+
+def generate_sitemaps(directory: str, base_url: str) -> List[Entry]:
+    """
+    Writes the sitemap files of the public archives, collections, pieces and
+    pages, as seen from no place, and their index. The files are written
+    apart and then moved, so the directory is never served half written.
+    Returns the names and dates of the written sitemaps.
+    """
+    os.makedirs(directory, exist_ok=True)
+    base_url = base_url.rstrip("/")
+    files = []
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(directory)) as temp_dir:
+        for section, iter_entries in SECTIONS.items():
+            writer = SitemapWriter(
+                directory=temp_dir, section=section, base_url=base_url
+            )
+            for path, last_modified in iter_entries():
+                writer.add(path=path, last_modified=last_modified)
+            writer.close()
+            files.extend(writer.files)
+        _write_index(directory=temp_dir, base_url=base_url, files=files)
+        names = {name for name, _ in files}
+        for name in os.listdir(directory):
+            if name not in names and is_sitemap_name(name=name):
+                os.remove(os.path.join(directory, name))
+        for name in [*names, SitemapConstants.INDEX_NAME]:
+            shutil.move(os.path.join(temp_dir, name), os.path.join(directory, name))
+    return files
+
+
+def is_sitemap_name(name: str) -> bool:
+    return bool(re.match(SitemapConstants.FILE_NAME_PATTERN, name))
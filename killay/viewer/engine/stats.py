@@ -0,0 +1,147 @@
+import atexit
+import threading
+import time
+import uuid
+
+from collections import Counter
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpRequest
+
+from killay.viewer.lib.constants import ContentStatsConstants
+from killay.viewer.services import save_content_views
+
+# viewer id, model label, lookup field and value in the url
+ViewKey = Tuple[int, str, str, str]
+
+
+class ViewBuffer:
+    """
+    Views counted by this worker and not yet moved to the shared cache.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.counts = Counter()
+        self.events = 0
+        self.started = time.monotonic()
+
+    def add(self, key: ViewKey) -> bool:
+        """
+        Counts a view and tells if the buffer is due to be flushed.
+        """
+        interval = settings.VIEWER_STATS_FLUSH_INTERVAL
+        events = settings.VIEWER_STATS_FLUSH_EVENTS
+        with self.lock:
+            self.counts[key] += 1
+            self.events += 1
+            return bool(
+                (events and self.events >= events)
+                or (interval and time.monotonic() - self.started >= interval)
+            )
+
+    def drain(self) -> Dict[ViewKey, int]:
+        with self.lock:
+            counts = dict(self.counts)
+            self._reset()
+        return counts
+
+
+view_buffer = ViewBuffer()
+
+
+def count_view(request: HttpRequest, model, field: str, value: str) -> None:
+    """
+    Counts a view of the instance of the model found by the value of the
+    field, without touching the database. The ids are resolved when the
+    views are saved, so pages served from the cache can be counted too.
+    """
+    key = (request.viewer.id, model._meta.label_lower, field, str(value))
+    if view_buffer.add(key=key):
+        spill_views()
+        threading.Thread(target=_flush_in_background, daemon=True).start()
+
+
+def spill_views() -> None:
+    """
+    Moves the views of this worker to a new chunk of the shared cache, where
+    any process can save them.
+    """
+    counts = view_buffer.drain()
+    if not counts:
+        return
+    cache.add(ContentStatsConstants.SEQUENCE_KEY, 0, timeout=None)
+    sequence = cache.incr(ContentStatsConstants.SEQUENCE_KEY)
+    chunk_key = ContentStatsConstants.CHUNK_KEY.format(sequence=sequence)
+    cache.set(chunk_key, counts, timeout=None)
+
+
+def _claim_chunks(flushed: int, sequence: int) -> Tuple[Counter, int]:
+    """
+    Takes the chunks written after the last flush out of the cache and
+    returns their views with the sequence the flush reached. A worker writes
+    its chunk right after taking its sequence, so a missing chunk is waited
+    for in the next flush, unless it is too far behind and was evicted.
+    """
+    chunk_keys = {
+        ContentStatsConstants.CHUNK_KEY.format(sequence=chunk): chunk
+        for chunk in range(flushed + 1, sequence + 1)
+    }
+    chunks = cache.get_many(chunk_keys)
+    cache.delete_many(chunks.keys())
+    counts = Counter()
+    for chunk in chunks.values():
+        counts.update(chunk)
+    reached = flushed
+    for key, chunk in chunk_keys.items():
+        if (
+            key not in chunks
+            and sequence - chunk < ContentStatsConstants.PENDING_CHUNKS
+        ):
+            break
+        reached = chunk
+    return counts, reached
+
+
+def flush_views() -> int:
+    """
+    Saves the views of this worker and the pending chunks of every worker
+    with bulk queries. Returns the number of views saved, or 0 when another
+    process is already flushing.
+    """
+    spill_views()
+    token = uuid.uuid4().hex
+    if not cache.add(
+        ContentStatsConstants.LOCK_KEY,
+        token,
+        timeout=ContentStatsConstants.LOCK_TIMEOUT,
+    ):
+        return 0
+    try:
+        counts, reached = _claim_chunks(
+            flushed=cache.get(ContentStatsConstants.FLUSHED_KEY, 0),
+            sequence=cache.get(ContentStatsConstants.SEQUENCE_KEY, 0),
+        )
+        cache.set(ContentStatsConstants.FLUSHED_KEY, reached, timeout=None)
+        return save_content_views(counts=counts) if counts else 0
+    finally:
+        # after the timeout the lock can belong to another flush
+        if cache.get(ContentStatsConstants.LOCK_KEY) == token:
+            cache.delete(ContentStatsConstants.LOCK_KEY)
+
+
+def _flush_in_background() -> None:
+    try:
+        flush_views()
+    finally:
+        connections.close_all()
+
+
+# the views of a stopping worker wait in the shared cache for the next flush
+atexit.register(spill_views)
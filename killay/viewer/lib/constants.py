@@ -1,5 +1,7 @@
 from django.utils.translation import gettext_lazy
 
+from killay.archives.lib.constants import PieceConstants, SuggestConstants
+
 
 class SiteContextConstants:
     NAME_ALL = gettext_lazy("All")
@@ -28,6 +30,13 @@ class ViewerConstants:
         (HOME_PAGE, gettext_lazy("Page")),
         (HOME_DEFAULT, gettext_lazy("Default")),
     ]
+    NAME_PAGINATION = gettext_lazy("Pagination")
+    PAGINATION_PAGES = "PAGES"
+    PAGINATION_CURSOR = "CURSOR"
+    PAGINATION_CHOICES = [
+        (PAGINATION_PAGES, gettext_lazy("Numbered pages")),
+        (PAGINATION_CURSOR, gettext_lazy("Next and previous cursors")),
+    ]
     HELP_TEXT_SCOPE = gettext_lazy(
         "Determines the scope of the content to be viewed by the public, "
         "which can be reduced to a single archive or collection"
@@ -47,6 +56,10 @@ class ViewerConstants:
     HELP_TEXT_HOME_PAGE = gettext_lazy(
         "In case of selecting the home by page this must be selected"
     )
+    HELP_TEXT_PAGINATION = gettext_lazy(
+        "Numbered pages allow jumping to any page, cursors only move to the "
+        "next or previous page but load every page equally fast"
+    )
 
     ERROR_SCOPE_ONE_ARCHIVE = gettext_lazy(
         "The one archive option requires to be specified"
@@ -71,6 +84,104 @@ class ViewerConstants:
         KEY_SEARCH,
         KEY_KIND,
     ]
+    KEY_PAGE_CURSOR = "cursor"
+    KEY_SUGGEST_QUERY = "q"
+
+
+class PageCacheConstants:
+    KEY = "viewer:page:{generation}:{digest}"
+    QUERY_KEYS = [*ViewerConstants.CURSOR_KEYS, "page", ViewerConstants.KEY_PAGE_CURSOR]
+    HEADER = "X-Page-Cache"
+    STATUS_HIT = "HIT"
+    STATUS_MISS = "MISS"
+    STATUS_BYPASS = "BYPASS"
+    STATS_COUNT_KEY = "viewer:page_cache:stats:{status}:count"
+    STATS_TIME_KEY = "viewer:page_cache:stats:{status}:time"
+    DEPENDENCY_KEY = "viewer:page_dependency:{model}:{id}"
+    ANY_ID = "*"
+
+
+class ContentStatsConstants:
+    SEQUENCE_KEY = "viewer:content_stats:sequence"
+    FLUSHED_KEY = "viewer:content_stats:flushed"
+    CHUNK_KEY = "viewer:content_stats:chunk:{sequence}"
+    LOCK_KEY = "viewer:content_stats:lock"
+    LOCK_TIMEOUT = 300
+    # chunks missing this far behind the last one were evicted, not delayed
+    PENDING_CHUNKS = 100
+    COUNTED_STATUSES = [200, 304]
+    BATCH_SIZE = 500
+    ADMIN_LIMIT = 50
+    ADMIN_LABEL = "{name} ({model} {id})"
+
+
+class TrendingConstants:
+    GENERATION_KEY = "viewer:trending:generation"
+    KEY = "viewer:trending:{generation}:{place_id}:{archive_id}"
+    WINDOW_DAYS = 30
+    HALF_LIFE_DAYS = 7
+    LIMIT = 8
+    BATCH_SIZE = 500
+
+
+class RelatedPieceConstants:
+    # the weight of each kind of term shared by two pieces
+    TERM_WEIGHTS = {"keywords": 1.0, "people": 1.0, "categories": 0.5}
+    # more than shown, some can be hidden from the place of the visitor
+    STORED = 12
+    LIMIT = 6
+    # terms of more pieces than this relate nothing and cost the most
+    MAX_TERM_PIECES = 1000
+    BATCH_SIZE = 500
+
+
+class ExportConstants:
+    MANIFEST_NAME = "manifest.json"
+    INDEX_NAME = "index"
+    EXTENSION = ".html"
+    GZIP_EXTENSION = ".gz"
+    QUERY_SEPARATOR = "~"
+    DEFAULT_DEPTH = 1
+    REDIRECT_STATUSES = [301, 302]
+    BATCH_SIZE = 500
+
+
+class SitemapConstants:
+    INDEX_NAME = "sitemap.xml"
+    FILE_NAME = "{section}-{number}.xml"
+    FILE_NAME_PATTERN = r"^[a-z]+-[0-9]+\.xml$"
+    CHUNK_SIZE = 50_000
+    PROTOCOL = "https"
+    SECTION_ARCHIVES = "archives"
+    SECTION_COLLECTIONS = "collections"
+    SECTION_PIECES = "pieces"
+    SECTION_PAGES = "pages"
+    XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+    NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+    CONTENT_TYPE = "application/xml"
+
+
+class MediaConstants:
+    FIELD_FILE = "file"
+    FIELD_IMAGE = "image"
+    FIELD_BY_KIND = {
+        PieceConstants.KIND_IMAGE: FIELD_IMAGE,
+        PieceConstants.KIND_SOUND: FIELD_FILE,
+        PieceConstants.KIND_DOCUMENT: FIELD_FILE,
+    }
+    RANGE_PATTERN = r"^bytes=(\d*)-(\d*)$"
+    CHUNK_SIZE = 64 * 1024
+    DEFAULT_CONTENT_TYPE = "application/octet-stream"
+    CACHE_CONTROL = "private, max-age=3600"
+
+
+class PaginationConstants:
+    KEYSET_FIELDS = ["title", "code", "id"]
+    CURSOR_SALT = "killay.viewer.pagination"
+    DIRECTION_NEXT = "next"
+    DIRECTION_PREVIOUS = "previous"
+    COUNT_KEY = "viewer:pagination:count:{generation}:{digest}"
+    COUNT_TIMEOUT = 300
 
 
 class ViewerPatternConstants:
@@ -80,6 +191,11 @@ class ViewerPatternConstants:
     ARCHIVE_DETAIL = "archive_detail"
     PIECE_LIST = "piece_list"
     PIECE_DETAIL = "piece_detail"
+    SUGGEST = "suggest"
+    SITEMAP_INDEX = "sitemap_index"
+    SITEMAP = "sitemap"
+    PIECE_MEDIA = "piece_media"
+    PIECE_MEDIA_THUMBNAIL = "piece_media_thumbnail"
     VIEW_NAMES = [ROOT, ARCHIVE_LIST, ARCHIVE_DETAIL, PIECE_LIST]
     HOME_BY_SCOPE = {
         ViewerConstants.SCOPE_ALL: ARCHIVE_LIST,
@@ -102,7 +218,10 @@ class ViewerMessageConstants:
     LABEL_CATEGORIES = gettext_lazy("Categories")
     LABEL_PEOPLE = gettext_lazy("People")
     LABEL_KEYWORDS = gettext_lazy("Keywords")
+    LABEL_PIECES = gettext_lazy("Pieces")
     LABEL_ARCHIVE_LIST = gettext_lazy("Archives of {site}")
+    LABEL_TRENDING = gettext_lazy("Most viewed this month")
+    LABEL_RELATED = gettext_lazy("See also")
     IS_NOT_VISIBLE = gettext_lazy("Is not visible")
     IS_RESTRICTED = gettext_lazy("Is restricted to physical places")
     HELP_TEXTS = {
@@ -112,15 +231,44 @@ class ViewerMessageConstants:
     GENERAL_CONTEXT = {
         "collection_label": LABEL_COLLECTIONS,
         "help_texts": HELP_TEXTS,
+        "trending_label": LABEL_TRENDING,
+        "related_label": LABEL_RELATED,
     }
     PIECE_NOT_FOUND = gettext_lazy("Piece does not exist")
     SEARCH_TOOL_NAME = gettext_lazy("Search Options")
     SEARCH_ACTION_NAME = gettext_lazy("Search")
     SEARCH_APPLIED_FILTERS = gettext_lazy("{applied_filters} applied filters")
     TOTAL_FOUNDED_PIECES = gettext_lazy("{number} pieces were found")
+    SUGGEST_LABELS = {
+        SuggestConstants.KIND_PIECE: LABEL_PIECES,
+        SuggestConstants.KIND_PERSON: LABEL_PEOPLE,
+        SuggestConstants.KIND_KEYWORD: LABEL_KEYWORDS,
+        SuggestConstants.KIND_CATEGORY: LABEL_CATEGORIES,
+    }
+    SEQUENCE_MATCHED_AT = gettext_lazy("matched at {time}")
 
 
 class ContentConstants:
+    ARCHIVE_FIELDS = [
+        "id",
+        "name",
+        "slug",
+        "description",
+        "image",
+        "is_visible",
+        "is_restricted",
+    ]
+    COLLECTION_FIELDS = [
+        "id",
+        "name",
+        "slug",
+        "description",
+        "image",
+        "is_visible",
+        "is_restricted",
+        "archive_id",
+        "archive__slug",
+    ]
     PIECE_META_FIELDS = [
         "event",
         "register_date",
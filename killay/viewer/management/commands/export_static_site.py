@@ -0,0 +1,56 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from killay.admin.services import get_site_configuration
+from killay.viewer.engine.export import export_site
+from killay.viewer.lib.constants import ExportConstants
+
+
+class Command(BaseCommand):
+    help = "Export the public pages of the viewer as static gzipped html"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.VIEWER_EXPORT_ROOT,
+            help="Directory of the exported pages and their manifest",
+        )
+        parser.add_argument(
+            "--host",
+            help="Host of the rendered requests, the site domain by default",
+        )
+        parser.add_argument(
+            "--depth",
+            type=int,
+            default=ExportConstants.DEFAULT_DEPTH,
+            help="Filters combined in the exported piece lists",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Threads rendering pages at the same time",
+        )
+        parser.add_argument(
+            "--full", action="store_true", help="Export again the unchanged pages"
+        )
+
+    def handle(self, *args, **options):
+        report = export_site(
+            output_dir=options["output"],
+            host=options["host"] or get_site_configuration().domain,
+            depth=options["depth"],
+            workers=options["workers"],
+            full=options["full"],
+        )
+        for url in report["failed"]:
+            self.stderr.write(f"Not exported: {url}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(report['exported'])} pages exported, "
+                f"{len(report['skipped'])} unchanged, "
+                f"{len(report['removed'])} removed"
+            )
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from killay.viewer.engine.stats import flush_views
+
+
+class Command(BaseCommand):
+    help = "Save the buffered views of the viewer pages, run it on shutdown"
+
+    def handle(self, *args, **options):
+        total = flush_views()
+        self.stdout.write(self.style.SUCCESS(f"{total} views saved"))
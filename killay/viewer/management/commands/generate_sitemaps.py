@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from killay.admin.services import get_site_configuration
+from killay.viewer.engine.sitemaps import generate_sitemaps
+from killay.viewer.lib.constants import SitemapConstants
+
+
+class Command(BaseCommand):
+    help = "Write the sitemaps of the public content and their index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            help="Scheme and host of the urls, the site domain by default",
+        )
+
+    def handle(self, *args, **options):
+        base_url = options["base_url"] or (
+            f"{SitemapConstants.PROTOCOL}://{get_site_configuration().domain}"
+        )
+        files = generate_sitemaps(
+            directory=settings.VIEWER_SITEMAP_ROOT, base_url=base_url
+        )
+        self.stdout.write(self.style.SUCCESS(f"{len(files)} sitemaps written"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from killay.viewer.engine.cache import get_page_cache_stats, reset_page_cache_stats
+from killay.viewer.lib.constants import PageCacheConstants
+
+
+class Command(BaseCommand):
+    help = "Show the hit ratio and latency of the viewer page cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Reset the counters after showing"
+        )
+
+    def handle(self, *args, **options):
+        stats = get_page_cache_stats()
+        for status in [PageCacheConstants.STATUS_HIT, PageCacheConstants.STATUS_MISS]:
+            self.stdout.write(
+                f"{status}: {stats[status]['count']} requests, "
+                f"{stats[status]['mean_ms']:.1f} ms on average"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Hit ratio: {stats['hit_ratio']:.1%}"))
+        if options["reset"]:
+            reset_page_cache_stats()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from killay.viewer.services import rebuild_related_pieces
+
+
+class Command(BaseCommand):
+    help = "Relate the pieces that share keywords, people and categories"
+
+    def handle(self, *args, **options):
+        total = rebuild_related_pieces()
+        self.stdout.write(self.style.SUCCESS(f"{total} pieces with related pieces"))
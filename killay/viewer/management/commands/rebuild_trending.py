@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from killay.viewer.engine.stats import flush_views
+from killay.viewer.services import rebuild_trending_pieces
+
+
+class Command(BaseCommand):
+    help = "Rank the most viewed pieces of the site, each archive and each place"
+
+    def handle(self, *args, **options):
+        flush_views()
+        total = rebuild_trending_pieces()
+        self.stdout.write(self.style.SUCCESS(f"{total} trending positions written"))
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.23 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('viewer', '0003_auto_20230828_1624'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='viewer',
+            name='pagination',
+            field=models.CharField(choices=[('PAGES', 'Numbered pages'), ('CURSOR', 'Next and previous cursors')], default='PAGES', help_text='Numbered pages allow jumping to any page, cursors only move to the next or previous page but load every page equally fast', max_length=50, verbose_name='Pagination'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.23 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('viewer', '0004_viewer_pagination'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='contentstats',
+            constraint=models.UniqueConstraint(fields=('viewer', 'content_type', 'object_id'), name='unique_content_stats'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.23 on 2026-10-18 09:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('archives', '0017_piece_list_fields'),
+        ('viewer', '0005_content_stats_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingPiece',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('position', models.PositiveSmallIntegerField()),
+                ('archive', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='trending_pieces', to='archives.archive')),
+                ('piece', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending', to='archives.piece')),
+                ('place', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='trending_pieces', to='archives.place')),
+            ],
+            options={
+                'ordering': ['position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ContentViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('day', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('viewer', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='content_view_buckets', to='viewer.viewer')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='trendingpiece',
+            index=models.Index(fields=['place', 'archive', 'position'], name='viewer_tren_place_i_21bf19_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contentviewbucket',
+            index=models.Index(fields=['content_type', 'day'], name='viewer_cont_content_4888a4_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='contentviewbucket',
+            constraint=models.UniqueConstraint(fields=('viewer', 'content_type', 'object_id', 'day'), name='unique_content_view_bucket'),
+        ),
+    ]
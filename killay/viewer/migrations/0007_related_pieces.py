@@ -0,0 +1,32 @@
+# Generated by Django 3.2.23 on 2026-10-18 09:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archives', '0017_piece_list_fields'),
+        ('viewer', '0006_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPiece',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('position', models.PositiveSmallIntegerField()),
+                ('piece', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_pieces', to='archives.piece')),
+                ('related_piece', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_to', to='archives.piece')),
+            ],
+            options={
+                'ordering': ['position'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='relatedpiece',
+            index=models.Index(fields=['piece', 'position'], name='viewer_rela_piece_i_8e1fb6_idx'),
+        ),
+    ]
@@ -47,6 +47,13 @@ class Viewer(models.Model):
         related_name="viewer",
         null=True,
     )
+    pagination = models.CharField(
+        ViewerConstants.NAME_PAGINATION,
+        choices=ViewerConstants.PAGINATION_CHOICES,
+        max_length=50,
+        help_text=ViewerConstants.HELP_TEXT_PAGINATION,
+        default=ViewerConstants.PAGINATION_PAGES,
+    )
 
 
 class ContentStats(models.Model):
@@ -60,3 +67,78 @@ class ContentStats(models.Model):
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey(ct_field="content_type", fk_field="object_id")
     views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["viewer", "content_type", "object_id"],
+                name="unique_content_stats",
+            )
+        ]
+
+
+class ContentViewBucket(models.Model):
+    viewer = models.ForeignKey(
+        Viewer,
+        on_delete=models.CASCADE,
+        related_name="content_view_buckets",
+        null=True,
+    )
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["viewer", "content_type", "object_id", "day"],
+                name="unique_content_view_bucket",
+            )
+        ]
+        indexes = [models.Index(fields=["content_type", "day"])]
+
+
+class TrendingPiece(models.Model):
+    place = models.ForeignKey(
+        "archives.Place",
+        on_delete=models.CASCADE,
+        related_name="trending_pieces",
+        null=True,
+    )
+    archive = models.ForeignKey(
+        "archives.Archive",
+        on_delete=models.CASCADE,
+        related_name="trending_pieces",
+        null=True,
+    )
+    piece = models.ForeignKey(
+        "archives.Piece",
+        on_delete=models.CASCADE,
+        related_name="trending",
+    )
+    score = models.FloatField()
+    position = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["position"]
+        indexes = [models.Index(fields=["place", "archive", "position"])]
+
+
+class RelatedPiece(models.Model):
+    piece = models.ForeignKey(
+        "archives.Piece",
+        on_delete=models.CASCADE,
+        related_name="related_pieces",
+    )
+    related_piece = models.ForeignKey(
+        "archives.Piece",
+        on_delete=models.CASCADE,
+        related_name="related_to",
+    )
+    score = models.FloatField()
+    position = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ["position"]
+        indexes = [models.Index(fields=["piece", "position"])]
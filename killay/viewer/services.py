@@ -0,0 +1,251 @@
+import heapq
+import math
+
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from killay.admin.utils import bump_cache_generation, get_cache_generation
+from killay.archives.models import EffectiveAccess, Piece, Place
+from killay.viewer.engine.dependencies import purge_dependencies
+from killay.viewer.lib.constants import (
+    ContentStatsConstants,
+    RelatedPieceConstants,
+    TrendingConstants,
+)
+from killay.viewer.models import (
+    ContentStats,
+    ContentViewBucket,
+    RelatedPiece,
+    TrendingPiece,
+)
+
+
+def _bulk_add_views(model, views: Dict[Tuple, int], key_fields: List[str]) -> None:
+    # the missing rows are created first, so every row gets one update
+    model.objects.bulk_create(
+        [model(**dict(zip(key_fields, key))) for key in views],
+        batch_size=ContentStatsConstants.BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    filters = {
+        f"{field}__in": {key[index] for key in views}
+        for index, field in enumerate(key_fields)
+    }
+    updated_rows = []
+    for row in model.objects.filter(**filters):
+        key = tuple(getattr(row, field) for field in key_fields)
+        if key in views:
+            row.views = F("views") + views[key]
+            updated_rows.append(row)
+    model.objects.bulk_update(
+        updated_rows, ["views"], batch_size=ContentStatsConstants.BATCH_SIZE
+    )
+
+
+def save_content_views(counts: Dict[Tuple[int, str, str, str], int]) -> int:
+    """
+    Adds the views counted by viewer, model label, lookup field and value to
+    the stats of each instance and to its bucket of the day. The views of
+    deleted instances are dropped, returns the number of views saved.
+    """
+    values_by_lookup = defaultdict(set)
+    for _, label, field, value in counts:
+        values_by_lookup[(label, field)].add(value)
+    objects = {}
+    for (label, field), values in values_by_lookup.items():
+        model = apps.get_model(label)
+        content_type = ContentType.objects.get_for_model(model)
+        rows = model.objects.filter(**{f"{field}__in": values}).values_list(field, "id")
+        for value, object_id in rows:
+            objects[(label, field, str(value))] = (content_type.id, object_id)
+    views = Counter()
+    for (viewer_id, *lookup), total in counts.items():
+        if tuple(lookup) in objects:
+            views[(viewer_id, *objects[tuple(lookup)])] += total
+    if not views:
+        return 0
+    key_fields = ["viewer_id", "content_type_id", "object_id"]
+    _bulk_add_views(model=ContentStats, views=views, key_fields=key_fields)
+    today = timezone.localdate()
+    _bulk_add_views(
+        model=ContentViewBucket,
+        views={(*key, today): total for key, total in views.items()},
+        key_fields=[*key_fields, "day"],
+    )
+    return sum(views.values())
+
+
+def get_most_viewed(viewer_id: int) -> List[ContentStats]:
+    return list(
+        ContentStats.objects.filter(viewer_id=viewer_id, views__gt=0)
+        .prefetch_related("content_object")
+        .order_by("-views", "id")[: ContentStatsConstants.ADMIN_LIMIT]
+    )
+
+
+def _get_piece_scores(buckets: QuerySet, today: date) -> Dict[int, float]:
+    # the weight of the views of a day halves every few days
+    scores = Counter()
+    rows = buckets.values_list("object_id", "day", "views")
+    for piece_id, day, views in rows.iterator(chunk_size=TrendingConstants.BATCH_SIZE):
+        age = (today - day).days
+        scores[piece_id] += views * 0.5 ** (age / TrendingConstants.HALF_LIFE_DAYS)
+    return scores
+
+
+def rebuild_trending_pieces() -> int:
+    """
+    Ranks the pieces by their views of the last days and keeps the top of the
+    whole site and of each archive, among the pieces visible in each place.
+    The buckets older than the ranked days are deleted. Returns the number of
+    positions written, a piece counts once in each list that ranks it.
+    """
+    today = timezone.localdate()
+    since = today - timedelta(days=TrendingConstants.WINDOW_DAYS)
+    buckets = ContentViewBucket.objects.filter(
+        content_type=ContentType.objects.get_for_model(Piece), day__gt=since
+    )
+    scores = _get_piece_scores(buckets=buckets, today=today)
+    viewed_ids = buckets.values("object_id")
+    archive_ids = dict(
+        Piece.objects.filter(id__in=viewed_ids).values_list(
+            "id", "collection__archive_id"
+        )
+    )
+    rows = []
+    for place_id in [None, *Place.objects.values_list("id", flat=True)]:
+        visible_ids = EffectiveAccess.objects.filter(
+            place_id=place_id, piece_id__in=viewed_ids
+        ).values_list("piece_id", flat=True)
+        top_ids = defaultdict(list)
+        for piece_id in sorted(visible_ids, key=lambda key: (-scores[key], key)):
+            for archive_id in [None, archive_ids[piece_id]]:
+                if len(top_ids[archive_id]) < TrendingConstants.LIMIT:
+                    top_ids[archive_id].append(piece_id)
+        rows.extend(
+            TrendingPiece(
+                place_id=place_id,
+                archive_id=archive_id,
+                piece_id=piece_id,
+                score=scores[piece_id],
+                position=position,
+            )
+            for archive_id, piece_ids in top_ids.items()
+            for position, piece_id in enumerate(piece_ids)
+        )
+    with transaction.atomic():
+        TrendingPiece.objects.all().delete()
+        TrendingPiece.objects.bulk_create(rows, batch_size=TrendingConstants.BATCH_SIZE)
+        ContentViewBucket.objects.filter(day__lte=since).delete()
+    bump_cache_generation(key=TrendingConstants.GENERATION_KEY)
+    purge_dependencies(model=TrendingPiece)
+    return len(rows)
+
+
+def get_trending_piece_ids(
+    place_id: Optional[int], archive_id: Optional[int] = None
+) -> List[int]:
+    key = TrendingConstants.KEY.format(
+        generation=get_cache_generation(key=TrendingConstants.GENERATION_KEY),
+        place_id=place_id,
+        archive_id=archive_id,
+    )
+    piece_ids = cache.get(key)
+    if piece_ids is None:
+        piece_ids = list(
+            TrendingPiece.objects.filter(
+                place_id=place_id, archive_id=archive_id
+            ).values_list("piece_id", flat=True)
+        )
+        cache.set(key, piece_ids, timeout=None)
+    return piece_ids
+
+
+def _get_piece_terms(piece_ids: QuerySet) -> Dict[Tuple[str, int], List[int]]:
+    # the pieces of each keyword, person and category, from the m2m tables
+    pieces_by_term = defaultdict(list)
+    for field_name in RelatedPieceConstants.TERM_WEIGHTS:
+        field = Piece._meta.get_field(field_name)
+        rows = field.remote_field.through.objects.filter(
+            **{f"{field.m2m_field_name()}_id__in": piece_ids}
+        ).values_list(
+            f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+        )
+        for piece_id, term_id in rows.iterator(
+            chunk_size=RelatedPieceConstants.BATCH_SIZE
+        ):
+            pieces_by_term[(field_name, term_id)].append(piece_id)
+    return pieces_by_term
+
+
+def _get_term_weights(
+    pieces_by_term: Dict[Tuple[str, int], List[int]], total: int
+) -> Dict[Tuple[str, int], float]:
+    # the rarer the term the more it tells, the terms of one piece or of all
+    # of them relate none
+    return {
+        term: RelatedPieceConstants.TERM_WEIGHTS[term[0]]
+        * math.log(total / len(piece_ids))
+        for term, piece_ids in pieces_by_term.items()
+        if 1 < len(piece_ids) < total
+        and len(piece_ids) <= RelatedPieceConstants.MAX_TERM_PIECES
+    }
+
+
+def rebuild_related_pieces() -> int:
+    """
+    Relates each piece with the pieces that share most of its keywords,
+    people and categories, by the cosine of their vectors of terms weighted by
+    rarity. The vectors are sparse, only the pieces that share a term are
+    compared. The pieces visible in no place are left out, the visibility in
+    each place is checked when they are shown. Returns the number of pieces
+    with related pieces.
+    """
+    piece_ids = EffectiveAccess.objects.values("piece_id").distinct()
+    pieces_by_term = _get_piece_terms(piece_ids=piece_ids)
+    total = len({piece_id for ids in pieces_by_term.values() for piece_id in ids})
+    weights = _get_term_weights(pieces_by_term=pieces_by_term, total=total)
+    terms_by_piece = defaultdict(list)
+    for term in weights:
+        for piece_id in pieces_by_term[term]:
+            terms_by_piece[piece_id].append(term)
+    norms = {
+        piece_id: math.sqrt(sum(weights[term] ** 2 for term in terms))
+        for piece_id, terms in terms_by_piece.items()
+    }
+    rows = []
+    for piece_id, terms in terms_by_piece.items():
+        products = Counter()
+        for term in terms:
+            for other_id in pieces_by_term[term]:
+                products[other_id] += weights[term] ** 2
+        products.pop(piece_id, None)
+        top_ids = heapq.nlargest(
+            RelatedPieceConstants.STORED,
+            products,
+            key=lambda other_id: (products[other_id] / norms[other_id], -other_id),
+        )
+        rows.extend(
+            RelatedPiece(
+                piece_id=piece_id,
+                related_piece_id=other_id,
+                score=products[other_id] / (norms[piece_id] * norms[other_id]),
+                position=position,
+            )
+            for position, other_id in enumerate(top_ids)
+        )
+    with transaction.atomic():
+        RelatedPiece.objects.all().delete()
+        RelatedPiece.objects.bulk_create(
+            rows, batch_size=RelatedPieceConstants.BATCH_SIZE
+        )
+    purge_dependencies(model=RelatedPiece)
+    return len({row.piece_id for row in rows})
@@ -0,0 +1,90 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from killay.archives.models import (
+    Category,
+    Keyword,
+    Person,
+    Piece,
+    PieceMeta,
+    Provider,
+    Sequence,
+)
+from killay.viewer.engine.dependencies import purge_dependencies
+
+# fields that change which lists show a piece or where, not only its own pages
+LIST_FIELDS = [
+    "code",
+    "title",
+    "kind",
+    "is_published",
+    "is_restricted",
+    "collection_id",
+]
+M2M_ACTIONS = ["post_add", "post_remove", "post_clear"]
+
+
+@receiver(pre_save, sender=Piece)
+def keep_piece_list_changes(sender, instance, **kwargs):
+    previous = (
+        Piece.objects.filter(id=instance.id).values(*LIST_FIELDS).first()
+        if instance.id
+        else None
+    )
+    instance._changes_lists = previous is None or any(
+        previous[field] != getattr(instance, field) for field in LIST_FIELDS
+    )
+
+
+@receiver(post_save, sender=Piece)
+def purge_piece_pages(sender, instance, **kwargs):
+    purge_dependencies(model=Piece, ids=[instance.id])
+    if getattr(instance, "_changes_lists", True):
+        purge_dependencies(model=Piece)
+
+
+@receiver(post_delete, sender=Piece)
+def purge_deleted_piece_pages(sender, instance, **kwargs):
+    purge_dependencies(model=Piece, ids=[instance.id])
+    purge_dependencies(model=Piece)
+
+
+@receiver(post_save, sender=PieceMeta)
+@receiver(post_delete, sender=PieceMeta)
+@receiver(post_save, sender=Sequence)
+@receiver(post_delete, sender=Sequence)
+@receiver(post_save, sender=Provider)
+@receiver(post_delete, sender=Provider)
+def purge_piece_content_pages(sender, instance, **kwargs):
+    purge_dependencies(model=Piece, ids=[instance.piece_id])
+    # the texts of the piece can make it match other searches
+    purge_dependencies(model=sender)
+
+
+@receiver(m2m_changed, sender=Piece.categories.through)
+@receiver(m2m_changed, sender=Piece.people.through)
+@receiver(m2m_changed, sender=Piece.keywords.through)
+def purge_piece_relation_pages(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in M2M_ACTIONS:
+        return
+    if not reverse:
+        purge_dependencies(model=Piece, ids=[instance.id])
+        purge_dependencies(model=kwargs["model"])
+        return
+    purge_dependencies(model=type(instance), ids=[instance.id])
+    purge_dependencies(model=type(instance))
+    if pk_set:
+        purge_dependencies(model=Piece, ids=pk_set)
+    else:
+        purge_dependencies(model=Piece)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+@receiver(post_save, sender=Keyword)
+@receiver(post_delete, sender=Keyword)
+def purge_categorization_pages(sender, instance, **kwargs):
+    purge_dependencies(model=sender, ids=[instance.id])
+    purge_dependencies(model=sender)
@@ -0,0 +1,21 @@
+from django import template
+
+from killay.archives.lib.constants import ThumbnailConstants
+from killay.archives.thumbnails import get_srcset, get_thumbnail_url
+
+register = template.Library()
+
+
+def _get_name(image) -> str:
+    # image field files of the models or names of the storage
+    return getattr(image, "name", image)
+
+
+@register.filter
+def srcset(image, image_format: str = ThumbnailConstants.FORMAT_WEBP) -> str:
+    return get_srcset(name=_get_name(image), image_format=image_format) or ""
+
+
+@register.filter
+def thumbnail(image, image_format: str = ThumbnailConstants.FORMAT_WEBP) -> str:
+    return get_thumbnail_url(name=_get_name(image), image_format=image_format) or ""
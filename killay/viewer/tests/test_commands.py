@@ -0,0 +1,44 @@
+import pytest
+
+from django.core.management import call_command
+
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.cache import get_page_cache_stats
+from killay.viewer.models import ContentStats
+
+
+@pytest.mark.django_db
+def test_page_cache_stats(client, capsys):
+    archives_recipes.piece_recipe.make()
+    client.get("/pieces/")
+    client.get("/pieces/")
+    call_command("page_cache_stats", "--reset")
+    output = capsys.readouterr().out
+    assert "HIT: 1 requests" in output
+    assert "Hit ratio: 50.0%" in output
+    assert get_page_cache_stats()["hit_ratio"] == 0
+
+
+@pytest.mark.django_db
+def test_flush_content_stats(client, capsys):
+    piece = archives_recipes.piece_recipe.make()
+    client.get(f"/pieces/{piece.code}/")
+    call_command("flush_content_stats")
+    assert "1 views saved" in capsys.readouterr().out
+    assert ContentStats.objects.get(object_id=piece.id).views == 1
+
+
+@pytest.mark.django_db
+def test_export_static_site(tmpdir, capsys):
+    archives_recipes.piece_recipe.make()
+    call_command(
+        "export_static_site",
+        "--output",
+        tmpdir.strpath,
+        "--host",
+        "testserver",
+        "--workers",
+        "1",
+    )
+    assert "0 removed" in capsys.readouterr().out
+    assert tmpdir.join("archives", "index.html.gz").exists()
@@ -2,7 +2,7 @@ from unittest import mock
 
 import pytest
 
-
+from killay.archives.tests import recipes as archives_recipes
 from killay.viewer.engine.base import PipelineBase
 
 
@@ -38,3 +38,10 @@ class TestPipelineBase:
         request = get_request_with_viewer(f"/?{query_params}")
         pipeline = PipelineBase(request=request)
         assert pipeline.get_queryparams() == query_params
+
+    def test_access(self, get_request_with_viewer):
+        place_address = archives_recipes.place_address_recipe.make(ipv4="10.0.0.1")
+        request = get_request_with_viewer(ipv4=place_address.ipv4)
+        pipeline = PipelineBase(request=request)
+        assert pipeline.access is request.access
+        assert pipeline.access.place_id == place_address.place_id
@@ -0,0 +1,73 @@
+import pytest
+
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.cache import get_page_cache_key
+from killay.viewer.lib.constants import PageCacheConstants
+
+
+@pytest.mark.django_db
+class TestGetPageCacheKey:
+    def test_normalized_query_params(self, get_request_with_viewer):
+        request = get_request_with_viewer(path="/pieces/?kind=VIDEO&search=a&utm=x")
+        same_request = get_request_with_viewer(path="/pieces/?search=a&kind=VIDEO")
+        other_request = get_request_with_viewer(path="/pieces/?search=b&kind=VIDEO")
+        key = get_page_cache_key(request=request)
+        assert key == get_page_cache_key(request=same_request)
+        assert key != get_page_cache_key(request=other_request)
+
+    def test_by_place(self, get_request_with_viewer):
+        place = archives_recipes.place_recipe.make()
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        request = get_request_with_viewer(path="/pieces/")
+        place_request = get_request_with_viewer(path="/pieces/", ipv4="10.0.0.1")
+        assert place_request.place == place
+        assert get_page_cache_key(request=request) != get_page_cache_key(
+            request=place_request
+        )
+
+    def test_content_generation(self, get_request_with_viewer):
+        request = get_request_with_viewer(path="/pieces/")
+        key = get_page_cache_key(request=request)
+        archives_recipes.piece_recipe.make()
+        assert key != get_page_cache_key(request=request)
+
+
+@pytest.mark.django_db
+class TestPageCache:
+    path = "/pieces/"
+
+    def test_hit(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        response = client.get(self.path)
+        assert response[PageCacheConstants.HEADER] == PageCacheConstants.STATUS_MISS
+        response = client.get(self.path)
+        assert response[PageCacheConstants.HEADER] == PageCacheConstants.STATUS_HIT
+        assert "Server-Timing" in response
+        assert piece.title in response.content.decode()
+
+    def test_invalidated_by_content_change(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        client.get(self.path)
+        piece.title = "Nuevo título"
+        piece.save()
+        response = client.get(self.path)
+        assert response[PageCacheConstants.HEADER] == PageCacheConstants.STATUS_MISS
+        assert "Nuevo título" in response.content.decode()
+
+    def test_bypass_authenticated(self, client, admin_user):
+        client.force_login(admin_user)
+        client.get(self.path)
+        response = client.get(self.path)
+        assert PageCacheConstants.HEADER not in response
+
+    def test_not_cached_not_found(self, client):
+        client.get("/pieces/wrong-code/")
+        response = client.get("/pieces/wrong-code/")
+        assert response.status_code == 404
+        assert PageCacheConstants.HEADER not in response
+
+    def test_disabled(self, client, settings):
+        settings.VIEWER_PAGE_CACHE_TIMEOUT = 0
+        client.get(self.path)
+        response = client.get(self.path)
+        assert PageCacheConstants.HEADER not in response
@@ -0,0 +1,110 @@
+import pytest
+
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.conditional import get_page_validators
+
+
+@pytest.mark.django_db
+class TestGetPageValidators:
+    def test_by_place(self, get_request_with_viewer):
+        place = archives_recipes.place_recipe.make()
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        request = get_request_with_viewer(path="/pieces/")
+        place_request = get_request_with_viewer(path="/pieces/", ipv4="10.0.0.1")
+        assert (
+            get_page_validators(request=request).etag
+            != get_page_validators(request=place_request).etag
+        )
+
+    def test_config_generation(self, get_request_with_viewer):
+        request = get_request_with_viewer(path="/pieces/")
+        etag = get_page_validators(request=request).etag
+        assert get_page_validators(request=request).etag == etag
+        archives_recipes.archive_recipe.make()
+        assert get_page_validators(request=request).etag != etag
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def _revalidate(self, client, path):
+        response = client.get(path)
+        assert response.status_code == 200
+        return client.get(path, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_piece_detail(self, client, django_assert_max_num_queries):
+        piece = archives_recipes.piece_recipe.make()
+        path = f"/pieces/{piece.code}/"
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response["Last-Modified"]
+        with django_assert_max_num_queries(3):
+            response = client.get(path, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304
+        assert response["ETag"]
+        assert not response.content
+
+    def test_piece_detail_changed(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        path = f"/pieces/{piece.code}/"
+        etag = client.get(path)["ETag"]
+        keyword = piece.keywords.first()
+        keyword.name = "Nueva palabra"
+        keyword.save()
+        response = client.get(path, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert "Nueva palabra" in response.content.decode()
+
+    def test_piece_list(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        assert self._revalidate(client, "/pieces/").status_code == 304
+        etag = client.get("/pieces/")["ETag"]
+        assert client.get("/pieces/?kind=IMAGE")["ETag"] != etag
+        piece.meta.description = "Una nueva descripción"
+        piece.meta.save()
+        assert client.get("/pieces/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_archives(self, client):
+        archive = archives_recipes.archive_recipe.make()
+        archives_recipes.piece_recipe.make(collection__archive=archive)
+        assert self._revalidate(client, "/archives/").status_code == 304
+        path = f"/archives/{archive.slug}/"
+        assert self._revalidate(client, path).status_code == 304
+
+    def test_if_modified_since_only(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        path = f"/pieces/{piece.code}/"
+        last_modified = client.get(path)["Last-Modified"]
+        response = client.get(path, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 200
+
+    def test_not_found(self, client):
+        response = client.get("/pieces/wrong-code/", HTTP_IF_NONE_MATCH="*")
+        assert response.status_code == 404
+
+    def test_authenticated(self, client, admin_user):
+        piece = archives_recipes.piece_recipe.make()
+        client.force_login(admin_user)
+        response = client.get(f"/pieces/{piece.code}/")
+        assert "ETag" not in response
+
+
+@pytest.mark.django_db
+class TestValidatorQueries:
+    @pytest.mark.parametrize("path", ["/pieces/", "/archives/"])
+    def test_cache_hit_without_validators(
+        self, client, path, django_assert_max_num_queries
+    ):
+        archives_recipes.piece_recipe.make()
+        etag = client.get(path)["ETag"]
+        # only the transaction of the request
+        with django_assert_max_num_queries(2):
+            response = client.get(path)
+        assert response["X-Page-Cache"] == "HIT"
+        assert response["ETag"] == etag
+
+    def test_piece_list_revalidation(self, client, django_assert_max_num_queries):
+        archives_recipes.piece_recipe.make()
+        etag = client.get("/pieces/")["ETag"]
+        with django_assert_max_num_queries(2):
+            response = client.get("/pieces/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
@@ -0,0 +1,117 @@
+import pytest
+
+from killay.archives.models import Piece
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.dependencies import (
+    get_dependency_keys,
+    get_dependency_versions,
+    purge_dependencies,
+    start_tracking,
+    track_dependencies,
+)
+from killay.viewer.lib.constants import PageCacheConstants
+
+
+def test_get_dependency_keys():
+    assert get_dependency_keys(model=Piece, ids=[1]) == [
+        "viewer:page_dependency:archives.piece:1"
+    ]
+    assert get_dependency_keys(model=Piece) == [
+        "viewer:page_dependency:archives.piece:*"
+    ]
+
+
+def test_track_dependencies(rf):
+    request = rf.get("/")
+    track_dependencies(request=request, model=Piece, ids=[1])
+    assert not hasattr(request, "page_dependencies")
+    start_tracking(request=request)
+    track_dependencies(request=request, model=Piece, ids=[1, 2])
+    track_dependencies(request=request, model=Piece, ids=[1])
+    assert request.page_dependencies == set(get_dependency_keys(Piece, ids=[1, 2]))
+
+
+@pytest.mark.django_db
+def test_purge_dependencies():
+    keys = get_dependency_keys(model=Piece, ids=[1, 2])
+    versions = get_dependency_versions(keys=keys)
+    assert get_dependency_versions(keys=keys) == versions
+    purge_dependencies(model=Piece, ids=[1])
+    new_versions = get_dependency_versions(keys=keys)
+    assert new_versions[keys[0]] != versions[keys[0]]
+    assert new_versions[keys[1]] == versions[keys[1]]
+
+
+def _get_status(client, path):
+    return client.get(path)[PageCacheConstants.HEADER]
+
+
+@pytest.mark.django_db
+class TestPagePurge:
+    def test_piece_meta_change(self, client):
+        piece = archives_recipes.piece_recipe.make(title="A")
+        other_piece = archives_recipes.piece_recipe.make(title="B")
+        meta = piece.meta
+        paths = {
+            "detail": f"/pieces/{piece.code}/",
+            "list": "/pieces/",
+            "kind_list": f"/pieces/?kind={piece.kind}",
+            "other_detail": f"/pieces/{other_piece.code}/",
+            "other_list": f"/pieces/?collection={other_piece.collection.slug}",
+            "archives": "/archives/",
+        }
+        for path in paths.values():
+            client.get(path)
+        meta.description = "Una nueva descripción"
+        meta.save()
+        statuses = {name: _get_status(client, path) for name, path in paths.items()}
+        assert statuses == {
+            "detail": PageCacheConstants.STATUS_MISS,
+            "list": PageCacheConstants.STATUS_MISS,
+            "kind_list": PageCacheConstants.STATUS_MISS,
+            "other_detail": PageCacheConstants.STATUS_HIT,
+            "other_list": PageCacheConstants.STATUS_HIT,
+            "archives": PageCacheConstants.STATUS_HIT,
+        }
+
+    def test_new_piece(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        client.get("/pieces/")
+        client.get(f"/pieces/{piece.code}/")
+        # in the same collection and without new categories for the menus
+        Piece.objects.create(
+            code="new-piece",
+            title="Nueva pieza",
+            kind=piece.kind,
+            is_published=True,
+            collection=piece.collection,
+        )
+        assert _get_status(client, "/pieces/") == PageCacheConstants.STATUS_MISS
+        assert (
+            _get_status(client, f"/pieces/{piece.code}/")
+            == PageCacheConstants.STATUS_HIT
+        )
+
+    def test_keyword_change(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        other_piece = archives_recipes.piece_recipe.make()
+        client.get(f"/pieces/{piece.code}/")
+        client.get(f"/pieces/{other_piece.code}/")
+        keyword = piece.keywords.first()
+        keyword.name = "Nueva palabra"
+        keyword.save()
+        response = client.get(f"/pieces/{piece.code}/")
+        assert response[PageCacheConstants.HEADER] == PageCacheConstants.STATUS_MISS
+        assert "Nueva palabra" in response.content.decode()
+        assert (
+            _get_status(client, f"/pieces/{other_piece.code}/")
+            == PageCacheConstants.STATUS_HIT
+        )
+
+    def test_search_list_with_sequence_change(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        client.get("/pieces/?search=cancion")
+        archives_recipes.sequence_recipe.make(piece=piece, content="<p>Canción</p>")
+        response = client.get("/pieces/?search=cancion")
+        assert response[PageCacheConstants.HEADER] == PageCacheConstants.STATUS_MISS
+        assert piece.title in response.content.decode()
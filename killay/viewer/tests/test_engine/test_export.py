@@ -0,0 +1,119 @@
+import gzip
+import os
+
+import pytest
+
+from django.utils import timezone
+
+from killay.archives.lib.constants import PieceConstants
+from killay.archives.models import Provider
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.export import (
+    export_site,
+    get_export_urls,
+    get_file_name,
+    get_piece_list_urls,
+    get_site_fingerprint,
+    read_manifest,
+)
+
+HOST = "testserver"
+
+
+def test_get_file_name():
+    assert get_file_name("/") == "index.html"
+    assert get_file_name("/pieces/abc/") == "pieces/abc/index.html"
+    assert (
+        get_file_name("/pieces/?kind=VIDEO&person=ana")
+        == "pieces/index~kind=VIDEO&person=ana.html"
+    )
+
+
+@pytest.mark.django_db
+class TestExportUrls:
+    def test_urls(self, page):
+        piece = archives_recipes.piece_recipe.make()
+        hidden_piece = archives_recipes.piece_recipe.make(is_published=False)
+        page.is_visible = True
+        page.save()
+        urls = get_export_urls()
+        assert "/archives/" in urls
+        assert f"/archives/{piece.collection.archive.slug}/" in urls
+        assert f"/pieces/{piece.code}/" in urls
+        assert f"/pieces/{hidden_piece.code}/" not in urls
+        assert f"/pieces/?collection={piece.collection.slug}" in urls
+        assert f"/pages/{page.slug}/" in urls
+
+    def test_piece_list_depth(self):
+        piece = archives_recipes.piece_recipe.make()
+        person = piece.people.first()
+        kinds = len(PieceConstants.KIND_CHOICES)
+        assert len(get_piece_list_urls(depth=0)) == 1
+        single_urls = get_piece_list_urls(depth=1)
+        assert f"/pieces/?person={person.slug}" in single_urls
+        urls = get_piece_list_urls(depth=2)
+        assert f"/pieces/?kind=VIDEO&person={person.slug}" in urls
+        # two kinds or two collections are never combined
+        assert "/pieces/?kind=IMAGE&kind=VIDEO" not in urls
+        assert len(urls) > len(single_urls) + kinds
+
+
+@pytest.mark.django_db
+def test_site_fingerprint_without_provider_checks():
+    provider = archives_recipes.provider_recipe.make(active=True)
+    fingerprint = get_site_fingerprint()
+    Provider.objects.update(online=True, checked_at=timezone.now())
+    assert get_site_fingerprint() == fingerprint
+    Provider.objects.filter(id=provider.id).update(active=False)
+    assert get_site_fingerprint() != fingerprint
+
+
+@pytest.mark.django_db
+class TestExportSite:
+    def test_export(self, tmpdir):
+        piece = archives_recipes.piece_recipe.make(title="Exportada")
+        output_dir = tmpdir.strpath
+        report = export_site(output_dir=output_dir, host=HOST)
+        assert not report["failed"]
+        manifest = read_manifest(output_dir=output_dir)
+        entry = manifest["pages"][f"/pieces/{piece.code}/"]
+        path = os.path.join(output_dir, entry["file"])
+        with open(f"{path}.gz", "rb") as gzip_file:
+            assert "Exportada" in gzip.decompress(gzip_file.read()).decode()
+        assert entry["last_modified"]
+        assert manifest["pages"]["/"]["redirect"] == "/archives/"
+
+    def test_incremental(self, tmpdir):
+        piece = archives_recipes.piece_recipe.make()
+        other_piece = archives_recipes.piece_recipe.make()
+        output_dir = tmpdir.strpath
+        first_report = export_site(output_dir=output_dir, host=HOST)
+        report = export_site(output_dir=output_dir, host=HOST)
+        # the pages without a date, the redirects and the piece lists, are
+        # always exported
+        dateless = [
+            url
+            for url in first_report["exported"]
+            if url == "/" or url.split("?")[0] == "/pieces/"
+        ]
+        assert "/pieces/" in dateless
+        assert report["exported"] == dateless
+        assert len(report["skipped"]) == len(first_report["exported"]) - len(dateless)
+        piece.meta.description = "Nueva descripción"
+        piece.meta.save()
+        report = export_site(output_dir=output_dir, host=HOST)
+        assert f"/pieces/{piece.code}/" in report["exported"]
+        assert f"/pieces/{other_piece.code}/" in report["skipped"]
+        report = export_site(output_dir=output_dir, host=HOST, full=True)
+        assert not report["skipped"]
+
+    def test_removed(self, tmpdir):
+        piece = archives_recipes.piece_recipe.make()
+        output_dir = tmpdir.strpath
+        export_site(output_dir=output_dir, host=HOST)
+        file_name = read_manifest(output_dir)["pages"][f"/pieces/{piece.code}/"]["file"]
+        piece.is_published = False
+        piece.save()
+        report = export_site(output_dir=output_dir, host=HOST)
+        assert f"/pieces/{piece.code}/" in report["removed"]
+        assert not os.path.exists(os.path.join(output_dir, file_name))
@@ -0,0 +1,23 @@
+import pytest
+
+from killay.viewer.engine.media import get_byte_range
+
+
+def test_get_byte_range():
+    assert get_byte_range(header="bytes=0-99", size=1000) == (0, 99)
+    assert get_byte_range(header="bytes=900-", size=1000) == (900, 999)
+    assert get_byte_range(header="bytes=900-2000", size=1000) == (900, 999)
+    assert get_byte_range(header="bytes=-100", size=1000) == (900, 999)
+    assert get_byte_range(header="bytes=-2000", size=1000) == (0, 999)
+
+
+def test_get_byte_range_ignored():
+    assert get_byte_range(header="bytes=0-9,20-29", size=1000) is None
+    assert get_byte_range(header="items=0-9", size=1000) is None
+    assert get_byte_range(header="bytes=-", size=1000) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=20-10", "bytes=-0"])
+def test_get_byte_range_not_satisfiable(header):
+    with pytest.raises(ValueError):
+        get_byte_range(header=header, size=1000)
@@ -0,0 +1,99 @@
+import pytest
+
+from killay.archives.models import Piece
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.pagination import (
+    decode_cursor,
+    encode_cursor,
+    get_cached_count,
+    get_keyset_page,
+)
+from killay.viewer.lib.constants import PaginationConstants
+
+
+def test_encode_and_decode_cursor():
+    cursor = encode_cursor(
+        values=["Title", "code", 1], direction=PaginationConstants.DIRECTION_NEXT
+    )
+    assert decode_cursor(cursor=cursor) == (
+        PaginationConstants.DIRECTION_NEXT,
+        ["Title", "code", 1],
+    )
+
+
+@pytest.mark.parametrize("cursor", [None, "", "invalid", "a:b:c"])
+def test_decode_invalid_cursor(cursor):
+    assert decode_cursor(cursor=cursor) is None
+
+
+@pytest.mark.django_db
+class TestGetKeysetPage:
+    def make_pieces(self):
+        archives_recipes.piece_recipe.make(title="B", code="b-2")
+        archives_recipes.piece_recipe.make(title="A", code="a-1")
+        archives_recipes.piece_recipe.make(title="B", code="b-1")
+        archives_recipes.piece_recipe.make(title="C", code="c-1")
+        archives_recipes.piece_recipe.make(title="D", code="d-1")
+
+    def test_first_page(self):
+        self.make_pieces()
+        page = get_keyset_page(queryset=Piece.objects.all(), cursor=None, per_page=2)
+        assert [piece.code for piece in page] == ["a-1", "b-1"]
+        assert page.has_next()
+        assert not page.has_previous()
+
+    def test_walk_forward_and_backward(self):
+        self.make_pieces()
+        queryset = Piece.objects.all()
+        first_page = get_keyset_page(queryset=queryset, cursor=None, per_page=2)
+        second_page = get_keyset_page(
+            queryset=queryset, cursor=first_page.next_cursor, per_page=2
+        )
+        assert [piece.code for piece in second_page] == ["b-2", "c-1"]
+        assert second_page.has_previous()
+        last_page = get_keyset_page(
+            queryset=queryset, cursor=second_page.next_cursor, per_page=2
+        )
+        assert [piece.code for piece in last_page] == ["d-1"]
+        assert not last_page.has_next()
+        previous_page = get_keyset_page(
+            queryset=queryset, cursor=last_page.previous_cursor, per_page=2
+        )
+        assert [piece.code for piece in previous_page] == ["b-2", "c-1"]
+        assert previous_page.has_next()
+        assert previous_page.has_previous()
+        back_to_first_page = get_keyset_page(
+            queryset=queryset, cursor=previous_page.previous_cursor, per_page=2
+        )
+        assert [piece.code for piece in back_to_first_page] == ["a-1", "b-1"]
+        assert not back_to_first_page.has_previous()
+
+    def test_constant_queries(self, django_assert_num_queries):
+        self.make_pieces()
+        queryset = Piece.objects.all()
+        first_page = get_keyset_page(queryset=queryset, cursor=None, per_page=1)
+        with django_assert_num_queries(1):
+            page = get_keyset_page(
+                queryset=queryset, cursor=first_page.next_cursor, per_page=1
+            )
+        assert [piece.code for piece in page] == ["b-1"]
+
+
+@pytest.mark.django_db
+class TestGetCachedCount:
+    def test_counts_once_by_generation(self, django_assert_num_queries):
+        archives_recipes.piece_recipe.make(_quantity=2)
+        queryset = Piece.objects.all()
+        assert get_cached_count(queryset=queryset, generation="1") == 2
+        archives_recipes.piece_recipe.make()
+        with django_assert_num_queries(0):
+            assert get_cached_count(queryset=queryset, generation="1") == 2
+        assert get_cached_count(queryset=queryset, generation="2") == 3
+
+    def test_counts_by_filters(self):
+        archives_recipes.piece_recipe.make(title="A")
+        archives_recipes.piece_recipe.make(title="B")
+        queryset = Piece.objects.all()
+        assert get_cached_count(queryset=queryset, generation="1") == 2
+        filtered = queryset.filter(title="A")
+        assert get_cached_count(queryset=filtered, generation="1") == 1
@@ -346,6 +346,10 @@ class TestContentPipeline:
         category = archives_recipes.category_recipe.make(collection_id=collection.id)
         person = archives_recipes.person_recipe.make()
         keyword = archives_recipes.keyword_recipe.make()
+        piece = archives_recipes.piece_recipe.make(collection=collection)
+        piece.categories.set([category])
+        piece.people.set([person])
+        piece.keywords.set([keyword])
         request = get_request_with_viewer()
         pipeline = ContentPipeline(request=request)
         filter_options = pipeline.get_filter_options()
@@ -363,3 +367,4 @@ class TestContentPipeline:
         assert filter_options["person"]["items"][0]["slug"] == person.slug
         assert "keyword" in filter_options
         assert filter_options["keyword"]["items"][0]["slug"] == keyword.slug
+        assert filter_options["keyword"]["items"][0]["total"] == 1
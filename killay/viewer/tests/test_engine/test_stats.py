@@ -0,0 +1,148 @@
+from unittest import mock
+
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from killay.archives.models import Archive
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.stats import (
+    count_view,
+    flush_views,
+    spill_views,
+    view_buffer,
+)
+from killay.viewer.lib.constants import ContentStatsConstants, PageCacheConstants
+from killay.viewer.models import ContentStats
+
+
+def _get_views(instance) -> int:
+    content_type = ContentType.objects.get_for_model(instance)
+    stats = ContentStats.objects.filter(
+        content_type=content_type, object_id=instance.id
+    ).first()
+    return stats.views if stats else 0
+
+
+@pytest.mark.django_db
+class TestViewCount:
+    def test_no_queries(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        client.get(f"/pieces/{piece.code}/")
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f"/pieces/{piece.code}/")
+        assert response[PageCacheConstants.HEADER] == PageCacheConstants.STATUS_HIT
+        # only the validators of the page are read
+        assert not any(
+            ContentStats._meta.db_table in query["sql"]
+            for query in context.captured_queries
+        )
+        assert not ContentStats.objects.exists()
+        assert sum(view_buffer.counts.values()) == 2
+
+    def test_flush(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        archive = piece.collection.archive
+        for _ in range(3):
+            client.get(f"/pieces/{piece.code}/")
+        client.get(f"/archives/{archive.slug}/")
+        client.get("/pieces/unknown/")
+        assert flush_views() == 4
+        assert _get_views(piece) == 3
+        assert _get_views(archive) == 1
+        client.get(f"/pieces/{piece.code}/")
+        assert flush_views() == 1
+        assert _get_views(piece) == 4
+        assert ContentStats.objects.count() == 2
+
+    def test_not_modified(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        response = client.get(f"/pieces/{piece.code}/")
+        response = client.get(
+            f"/pieces/{piece.code}/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        assert response.status_code == 304
+        flush_views()
+        assert _get_views(piece) == 2
+
+    def test_staff_not_counted(self, client, admin_user):
+        piece = archives_recipes.piece_recipe.make()
+        client.force_login(admin_user)
+        client.get(f"/pieces/{piece.code}/")
+        assert flush_views() == 0
+
+    @mock.patch("killay.viewer.engine.stats.threading.Thread")
+    def test_flush_trigger(self, thread_mock, rf, settings, site_configuration):
+        settings.VIEWER_STATS_FLUSH_EVENTS = 2
+        archive = archives_recipes.archive_recipe.make()
+        request = rf.get("/")
+        request.viewer = site_configuration.viewer
+        count_view(request=request, model=Archive, field="slug", value=archive.slug)
+        assert not thread_mock.called
+        count_view(request=request, model=Archive, field="slug", value=archive.slug)
+        assert thread_mock.return_value.start.called
+        assert not view_buffer.counts
+        assert flush_views() == 2
+
+    def test_deleted_content(self, rf, site_configuration):
+        archive = archives_recipes.archive_recipe.make()
+        request = rf.get("/")
+        request.viewer = site_configuration.viewer
+        count_view(request=request, model=Archive, field="slug", value=archive.slug)
+        archive.delete()
+        assert flush_views() == 0
+
+
+@pytest.mark.django_db
+class TestFlushChunks:
+    @pytest.fixture
+    def request_with_viewer(self, rf, site_configuration):
+        request = rf.get("/")
+        request.viewer = site_configuration.viewer
+        return request
+
+    def test_chunk_written_during_flush(self, request_with_viewer):
+        archive = archives_recipes.archive_recipe.make()
+        count_view(
+            request=request_with_viewer, model=Archive, field="slug", value=archive.slug
+        )
+        # the sequence of a spill is taken but its chunk is not written yet
+        with mock.patch("killay.viewer.engine.stats.cache.set") as set_mock:
+            spill_views()
+        chunk_key, counts = set_mock.call_args_list[0][0]
+        assert flush_views() == 0
+        cache.set(chunk_key, counts, timeout=None)
+        assert flush_views() == 1
+        assert _get_views(archive) == 1
+        assert cache.get(chunk_key) is None
+
+    def test_evicted_chunk(self, request_with_viewer):
+        archive = archives_recipes.archive_recipe.make()
+        cache.set(ContentStatsConstants.SEQUENCE_KEY, 1, timeout=None)
+        for _ in range(ContentStatsConstants.PENDING_CHUNKS):
+            count_view(
+                request=request_with_viewer,
+                model=Archive,
+                field="slug",
+                value=archive.slug,
+            )
+            spill_views()
+        assert flush_views() == ContentStatsConstants.PENDING_CHUNKS
+        assert cache.get(ContentStatsConstants.FLUSHED_KEY) == (
+            ContentStatsConstants.PENDING_CHUNKS + 1
+        )
+
+    def test_lock_of_other_flush(self, request_with_viewer):
+        archive = archives_recipes.archive_recipe.make()
+        cache.set(ContentStatsConstants.LOCK_KEY, "other", timeout=None)
+        count_view(
+            request=request_with_viewer, model=Archive, field="slug", value=archive.slug
+        )
+        assert flush_views() == 0
+        assert cache.get(ContentStatsConstants.LOCK_KEY) == "other"
+        cache.delete(ContentStatsConstants.LOCK_KEY)
+        assert flush_views() == 1
+        assert cache.get(ContentStatsConstants.LOCK_KEY) is None
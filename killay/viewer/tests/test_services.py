@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+import pytest
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.utils import timezone
+
+from killay.archives.models import Piece
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.stats import flush_views
+from killay.viewer.lib.constants import PageCacheConstants, TrendingConstants
+from killay.viewer.models import ContentViewBucket, RelatedPiece
+from killay.viewer.services import (
+    get_trending_piece_ids,
+    rebuild_related_pieces,
+    rebuild_trending_pieces,
+)
+
+
+def _make_views(piece, views, days_ago=0):
+    ContentViewBucket.objects.create(
+        content_type=ContentType.objects.get_for_model(Piece),
+        object_id=piece.id,
+        day=timezone.localdate() - timedelta(days=days_ago),
+        views=views,
+    )
+
+
+@pytest.mark.django_db
+class TestTrendingPieces:
+    def test_views_in_buckets(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        client.get(f"/pieces/{piece.code}/")
+        client.get(f"/pieces/{piece.code}/")
+        flush_views()
+        bucket = ContentViewBucket.objects.get(object_id=piece.id)
+        assert bucket.day == timezone.localdate()
+        assert bucket.views == 2
+
+    def test_decayed_scores(self):
+        old_piece = archives_recipes.piece_recipe.make()
+        new_piece = archives_recipes.piece_recipe.make()
+        _make_views(old_piece, views=10, days_ago=20)
+        _make_views(new_piece, views=4)
+        _make_views(new_piece, views=100, days_ago=TrendingConstants.WINDOW_DAYS)
+        # both pieces in the list of the site and each one in its archive
+        assert rebuild_trending_pieces() == 4
+        assert get_trending_piece_ids(place_id=None) == [new_piece.id, old_piece.id]
+        assert get_trending_piece_ids(
+            place_id=None, archive_id=old_piece.collection.archive_id
+        ) == [old_piece.id]
+        # the buckets out of the ranked days are deleted
+        assert ContentViewBucket.objects.count() == 2
+
+    def test_by_place(self):
+        place = archives_recipes.place_recipe.make()
+        piece = archives_recipes.piece_recipe.make()
+        restricted_piece = archives_recipes.piece_recipe.make(is_restricted=True)
+        place.allowed_pieces.add(restricted_piece)
+        _make_views(piece, views=1)
+        _make_views(restricted_piece, views=5)
+        rebuild_trending_pieces()
+        assert get_trending_piece_ids(place_id=None) == [piece.id]
+        assert get_trending_piece_ids(place_id=place.id) == [
+            restricted_piece.id,
+            piece.id,
+        ]
+
+    def test_read_from_cache(self, django_assert_num_queries):
+        piece = archives_recipes.piece_recipe.make()
+        _make_views(piece, views=1)
+        rebuild_trending_pieces()
+        get_trending_piece_ids(place_id=None)
+        with django_assert_num_queries(0):
+            assert get_trending_piece_ids(place_id=None) == [piece.id]
+        ContentViewBucket.objects.all().delete()
+        rebuild_trending_pieces()
+        assert get_trending_piece_ids(place_id=None) == []
+
+    def test_archive_pages(self, client):
+        piece = archives_recipes.piece_recipe.make(title="Muy vista")
+        archive = piece.collection.archive
+        assert "Muy vista" not in client.get("/archives/").content.decode()
+        _make_views(piece, views=3)
+        call_command("rebuild_trending")
+        response = client.get("/archives/")
+        assert response[PageCacheConstants.HEADER] == PageCacheConstants.STATUS_MISS
+        assert response.context["trending_pieces"] == [piece]
+        assert f"/pieces/{piece.code}/" in response.content.decode()
+        response = client.get(f"/archives/{archive.slug}/")
+        assert response.context["trending_pieces"] == [piece]
+        piece.is_published = False
+        piece.save()
+        response = client.get("/archives/")
+        assert response.context["trending_pieces"] == []
+
+
+def _get_related_ids(piece):
+    return list(
+        RelatedPiece.objects.filter(piece=piece).values_list(
+            "related_piece_id", flat=True
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestRelatedPieces:
+    @pytest.fixture
+    def pieces(self):
+        keyword, other_keyword = archives_recipes.keyword_recipe.make(_quantity=2)
+        person = archives_recipes.person_recipe.make()
+        pieces = archives_recipes.piece_recipe.make(_quantity=4)
+        pieces[0].keywords.add(keyword, other_keyword)
+        pieces[0].people.add(person)
+        # shares the two keywords and the person
+        pieces[1].keywords.add(keyword, other_keyword)
+        pieces[1].people.add(person)
+        # shares one keyword
+        pieces[2].keywords.add(keyword)
+        return pieces
+
+    def test_ranked_by_shared_terms(self, pieces):
+        assert rebuild_related_pieces() == 3
+        assert _get_related_ids(pieces[0]) == [pieces[1].id, pieces[2].id]
+        assert _get_related_ids(pieces[2]) == [pieces[0].id, pieces[1].id]
+        assert _get_related_ids(pieces[3]) == []
+        scores = RelatedPiece.objects.filter(piece=pieces[0]).values_list(
+            "score", flat=True
+        )
+        assert scores[0] == pytest.approx(1)
+        assert 0 < scores[1] < 1
+
+    def test_unpublished_left_out(self, pieces):
+        pieces[1].is_published = False
+        pieces[1].save()
+        rebuild_related_pieces()
+        assert _get_related_ids(pieces[0]) == [pieces[2].id]
+        assert _get_related_ids(pieces[1]) == []
+
+    def test_piece_page(self, client, pieces):
+        place = archives_recipes.place_recipe.make()
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        pieces[1].is_restricted = True
+        pieces[1].save()
+        place.allowed_pieces.add(pieces[1])
+        path = f"/pieces/{pieces[0].code}/"
+        assert client.get(path).context["related_pieces"] == []
+        call_command("rebuild_related_pieces")
+        response = client.get(path)
+        assert response[PageCacheConstants.HEADER] == PageCacheConstants.STATUS_MISS
+        assert response.context["related_pieces"] == [pieces[2]]
+        assert f"/pieces/{pieces[2].code}/" in response.content.decode()
+        response = client.get(path, REMOTE_ADDR="10.0.0.1")
+        assert response.context["related_pieces"] == [pieces[1], pieces[2]]
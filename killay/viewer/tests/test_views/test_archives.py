@@ -1,5 +1,7 @@
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from killay.archives.tests import recipes as archives_recipes
 from killay.viewer.lib.constants import ViewerConstants
@@ -16,6 +18,39 @@ class TestArchiveList:
         assert response.status_code == 200
         assert response.context["archive_list"][0]["slug"] == archive.slug
 
+    def test_image_srcsets(self, client, image):
+        archives_recipes.archive_recipe.make(image=image)
+        response = client.get(self.path)
+        srcsets = response.context["archive_list"][0]["image_srcsets"]
+        assert "/archive_images/thumbnails/image-640w.webp 640w" in srcsets["webp"]
+        assert srcsets["jpeg"] in response.content.decode()
+
+    def test_constant_queries(self, client, settings):
+        settings.VIEWER_PAGE_CACHE_TIMEOUT = 0
+
+        def make_archives(quantity):
+            for archive in archives_recipes.archive_recipe.make(_quantity=quantity):
+                archives_recipes.collection_recipe.make(archive=archive, _quantity=3)
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(self.path)
+            assert response.status_code == 200
+            return len(context.captured_queries)
+
+        # the first request after a change also reloads the configuration cache
+        make_archives(quantity=1)
+        count_queries()
+        few_queries = count_queries()
+        make_archives(quantity=5)
+        count_queries()
+        assert count_queries() == few_queries
+        response = client.get(self.path)
+        assert all(
+            archive["collections"]["total"] == 3
+            for archive in response.context["archive_list"]
+        )
+
     def test_out_of_scope(self, client, site_configuration):
         archive = archives_recipes.archive_recipe.make()
         site_configuration.viewer.scope = ViewerConstants.SCOPE_ONE_ARCHIVE
@@ -0,0 +1,157 @@
+import os
+
+import pytest
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from killay.admin.models import SiteConfiguration
+from killay.archives.lib.constants import PieceConstants, ThumbnailConstants
+from killay.archives.tests import recipes as archives_recipes
+from killay.archives.thumbnails import get_thumbnail_name
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def piece():
+    piece = archives_recipes.piece_recipe.make(kind=PieceConstants.KIND_SOUND)
+    archives_recipes.provider_recipe.make(
+        piece=piece,
+        active=True,
+        file=SimpleUploadedFile("sound.mp3", CONTENT, content_type="audio/mpeg"),
+    )
+    return piece
+
+
+def _get_path(piece, field="file"):
+    return f"/pieces/{piece.code}/media/{field}/"
+
+
+@pytest.mark.django_db
+class TestPieceMediaView:
+    def test_whole_file(self, client, piece):
+        response = client.get(_get_path(piece))
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == CONTENT
+        assert response["Content-Type"] == "audio/mpeg"
+        assert response["Content-Length"] == str(len(CONTENT))
+        assert response["Accept-Ranges"] == "bytes"
+
+    def test_range(self, client, piece):
+        response = client.get(_get_path(piece), HTTP_RANGE="bytes=100-199")
+        assert response.status_code == 206
+        assert b"".join(response.streaming_content) == CONTENT[100:200]
+        assert response["Content-Range"] == f"bytes 100-199/{len(CONTENT)}"
+        assert response["Content-Length"] == "100"
+
+    def test_range_not_satisfiable(self, client, piece):
+        response = client.get(_get_path(piece), HTTP_RANGE="bytes=5000-")
+        assert response.status_code == 416
+        assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+    def test_range_of_other_version(self, client, piece):
+        response = client.get(
+            _get_path(piece), HTTP_RANGE="bytes=100-199", HTTP_IF_RANGE='"old"'
+        )
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == CONTENT
+
+    def test_not_modified(self, client, piece):
+        etag = client.get(_get_path(piece))["ETag"]
+        response = client.get(_get_path(piece), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+
+    def test_accel_redirect(self, client, piece, settings):
+        settings.VIEWER_MEDIA_ACCEL_PREFIX = "/internal-media/"
+        response = client.get(_get_path(piece), HTTP_RANGE="bytes=100-199")
+        assert response.status_code == 200
+        assert response.content == b""
+        file_name = piece.active_provider.file.name
+        assert response["X-Accel-Redirect"] == f"/internal-media/{file_name}"
+
+    def test_out_of_public_media(self, piece, settings):
+        field_file = piece.active_provider.file
+        assert field_file.path.startswith(settings.PROTECTED_MEDIA_ROOT)
+        assert not os.path.exists(os.path.join(settings.MEDIA_ROOT, field_file.name))
+        assert field_file.url == f"/protected-media/{field_file.name}"
+
+    def test_restricted_piece(self, client, piece):
+        place = archives_recipes.place_recipe.make()
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        piece.is_restricted = True
+        piece.save()
+        assert client.get(_get_path(piece)).status_code == 404
+        assert client.get(_get_path(piece), REMOTE_ADDR="10.0.0.1").status_code == 404
+        piece.allowed_places.add(place)
+        assert client.get(_get_path(piece), REMOTE_ADDR="10.0.0.1").status_code == 200
+
+    def test_field_of_other_kind(self, client, piece):
+        assert client.get(_get_path(piece, field="image")).status_code == 404
+
+    def test_inactive_provider(self, client, piece):
+        piece.providers.update(active=False)
+        assert client.get(_get_path(piece)).status_code == 404
+
+    def test_unpublished_site(self, client, piece):
+        SiteConfiguration.objects.update(is_published=False)
+        assert client.get(_get_path(piece)).status_code == 404
+
+    def test_player_url(self, client, piece):
+        response = client.get(f"/pieces/{piece.code}/")
+        assert f'src="{_get_path(piece)}"' in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestPieceImageMedia:
+    @pytest.fixture
+    def piece(self, image):
+        piece = archives_recipes.piece_recipe.make(
+            kind=PieceConstants.KIND_IMAGE, is_restricted=True
+        )
+        archives_recipes.provider_recipe.make(piece=piece, active=True, image=image)
+        place = archives_recipes.place_recipe.make()
+        archives_recipes.place_address_recipe.make(place=place, ipv4="10.0.0.1")
+        place.allowed_pieces.add(piece)
+        return piece
+
+    def test_thumbnails_behind_access(self, client, piece):
+        path = f"/pieces/{piece.code}/"
+        response = client.get(path, REMOTE_ADDR="10.0.0.1")
+        content = response.content.decode()
+        thumbnail_path = _get_path(piece, field="image") + "640/webp/"
+        assert f"{thumbnail_path} 640w" in content
+        assert "/media/piece_images" not in content
+        response = client.get(thumbnail_path, REMOTE_ADDR="10.0.0.1")
+        assert response.status_code == 200
+        assert response["Content-Type"] == "image/webp"
+        assert client.get(thumbnail_path).status_code == 404
+
+    def test_thumbnails_out_of_public_media(self, piece, settings):
+        name = get_thumbnail_name(
+            name=piece.active_provider.image.name,
+            width=640,
+            image_format=ThumbnailConstants.FORMAT_WEBP,
+        )
+        assert os.path.exists(os.path.join(settings.PROTECTED_MEDIA_ROOT, name))
+        assert not os.path.exists(os.path.join(settings.MEDIA_ROOT, name))
+
+    def test_unknown_thumbnail(self, client, piece):
+        path = _get_path(piece, field="image")
+        for thumbnail in ["100/webp/", "640/gif/"]:
+            response = client.get(f"{path}{thumbnail}", REMOTE_ADDR="10.0.0.1")
+            assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestProtectedMediaView:
+    def test_only_administrators(self, client, piece, admin_user):
+        path = piece.active_provider.file.url
+        assert client.get(path).status_code == 404
+        client.force_login(admin_user)
+        response = client.get(path)
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == CONTENT
+
+    def test_missing_file(self, client, admin_user):
+        client.force_login(admin_user)
+        assert client.get("/protected-media/piece_files/missing.mp3").status_code == 404
@@ -1,7 +1,14 @@
+from datetime import time
+
 import pytest
 
-from killay.archives.lib.constants import PieceConstants
+from killay.admin.models import SiteConfiguration
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from killay.archives.lib.constants import PieceConstants, ProviderConstants
 from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.lib.constants import ViewerConstants
 
 
 @pytest.mark.django_db
@@ -15,6 +22,42 @@ class TestPieceListView:
         assert response.context["page_obj"][0].id == piece.id
         assert response.context["specific_context"] is None
 
+    def test_thumbnail(self, client, image):
+        archives_recipes.piece_recipe.make(thumb=image)
+        response = client.get(self.path)
+        assert "/piece_thumbs/thumbnails/image-640w.webp" in response.content.decode()
+
+    def test_constant_queries(self, client, settings):
+        settings.VIEWER_PAGE_CACHE_TIMEOUT = 0
+        collection = archives_recipes.collection_recipe.make()
+
+        def make_pieces(quantity):
+            for piece in archives_recipes.piece_recipe.make(
+                collection=collection, _quantity=quantity
+            ):
+                archives_recipes.provider_recipe.make(
+                    piece=piece,
+                    active=True,
+                    plyr_provider=ProviderConstants.YOUTUBE,
+                    ply_embed_id=piece.code,
+                )
+                piece.meta.duration = time(0, 1, 30)
+                piece.meta.save()
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(self.path)
+            assert "i.ytimg.com" in response.content.decode()
+            return len(context.captured_queries)
+
+        # the first request after a change also reloads the configuration cache
+        make_pieces(quantity=2)
+        count_queries()
+        few_queries = count_queries()
+        make_pieces(quantity=52)
+        count_queries()
+        assert count_queries() == few_queries
+
     def test_with_query_search(self, client):
         piece = archives_recipes.piece_recipe.make()
         response = client.get(f"{self.path}?search={piece.title}")
@@ -22,6 +65,20 @@ class TestPieceListView:
         assert response.context["page_obj"][0].id == piece.id
         assert response.context["specific_context"] is None
 
+    def test_with_query_search_in_sequence(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        archives_recipes.sequence_recipe.make(
+            piece=piece,
+            content="<p>Una canción</p>",
+            ini=time(0, 12, 31),
+            end=time(0, 13),
+        )
+        response = client.get(f"{self.path}?search=cancion")
+        assert response.status_code == 200
+        assert response.context["page_obj"][0].id == piece.id
+        assert f"{piece.code}#sequence-1-751-780" in response.content.decode()
+        assert "matched at 00:12:31" in response.content.decode()
+
     def test_with_keyword(self, client):
         piece = archives_recipes.piece_recipe.make()
         keyword = piece.keywords.first()
@@ -29,6 +86,17 @@ class TestPieceListView:
         assert response.context["page_obj"][0].id == piece.id
         assert response.context["specific_context"]["title"] == keyword.name
 
+    def test_with_keyword_facet_counts(self, client):
+        piece = archives_recipes.piece_recipe.make()
+        other_piece = archives_recipes.piece_recipe.make()
+        keyword = piece.keywords.first()
+        other_keyword = other_piece.keywords.first()
+        response = client.get(f"{self.path}?keyword={keyword.slug}")
+        keyword_items = response.context["search"]["filter_options"]["keyword"]["items"]
+        assert [item["slug"] for item in keyword_items] == [keyword.slug]
+        assert f"{keyword.name} (1)" in response.content.decode()
+        assert other_keyword.name not in response.content.decode()
+
     def test_with_person(self, client):
         piece = archives_recipes.piece_recipe.make()
         person = piece.people.first()
@@ -48,6 +116,49 @@ class TestPieceListView:
         assert response.context["page_obj"][0].id == piece.id
         assert response.context["specific_context"]["title"] == category.name
 
+    def test_with_keyset_pagination(self, client):
+        viewer = SiteConfiguration.objects.current().viewer
+        viewer.pagination = ViewerConstants.PAGINATION_CURSOR
+        viewer.save()
+        pieces = archives_recipes.piece_recipe.make(
+            title="Canción", kind=PieceConstants.KIND_SOUND, _quantity=55
+        )
+        archives_recipes.piece_recipe.make(kind=PieceConstants.KIND_IMAGE)
+        response = client.get(f"{self.path}?kind={PieceConstants.KIND_SOUND}")
+        assert response.status_code == 200
+        assert response.context["paginator"] is None
+        assert response.context["total_founded"] == "55 pieces were found"
+        assert len(response.context["page_obj"]) == 54
+        next_link = response.context["pagination"][2]["link"]
+        assert next_link.startswith(f"?kind={PieceConstants.KIND_SOUND}&cursor=")
+        response = client.get(f"{self.path}{next_link}")
+        last_piece = max(pieces, key=lambda piece: piece.code)
+        assert [piece.id for piece in response.context["page_obj"]] == [last_piece.id]
+        assert response.context["pagination"][1]["link"]
+        assert response.context["pagination"][2]["disabled"]
+        assert response.context["total_founded"] == "55 pieces were found"
+
+    def test_keyset_total_follows_changes(self, client):
+        viewer = SiteConfiguration.objects.current().viewer
+        viewer.pagination = ViewerConstants.PAGINATION_CURSOR
+        viewer.save()
+        archives_recipes.piece_recipe.make(kind=PieceConstants.KIND_SOUND)
+        path = f"{self.path}?kind={PieceConstants.KIND_SOUND}"
+        response = client.get(path)
+        assert response.context["total_founded"] == "1 pieces were found"
+        archives_recipes.piece_recipe.make(kind=PieceConstants.KIND_SOUND)
+        response = client.get(path)
+        assert response.context["total_founded"] == "2 pieces were found"
+
+    def test_with_keyset_pagination_and_query_search(self, client):
+        viewer = SiteConfiguration.objects.current().viewer
+        viewer.pagination = ViewerConstants.PAGINATION_CURSOR
+        viewer.save()
+        piece = archives_recipes.piece_recipe.make()
+        response = client.get(f"{self.path}?search={piece.title}")
+        assert response.context["paginator"] is not None
+        assert response.context["page_obj"][0].id == piece.id
+
 
 @pytest.mark.django_db
 class TestPieceDetailView:
@@ -0,0 +1,87 @@
+import os
+
+from unittest import mock
+
+import pytest
+
+from django.core.management import call_command
+
+from killay.archives.tests import recipes as archives_recipes
+from killay.viewer.engine.sitemaps import generate_sitemaps
+from killay.viewer.lib.constants import SitemapConstants
+
+BASE_URL = "https://example.org"
+
+
+@pytest.fixture
+def sitemap_root(settings, tmpdir):
+    settings.VIEWER_SITEMAP_ROOT = tmpdir.join("sitemaps").strpath
+    return settings.VIEWER_SITEMAP_ROOT
+
+
+def _read(directory, name):
+    with open(os.path.join(directory, name)) as sitemap_file:
+        return sitemap_file.read()
+
+
+@pytest.mark.django_db
+class TestGenerateSitemaps:
+    def test_sections(self, sitemap_root):
+        piece = archives_recipes.piece_recipe.make()
+        hidden_piece = archives_recipes.piece_recipe.make(is_published=False)
+        files = generate_sitemaps(directory=sitemap_root, base_url=BASE_URL)
+        assert [name for name, _ in files][:3] == [
+            "archives-1.xml",
+            "collections-1.xml",
+            "pieces-1.xml",
+        ]
+        pieces = _read(sitemap_root, "pieces-1.xml")
+        assert f"<loc>{BASE_URL}/pieces/{piece.code}/</loc>" in pieces
+        assert hidden_piece.code not in pieces
+        collections = _read(sitemap_root, "collections-1.xml")
+        assert f"/pieces/?collection={piece.collection.slug}</loc>" in collections
+        index = _read(sitemap_root, SitemapConstants.INDEX_NAME)
+        assert f"<loc>{BASE_URL}/sitemaps/pieces-1.xml</loc>" in index
+        mtime = os.stat(os.path.join(sitemap_root, "pieces-1.xml")).st_mtime
+        assert int(mtime) == int(piece.updated_at.timestamp())
+
+    @mock.patch.object(SitemapConstants, "CHUNK_SIZE", 2)
+    def test_chunks(self, sitemap_root):
+        collection = archives_recipes.collection_recipe.make()
+        archives_recipes.piece_recipe.make(collection=collection, _quantity=5)
+        files = generate_sitemaps(directory=sitemap_root, base_url=BASE_URL)
+        names = [name for name, _ in files if name.startswith("pieces")]
+        assert names == ["pieces-1.xml", "pieces-2.xml", "pieces-3.xml"]
+        assert _read(sitemap_root, "pieces-3.xml").count("<url>") == 1
+
+    def test_stale_files_removed(self, sitemap_root):
+        os.makedirs(sitemap_root)
+        open(os.path.join(sitemap_root, "pieces-9.xml"), "w").close()
+        call_command("generate_sitemaps", "--base-url", BASE_URL)
+        assert not os.path.exists(os.path.join(sitemap_root, "pieces-9.xml"))
+        assert os.path.exists(os.path.join(sitemap_root, SitemapConstants.INDEX_NAME))
+
+
+@pytest.mark.django_db
+class TestSitemapView:
+    def test_index(self, client, sitemap_root):
+        archives_recipes.piece_recipe.make()
+        generate_sitemaps(directory=sitemap_root, base_url=BASE_URL)
+        response = client.get("/sitemap.xml")
+        assert response.status_code == 200
+        assert response["Content-Type"] == SitemapConstants.CONTENT_TYPE
+        assert b"<sitemapindex" in b"".join(response.streaming_content)
+        response = client.get(
+            "/sitemap.xml", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        assert response.status_code == 304
+
+    def test_section(self, client, sitemap_root):
+        archives_recipes.piece_recipe.make()
+        generate_sitemaps(directory=sitemap_root, base_url=BASE_URL)
+        assert client.get("/sitemaps/pieces-1.xml").status_code == 200
+        assert client.get("/sitemaps/pieces-2.xml").status_code == 404
+        assert client.get("/sitemaps/..sitemap.xml").status_code == 404
+
+    def test_not_generated(self, client, sitemap_root):
+        assert client.get("/sitemap.xml").status_code == 404
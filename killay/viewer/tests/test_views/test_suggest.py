@@ -0,0 +1,44 @@
+import pytest
+
+from killay.admin.models import SiteConfiguration
+from killay.archives.tests import recipes as archives_recipes
+
+
+@pytest.mark.django_db
+class TestSuggestView:
+    path = "/suggest/"
+
+    def test_default(self, client):
+        piece = archives_recipes.piece_recipe.make(title="Canción")
+        category = piece.categories.first()
+        category.name = "Cantos"
+        category.collection = piece.collection
+        category.save()
+        response = client.get(f"{self.path}?q=can")
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results["pieces"]["results"] == [
+            {"title": piece.title, "url": f"/pieces/{piece.code}/"}
+        ]
+        assert results["categories"]["results"] == [
+            {
+                "title": category.name,
+                "url": (
+                    f"/pieces/?collection={piece.collection.slug}"
+                    f"&category={category.slug}"
+                ),
+            }
+        ]
+        assert "people" not in results
+
+    def test_empty_query(self, client):
+        response = client.get(self.path)
+        assert response.status_code == 200
+        assert response.json() == {"results": {}}
+
+    def test_not_published(self, client):
+        configuration = SiteConfiguration.objects.current()
+        configuration.is_published = False
+        configuration.save()
+        response = client.get(f"{self.path}?q=can")
+        assert response.status_code == 403
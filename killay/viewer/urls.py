@@ -5,8 +5,11 @@ from killay.viewer.views.archives import (
     archive_list_view,
     archive_detail_view,
 )
+from killay.viewer.views.media import piece_media_view
 from killay.viewer.views.pieces import piece_detail_view, piece_list_view
 from killay.viewer.views.root import root_view
+from killay.viewer.views.sitemaps import sitemap_view
+from killay.viewer.views.suggest import suggest_view
 
 
 app_name = ViewerPatternConstants.APP_NAME
@@ -38,4 +41,29 @@ urlpatterns = [
         view=piece_detail_view,
         name=ViewerPatternConstants.PIECE_DETAIL,
     ),
+    path(
+        "pieces/<str:slug>/media/<str:field>/",
+        view=piece_media_view,
+        name=ViewerPatternConstants.PIECE_MEDIA,
+    ),
+    path(
+        "pieces/<str:slug>/media/<str:field>/<int:width>/<str:image_format>/",
+        view=piece_media_view,
+        name=ViewerPatternConstants.PIECE_MEDIA_THUMBNAIL,
+    ),
+    path(
+        "suggest/",
+        view=suggest_view,
+        name=ViewerPatternConstants.SUGGEST,
+    ),
+    path(
+        "sitemap.xml",
+        view=sitemap_view,
+        name=ViewerPatternConstants.SITEMAP_INDEX,
+    ),
+    path(
+        "sitemaps/<str:file_name>",
+        view=sitemap_view,
+        name=ViewerPatternConstants.SITEMAP,
+    ),
 ]
@@ -1,5 +1,6 @@
+from killay.archives.models import Archive
 from killay.viewer.lib.constants import ViewerConstants, ViewerMessageConstants
-from killay.viewer.engine.pipelines import ContentPipeline
+from killay.viewer.engine.pipelines import ContentPipeline, ValidatorPipeline
 from killay.viewer.views.mixins import ViewerViewBase
 
 
@@ -10,6 +11,10 @@ class ArchiveListView(ViewerViewBase):
         ViewerConstants.SCOPE_ONE_COLLECTION,
     ]
 
+    def get_page_validators(self):
+        pipeline = ValidatorPipeline(request=self.request)
+        return pipeline.get_archive_list_validators()
+
     def get_view_context_data(self, *args, **kwargs):
         self.pipeline = ContentPipeline(request=self.request)
         archives = self.pipeline.get_archives()
@@ -20,6 +25,7 @@ class ArchiveListView(ViewerViewBase):
             **ViewerMessageConstants.GENERAL_CONTEXT,
             "archive_list": archives,
             "archives_list_label": archives_list_label,
+            "trending_pieces": self.pipeline.get_trending_pieces(),
         }
 
 
@@ -28,10 +34,15 @@ archive_list_view = ArchiveListView.as_view()
 
 class ArchiveDetailView(ViewerViewBase):
     template_name = "viewer/archive-detail.html"
+    count_model = Archive
     out_of_scope = [
         ViewerConstants.SCOPE_ONE_COLLECTION,
     ]
 
+    def get_page_validators(self):
+        pipeline = ValidatorPipeline(request=self.request)
+        return pipeline.get_archive_validators(slug=self.kwargs.get("slug"))
+
     def get_view_context_data(self, *args, **kwargs):
         pipeline = ContentPipeline(request=self.request)
         archive = pipeline.get_archive_by_slug()
@@ -39,6 +50,9 @@ class ArchiveDetailView(ViewerViewBase):
         return {
             **ViewerMessageConstants.GENERAL_CONTEXT,
             "archive_data": archive,
+            "trending_pieces": pipeline.get_trending_pieces(
+                archive=pipeline._archive_by_slug
+            ),
         }
 
 
@@ -0,0 +1,61 @@
+from django.http import Http404
+from django.views.generic import View
+
+from killay.archives.lib.constants import ThumbnailConstants
+from killay.archives.services import get_public_piece
+from killay.archives.storages import protected_storage
+from killay.archives.thumbnails import get_thumbnail_name
+from killay.viewer.engine.media import get_media_response
+from killay.viewer.lib.constants import MediaConstants
+
+
+class PieceMediaView(View):
+    """
+    Serves the file or the image of the active provider of a piece, or one of
+    the thumbnails of the image, only to the visitors that can see the piece
+    from their place.
+    """
+
+    def get(self, request, slug: str, field: str, width=None, image_format=None):
+        if (
+            not request.user.is_superuser
+            and not request.site_configuration.is_published
+        ):
+            raise Http404
+        piece = get_public_piece(piece_code=slug, access=request.access)
+        if not piece or MediaConstants.FIELD_BY_KIND.get(piece.kind) != field:
+            raise Http404
+        provider = piece.active_provider
+        if not provider or not provider.is_ready:
+            raise Http404
+        field_file = getattr(provider, field)
+        name = field_file.name
+        if width:
+            if (
+                field != MediaConstants.FIELD_IMAGE
+                or width not in ThumbnailConstants.WIDTHS
+                or image_format not in ThumbnailConstants.FORMATS
+            ):
+                raise Http404
+            name = get_thumbnail_name(name=name, width=width, image_format=image_format)
+            if not field_file.storage.exists(name):
+                raise Http404
+        return get_media_response(
+            request=request, storage=field_file.storage, name=name
+        )
+
+
+class ProtectedMediaView(View):
+    """
+    Serves any protected file by its name to the administrators, for the
+    links of the forms that edit the pieces.
+    """
+
+    def get(self, request, name: str):
+        if not request.user.is_superuser or not protected_storage.exists(name):
+            raise Http404
+        return get_media_response(request=request, storage=protected_storage, name=name)
+
+
+piece_media_view = PieceMediaView.as_view()
+protected_media_view = ProtectedMediaView.as_view()
@@ -1,14 +1,138 @@
+import time
+
+from typing import Optional
+
 from django.contrib import messages
 from django.http import HttpResponseRedirect
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from django.views.generic import TemplateView
 
-from killay.viewer.lib.constants import ViewerMessageConstants
+from killay.viewer.engine.cache import (
+    get_cached_page,
+    get_page_cache_key,
+    is_cacheable_request,
+    is_cacheable_response,
+    record_page_cache,
+    set_cached_page,
+)
+from killay.viewer.engine.conditional import (
+    PageValidators,
+    is_conditional_request,
+    is_validated_request,
+    set_page_validators,
+)
+from killay.viewer.engine.dependencies import start_tracking
+from killay.viewer.engine.stats import count_view
+from killay.viewer.lib.constants import (
+    ContentStatsConstants,
+    PageCacheConstants,
+    ViewerMessageConstants,
+)
 from killay.viewer.engine.pipelines import RoutePipeline
 
 
-class ViewerViewBase(TemplateView):
+class PageCacheMixin:
+    """
+    Serves the rendered page from the cache to anonymous visitors, the key
+    changes with the place of the visitor and the entry expires when any of
+    the instances tracked while rendering it changes.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        if not is_cacheable_request(request=request):
+            return super().dispatch(request, *args, **kwargs)
+        key = get_page_cache_key(request=request)
+        response = get_cached_page(key=key)
+        if response is not None:
+            record_page_cache(
+                response=response, status=PageCacheConstants.STATUS_HIT, start=start
+            )
+            return response
+        start_tracking(request=request)
+        response = super().dispatch(request, *args, **kwargs)
+
+        def store_response(response):
+            if is_cacheable_response(response=response):
+                set_cached_page(
+                    key=key,
+                    response=response,
+                    dependencies=request.page_dependencies,
+                )
+            record_page_cache(
+                response=response, status=PageCacheConstants.STATUS_MISS, start=start
+            )
+
+        if hasattr(response, "render") and callable(response.render):
+            response.add_post_render_callback(store_response)
+        else:
+            store_response(response)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Answers 304 to the anonymous visitors that already have the current page,
+    before the content is built. Only the ETag is compared, the versions and
+    generations in it have no date, so Last-Modified is just informative.
+    The validators are computed only to answer an If-None-Match or for a page
+    that is built, the pages from the cache keep the ones stored with them.
+    """
+
+    def get_page_validators(self) -> Optional[PageValidators]:
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_validated_request(request=request):
+            return super().dispatch(request, *args, **kwargs)
+        validators = None
+        if is_conditional_request(request=request):
+            validators = self.get_page_validators()
+            response = (
+                get_conditional_response(request, etag=validators.etag)
+                if validators
+                else None
+            )
+            if response is not None:
+                set_page_validators(response=response, validators=validators)
+                return response
+        response = super().dispatch(request, *args, **kwargs)
+        if validators is None and not response.has_header("ETag"):
+            validators = self.get_page_validators()
+        if validators is not None:
+            set_page_validators(response=response, validators=validators)
+        return response
+
+
+class ViewCountMixin:
+    """
+    Counts the visits to the instance of the page, also those answered from
+    the page cache or with 304, which never build the content. The visits of
+    the administrators are left out.
+    """
+
+    count_model = None
+    count_field = "slug"
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if (
+            self.count_model
+            and response.status_code in ContentStatsConstants.COUNTED_STATUSES
+            and not request.user.is_superuser
+        ):
+            count_view(
+                request=request,
+                model=self.count_model,
+                field=self.count_field,
+                value=self.kwargs.get("slug"),
+            )
+        return response
+
+
+class ViewerViewBase(ViewCountMixin, ConditionalGetMixin, PageCacheMixin, TemplateView):
     out_of_scope = []
 
     @property
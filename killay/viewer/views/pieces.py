@@ -4,8 +4,19 @@ from django.http import Http404
 from django.views.generic.list import MultipleObjectMixin
 
 from killay.archives.lib.constants import PieceConstants
-from killay.viewer.engine.pipelines import ContentPipeline
-from killay.viewer.lib.constants import ViewerMessageConstants, ContentConstants
+from killay.archives.models import Piece
+from killay.viewer.engine.cache import get_page_generation
+from killay.viewer.engine.dependencies import (
+    get_dependency_keys,
+    get_dependency_versions,
+)
+from killay.viewer.engine.pagination import get_cached_count, get_keyset_page
+from killay.viewer.engine.pipelines import ContentPipeline, ValidatorPipeline
+from killay.viewer.lib.constants import (
+    ContentConstants,
+    ViewerConstants,
+    ViewerMessageConstants,
+)
 from killay.viewer.views.mixins import ViewerViewBase
 
 
@@ -13,6 +24,10 @@ class PieceListView(ViewerViewBase, MultipleObjectMixin):
     template_name = "viewer/piece-list.html"
     paginate_by = 54
 
+    def get_page_validators(self):
+        pipeline = ValidatorPipeline(request=self.request)
+        return pipeline.get_piece_list_validators()
+
     def get_view_context_data(self):
         search = self._get_search()
         specific_context = self._get_specific_context()
@@ -29,18 +44,55 @@ class PieceListView(ViewerViewBase, MultipleObjectMixin):
         context = super().get_context_data(*args, **kwargs)
         paginator = context["paginator"]
         page_obj = context["page_obj"]
+        self.pipeline.track_pieces(pieces=page_obj)
+        self.pipeline.set_sequence_hits(pieces=page_obj)
+        total = paginator.count if paginator else self._get_keyset_total()
         context["total_founded"] = ViewerMessageConstants.TOTAL_FOUNDED_PIECES.format(
-            number=len(self.object_list)
-        )
-        context["pagination"] = self._get_pagination(
-            paginator=paginator,
-            page_obj=page_obj,
-            queryparams=self.query_params,
+            number=total
         )
+        if paginator:
+            context["pagination"] = self._get_pagination(
+                paginator=paginator,
+                page_obj=page_obj,
+                queryparams=self.query_params,
+            )
+        else:
+            context["pagination"] = self._get_keyset_pagination(
+                page_obj=page_obj,
+                queryparams=self.query_params,
+            )
         return context
 
+    def paginate_queryset(self, queryset, page_size):
+        if not self._is_keyset_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        page = get_keyset_page(
+            queryset=queryset,
+            cursor=self.pipeline.get_page_cursor(),
+            per_page=page_size,
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+    def _get_keyset_total(self) -> int:
+        # the cursor pages of the same filters share the total until a piece
+        # joins or leaves some list, or the access of the places changes
+        keys = get_dependency_keys(model=Piece)
+        versions = get_dependency_versions(keys=keys)
+        generation = "-".join(
+            [get_page_generation(), *(str(versions[key]) for key in keys)]
+        )
+        return get_cached_count(queryset=self.object_list, generation=generation)
+
+    def _is_keyset_pagination(self) -> bool:
+        # the results of a search are ordered by rank, not by the keyset fields
+        return (
+            self.request.viewer.pagination == ViewerConstants.PAGINATION_CURSOR
+            and not self.query_search
+        )
+
     def fetch_data(self) -> None:
         pipeline = ContentPipeline(request=self.request)
+        self.pipeline = pipeline
         self.collection = pipeline.get_collection()
         self.category = (
             pipeline.get_category(collection_id=self.collection.id)
@@ -59,6 +111,7 @@ class PieceListView(ViewerViewBase, MultipleObjectMixin):
             category=self.category,
         )
         self.filter_options = pipeline.get_filter_options(
+            pieces=self.object_list,
             archive=self.archive,
             collection=self.collection,
             category=self.category,
@@ -150,6 +203,36 @@ class PieceListView(ViewerViewBase, MultipleObjectMixin):
         )
         return page_links
 
+    def _get_keyset_pagination(self, page_obj, queryparams):
+        template = "?{qp}cursor={cursor}"
+        queryparams = f"{queryparams}&" if queryparams else ""
+        first_link = f"?{queryparams[:-1]}" if queryparams else "?"
+        return [
+            {
+                "number": "first",
+                "link": first_link,
+                "disabled": not page_obj.has_previous(),
+            },
+            {
+                "number": "previous",
+                "link": (
+                    template.format(qp=queryparams, cursor=page_obj.previous_cursor)
+                    if page_obj.has_previous()
+                    else None
+                ),
+                "disabled": not page_obj.has_previous(),
+            },
+            {
+                "number": "next",
+                "link": (
+                    template.format(qp=queryparams, cursor=page_obj.next_cursor)
+                    if page_obj.has_next()
+                    else None
+                ),
+                "disabled": not page_obj.has_next(),
+            },
+        ]
+
     def _get_init_pages(self, template, queryparams, page_obj):
         first_page = {
             "number": "first",
@@ -190,6 +273,8 @@ piece_list_view = PieceListView.as_view()
 
 class PieceDetailView(ViewerViewBase):
     template_name = "viewer/piece-detail.html"
+    count_model = Piece
+    count_field = "code"
     kind_key_map = {
         PieceConstants.KIND_VIDEO: "videos",
         PieceConstants.KIND_IMAGE: "images",
@@ -197,6 +282,10 @@ class PieceDetailView(ViewerViewBase):
         PieceConstants.KIND_DOCUMENT: "documents",
     }
 
+    def get_page_validators(self):
+        pipeline = ValidatorPipeline(request=self.request)
+        return pipeline.get_piece_validators(piece_code=self.kwargs.get("slug"))
+
     def fetch_data(self) -> None:
         piece_code = self.kwargs.get("slug")
         pipeline = ContentPipeline(request=self.request)
@@ -205,6 +294,7 @@ class PieceDetailView(ViewerViewBase):
             raise Http404(ViewerMessageConstants.PIECE_NOT_FOUND)
         self.piece_data = piece_data
         piece = piece_data["instance"]
+        self.related_pieces = pipeline.get_related_pieces(piece=piece)
         self.menu_cursor = {
             "archive": piece.collection.archive,
             "collection": piece.collection,
@@ -217,6 +307,7 @@ class PieceDetailView(ViewerViewBase):
         return {
             "piece": self.piece_data,
             "player_template": player_template,
+            "related_pieces": self.related_pieces,
         }
 
     def _get_template_player(self, kind: str) -> str:
@@ -0,0 +1,40 @@
+import os
+
+from django.conf import settings
+from django.http import FileResponse, Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.generic import View
+
+from killay.viewer.engine.sitemaps import is_sitemap_name
+from killay.viewer.lib.constants import SitemapConstants
+
+
+class SitemapView(View):
+    """
+    Serves the sitemaps written by generate_sitemaps, dated by their latest
+    url so crawlers only download the files with changes.
+    """
+
+    def get(self, request, file_name=SitemapConstants.INDEX_NAME):
+        if not request.site_configuration.is_published:
+            raise Http404
+        if file_name != SitemapConstants.INDEX_NAME and not is_sitemap_name(
+            name=file_name
+        ):
+            raise Http404
+        path = os.path.join(settings.VIEWER_SITEMAP_ROOT, file_name)
+        try:
+            last_modified = int(os.stat(path).st_mtime)
+        except FileNotFoundError:
+            raise Http404
+        response = get_conditional_response(request, last_modified=last_modified)
+        if response is None:
+            response = FileResponse(
+                open(path, "rb"), content_type=SitemapConstants.CONTENT_TYPE
+            )
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+sitemap_view = SitemapView.as_view()
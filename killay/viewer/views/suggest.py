@@ -0,0 +1,18 @@
+from django.http import JsonResponse
+from django.views.generic import View
+
+from killay.viewer.engine.pipelines import ContentPipeline
+
+
+class SuggestView(View):
+    def get(self, request, *args, **kwargs):
+        if (
+            not request.user.is_superuser
+            and not request.site_configuration.is_published
+        ):
+            return JsonResponse({"results": {}}, status=403)
+        pipeline = ContentPipeline(request=request)
+        return JsonResponse(pipeline.get_suggestions())
+
+
+suggest_view = SuggestView.as_view()